@@ -156,6 +156,11 @@ def _register_web(app, *, public_agent_factory=None, **_kwargs):
     except ImportError:
         pass
 
+    # Parse the documentation templates up front, not on the first
+    # generation request.
+    from sciagent_wizard.rendering import precompile_templates
+    precompile_templates()
+
 
 def _register_cli(typer_app):
     """Register the ``wizard`` CLI sub-command on the Typer app."""
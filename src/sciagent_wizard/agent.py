@@ -287,7 +287,8 @@ class WizardAgent(BaseScientificAgent):
                 "analyze_example_data",
                 (
                     "Analyze example data files the researcher has uploaded. "
-                    "Infers file types, column names, value ranges, and "
+                    "Infers file types, column names, value ranges "
+                    "(as [min, max] per column), and "
                     "domain-specific patterns. Use this to understand the "
                     "researcher's data before recommending packages."
                 ),
@@ -16,6 +16,8 @@ from urllib.parse import urljoin, urlparse
 
 import httpx
 
+from sciagent_wizard.sources._json import response_json
+
 from .models import IngestorState, ScrapedPage, SourceType
 
 logger = logging.getLogger(__name__)
@@ -210,7 +212,7 @@ async def _fetch_pypi_metadata(
             if resp.status_code != 200:
                 return {"pip_name": package_name}
 
-        data = resp.json()
+        data = response_json(resp)
         info = data.get("info", {})
 
         # Find docs URL from project_urls
@@ -419,7 +421,7 @@ async def _crawl_github_source(
             if branch == "main":
                 return await _crawl_github_source(client, owner, repo, "master")
             return pages
-        tree = resp.json().get("tree", [])
+        tree = response_json(resp).get("tree", [])
     except Exception as exc:
         logger.debug("GitHub tree for %s/%s: %s", owner, repo, exc)
         return pages
@@ -506,7 +508,7 @@ async def _crawl_github_docs_folder(
                     client, owner, repo, "master",
                 )
             return pages
-        tree = resp.json().get("tree", [])
+        tree = response_json(resp).get("tree", [])
     except Exception as exc:
         logger.debug(
             "GitHub tree (docs) for %s/%s: %s",
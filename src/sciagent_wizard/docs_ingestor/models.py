@@ -12,6 +12,10 @@ from enum import Enum
 from typing import Dict, List, Optional
 
 
+# Section keys the LLM must submit before finalize, in document order.
+SECTION_NAMES = ("core_classes", "key_functions", "common_pitfalls", "recipes")
+
+
 class SourceType(str, Enum):
     """Where a scraped page originated."""
 
@@ -56,11 +60,8 @@ class IngestorState:
     scraped_pages: List[ScrapedPage] = field(default_factory=list)
     pypi_metadata: Dict[str, str] = field(default_factory=dict)
 
-    # Sections filled by the LLM via tools
-    core_classes: str = ""
-    key_functions: str = ""
-    common_pitfalls: str = ""
-    recipes: str = ""
+    # Sections filled by the LLM via tools (section name → markdown)
+    sections: Dict[str, str] = field(default_factory=dict)
 
     # Final output
     final_markdown: Optional[str] = None
@@ -72,16 +73,7 @@ class IngestorState:
     @property
     def sections_filled(self) -> List[str]:
         """Return names of sections the LLM has submitted."""
-        filled = []
-        if self.core_classes:
-            filled.append("core_classes")
-        if self.key_functions:
-            filled.append("key_functions")
-        if self.common_pitfalls:
-            filled.append("common_pitfalls")
-        if self.recipes:
-            filled.append("recipes")
-        return filled
+        return [s for s in SECTION_NAMES if s in self.sections]
 
     def to_dict(self) -> dict:
         return {
@@ -94,12 +94,10 @@ async function startIngestion() {
         ws.onopen = () => {
             // Send package info to start the process
             const selectedModel = document.getElementById('modelSelect').value;
-            ws.send(JSON.stringify({
-                package_name: packageName,
-                github_url: githubUrl || null,
-                session_id: sessionId,
-                model: selectedModel,
-            }));
+            // Fixed-schema binary frame: fields separated by NUL bytes
+            ws.send(new TextEncoder().encode(
+                [packageName, githubUrl, sessionId, selectedModel].join('\x00')
+            ));
             addLog('Connected — starting ingestion...', 'status');
         };
 
@@ -7,43 +7,15 @@ as :mod:`sciagent_wizard.tools`.
 
 from __future__ import annotations
 
-import asyncio
-import concurrent.futures
 import json
 import logging
 
-from .models import IngestorState
+from ..tools import _run_async  # same background loop as wizard tools
+from .models import SECTION_NAMES, IngestorState
 
 logger = logging.getLogger(__name__)
 
 
-# ── Async helper (same pattern as wizard tools) ────────────────────────
-
-
-def _run_async(coro):
-    """Run an async coroutine from a sync tool handler."""
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-        future = pool.submit(_thread_runner, coro)
-        return future.result(timeout=120)
-
-
-def _thread_runner(coro):
-    loop = asyncio.new_event_loop()
-    try:
-        return loop.run_until_complete(coro)
-    finally:
-        loop.close()
-
-
 # ── Tool implementations ──────────────────────────────────────────────
 
 
@@ -75,44 +47,44 @@ def tool_request_page(state: IngestorState, url: str) -> str:
 
 def tool_submit_core_classes(state: IngestorState, markdown: str) -> str:
     """Submit the Core Classes section of the API reference."""
-    state.core_classes = markdown.strip()
+    _submit(state, "core_classes", markdown)
     return json.dumps({
         "status": "accepted",
         "section": "core_classes",
-        "char_count": len(state.core_classes),
+        "char_count": len(state.sections.get("core_classes", "")),
         "sections_remaining": _remaining(state),
     })
 
 
 def tool_submit_key_functions(state: IngestorState, markdown: str) -> str:
     """Submit the Key Functions section of the API reference."""
-    state.key_functions = markdown.strip()
+    _submit(state, "key_functions", markdown)
     return json.dumps({
         "status": "accepted",
         "section": "key_functions",
-        "char_count": len(state.key_functions),
+        "char_count": len(state.sections.get("key_functions", "")),
         "sections_remaining": _remaining(state),
     })
 
 
 def tool_submit_pitfalls(state: IngestorState, markdown: str) -> str:
     """Submit the Common Pitfalls section."""
-    state.common_pitfalls = markdown.strip()
+    _submit(state, "common_pitfalls", markdown)
     return json.dumps({
         "status": "accepted",
         "section": "common_pitfalls",
-        "char_count": len(state.common_pitfalls),
+        "char_count": len(state.sections.get("common_pitfalls", "")),
         "sections_remaining": _remaining(state),
     })
 
 
 def tool_submit_recipes(state: IngestorState, markdown: str) -> str:
     """Submit the Quick-Start Recipes section."""
-    state.recipes = markdown.strip()
+    _submit(state, "recipes", markdown)
     return json.dumps({
         "status": "accepted",
         "section": "recipes",
-        "char_count": len(state.recipes),
+        "char_count": len(state.sections.get("recipes", "")),
         "sections_remaining": _remaining(state),
     })
 
@@ -139,10 +111,10 @@ def tool_finalize(state: IngestorState) -> str:
         "library_source_url": state.source_url or "",
         "library_docs_url": state.docs_url or "",
         "library_toc": _build_toc(state),
-        "library_core_classes": state.core_classes,
-        "library_key_functions": state.key_functions,
-        "library_common_pitfalls": state.common_pitfalls,
-        "library_recipes": state.recipes,
+        "library_core_classes": state.sections["core_classes"],
+        "library_key_functions": state.sections["key_functions"],
+        "library_common_pitfalls": state.sections["common_pitfalls"],
+        "library_recipes": state.sections["recipes"],
     }
 
     # Try the shared renderer first (regex is now fixed for
@@ -155,28 +127,35 @@ def tool_finalize(state: IngestorState) -> str:
 
     state.final_markdown = rendered
 
+    # The raw crawl is dead weight once the document is assembled; release
+    # it now instead of at session teardown.  Page contents are cleared too,
+    # since callers (e.g. ws_ingest) may still hold the page list.
+    for page in state.scraped_pages:
+        page.content = ""
+    state.scraped_pages = []
+    state.pypi_metadata = {}
+
     return json.dumps({
         "status": "finalized",
         "char_count": len(rendered),
-        "preview": rendered[:500],
     })
 
 
 # ── Helpers ────────────────────────────────────────────────────────────
 
 
+def _submit(state: IngestorState, section: str, markdown: str) -> None:
+    """Store a submitted section; empty submissions leave it unfilled."""
+    text = markdown.strip()
+    if text:
+        state.sections[section] = text
+    else:
+        state.sections.pop(section, None)
+
+
 def _remaining(state: IngestorState) -> list:
     """Return names of sections not yet submitted."""
-    missing = []
-    if not state.core_classes:
-        missing.append("core_classes")
-    if not state.key_functions:
-        missing.append("key_functions")
-    if not state.common_pitfalls:
-        missing.append("common_pitfalls")
-    if not state.recipes:
-        missing.append("recipes")
-    return missing
+    return [s for s in SECTION_NAMES if s not in state.sections]
 
 
 def _build_toc(state: IngestorState) -> str:
@@ -208,16 +187,16 @@ def _manual_assemble(state: IngestorState, context: dict) -> str:
         _build_toc(state),
         "\n---\n",
         "## 1. Core Classes\n",
-        state.core_classes,
+        state.sections["core_classes"],
         "\n---\n",
         "## 2. Key Functions\n",
-        state.key_functions,
+        state.sections["key_functions"],
         "\n---\n",
         "## 3. Common Pitfalls\n",
-        state.common_pitfalls,
+        state.sections["common_pitfalls"],
         "\n---\n",
         "## 4. Quick-Start Recipes\n",
-        state.recipes,
+        state.sections["recipes"],
         "\n---\n",
         "## Notes\n",
         "- This document should be kept in sync with the library version your\n"
@@ -11,8 +11,8 @@ import asyncio
 import json
 import logging
 import os
+import sys
 import uuid
-from pathlib import Path
 from quart import (
     Blueprint,
     Quart,
@@ -23,11 +23,16 @@ from quart import (
     Response,
 )
 from quart_cors import cors
+from copilot.generated.session_events import SessionEventType
 
 from .agent import create_ingestor
 from .crawler import crawl_package
+from . import tools as ingestor_tools
 
-from sciagent_wizard.models import get_models_config
+from sciagent_wizard.models import (
+    is_supported_model,
+    models_config_response,
+)
 from sciagent_wizard.auth import (
     require_auth,
     require_auth_ws,
@@ -39,13 +44,13 @@ from sciagent_wizard.auth import (
 
 logger = logging.getLogger(__name__)
 
-_PKG_DIR = Path(__file__).resolve().parent
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
 
 ingestor_bp = Blueprint(
     "ingestor",
     __name__,
-    static_folder=str(_PKG_DIR / "static"),
-    template_folder=str(_PKG_DIR / "templates_html"),
+    static_folder=os.path.join(_PKG_DIR, "static"),
+    template_folder=os.path.join(_PKG_DIR, "templates_html"),
     url_prefix="/ingestor",
 )
 
@@ -93,14 +98,43 @@ def _schedule_result_cleanup(session_id: str) -> None:
         )
 
 
+def _parse_start_message(raw) -> tuple[str, str | None, str, str]:
+    """Parse the WebSocket kickoff message.
+
+    The frontend sends the four fields as a binary frame of the form
+    ``package_name\x00github_url\x00session_id\x00model``, which is
+    split directly.  Anything else is treated as the legacy JSON object.
+
+    Returns:
+        ``(package_name, github_url, session_id, model)``.
+    """
+    if isinstance(raw, bytes) and b"\x00" in raw:
+        fields = raw.decode("utf-8").split("\x00")
+        if len(fields) == 4:
+            package_name, github_url, session_id, model = fields
+            return (
+                package_name.strip(),
+                github_url.strip() or None,
+                session_id or str(uuid.uuid4()),
+                model or "claude-opus-4.5",
+            )
+
+    msg = json.loads(raw)
+    return (
+        msg.get("package_name", "").strip(),
+        (msg.get("github_url") or "").strip() or None,
+        msg.get("session_id", str(uuid.uuid4())),
+        msg.get("model", "claude-opus-4.5"),
+    )
+
+
 # ── Routes ──────────────────────────────────────────────────────────────
 
 
 @ingestor_bp.route("/api/config")
 async def ingestor_config():
     """Return available models and other frontend configuration."""
-    config = get_models_config()
-    return jsonify(config)
+    return models_config_response(request.if_none_match)
 
 
 @ingestor_bp.route("/")
@@ -171,6 +205,67 @@ async def ingestor_static(filename):
     return await send_from_directory(ingestor_bp.static_folder, filename)
 
 
+# ── Session event handlers ──────────────────────────────────────────
+#
+# Each handler receives ``(event, send_queue, state, idle_event)`` and is
+# looked up by event type, so the per-event cost of ``ws_ingest``'s
+# callback is one dict lookup plus direct attribute access.
+
+
+def _event_tool_name(event) -> str:
+    try:
+        return event.data.tool_name or "tool"
+    except AttributeError:
+        return "tool"
+
+
+def _on_message_delta(event, send_queue, state, idle_event) -> None:
+    try:
+        delta = event.data.delta_content
+    except AttributeError:
+        return
+    if delta:
+        send_queue.put_nowait({"type": "text_delta", "text": delta})
+
+
+def _on_tool_start(event, send_queue, state, idle_event) -> None:
+    send_queue.put_nowait({
+        "type": "tool_start",
+        "name": _event_tool_name(event),
+    })
+
+
+def _on_tool_complete(event, send_queue, state, idle_event) -> None:
+    send_queue.put_nowait({
+        "type": "tool_complete",
+        "name": _event_tool_name(event),
+        "sections_filled": state.sections_filled,
+    })
+
+
+def _on_session_error(event, send_queue, state, idle_event) -> None:
+    try:
+        err = event.data.message or str(event.data)
+    except AttributeError:
+        err = str(event.data)
+    logger.error("Ingestor session error: %s", err)
+    send_queue.put_nowait({"type": "error", "text": err})
+    idle_event.set()
+
+
+def _on_session_idle(event, send_queue, state, idle_event) -> None:
+    idle_event.set()
+
+
+_EVENT_HANDLERS = {
+    SessionEventType.ASSISTANT_MESSAGE_DELTA: _on_message_delta,
+    SessionEventType.TOOL_EXECUTION_START: _on_tool_start,
+    SessionEventType.TOOL_EXECUTION_COMPLETE: _on_tool_complete,
+    SessionEventType.SESSION_ERROR: _on_session_error,
+    SessionEventType.SESSION_IDLE: _on_session_idle,
+}
+
+
 # ── WebSocket ───────────────────────────────────────────────────────────
 
 
@@ -187,7 +282,6 @@ async def ws_ingest():
     session = None
     session_id = ""
     send_queue: asyncio.Queue = asyncio.Queue()
-    background_tasks: list = []
 
     # ── Queue drain loop — sends queued messages over WebSocket ──
     async def _drain_queue():
@@ -196,20 +290,19 @@ async def ws_ingest():
             if msg is None:
                 break
             try:
-                await websocket.send(json.dumps(msg))
+                await websocket.send(json.dumps(msg, separators=(",", ":")))
             except Exception:
+                logger.debug("Ingestor WebSocket send failed", exc_info=True)
                 break
 
-    background_tasks.append(asyncio.ensure_future(_drain_queue()))
+    drain_task = asyncio.ensure_future(_drain_queue())
 
     try:
         # Wait for the start message with package info
         raw = await websocket.receive()
-        msg = json.loads(raw)
-        package_name = msg.get("package_name", "").strip()
-        github_url = msg.get("github_url", "").strip() or None
-        session_id = msg.get("session_id", str(uuid.uuid4()))
-        selected_model = msg.get("model", "claude-opus-4.5")
+        package_name, github_url, session_id, selected_model = (
+            _parse_start_message(raw)
+        )
 
         if not package_name:
             send_queue.put_nowait({
@@ -270,9 +363,8 @@ async def ws_ingest():
         state.scraped_pages = pages
 
         # Apply model selection (for billing)
-        from sciagent_wizard.models import SUPPORTED_MODELS
-        if selected_model in SUPPORTED_MODELS:
-            state.model = selected_model
+        if is_supported_model(selected_model):
+            state.model = sys.intern(selected_model)
             logger.info("Set ingestor model to %s", selected_model)
 
         await agent.start()
@@ -295,61 +387,12 @@ async def ws_ingest():
         )
 
         # Stream events via the queue
-        from copilot.generated.session_events import (
-            SessionEventType,
-        )
-
         idle_event = asyncio.Event()
 
         def _handler(event):
-            etype = event.type
-
-            if etype == SessionEventType.ASSISTANT_MESSAGE_DELTA:
-                delta = (
-                    getattr(event.data, "delta_content", None)
-                    or ""
-                )
-                if delta:
-                    send_queue.put_nowait({
-                        "type": "text_delta",
-                        "text": delta,
-                    })
-
-            elif etype == SessionEventType.TOOL_EXECUTION_START:
-                name = (
-                    getattr(event.data, "tool_name", None)
-                    or "tool"
-                )
-                send_queue.put_nowait({
-                    "type": "tool_start",
-                    "name": name,
-                })
-
-            elif etype == SessionEventType.TOOL_EXECUTION_COMPLETE:
-                name = (
-                    getattr(event.data, "tool_name", None)
-                    or "tool"
-                )
-                send_queue.put_nowait({
-                    "type": "tool_complete",
-                    "name": name,
-                    "sections_filled": state.sections_filled,
-                })
-
-            elif etype == SessionEventType.SESSION_ERROR:
-                err = (
-                    getattr(event.data, "message", None)
-                    or str(event.data)
-                )
-                logger.error("Ingestor session error: %s", err)
-                send_queue.put_nowait({
-                    "type": "error",
-                    "text": err,
-                })
-                idle_event.set()
-
-            elif etype == SessionEventType.SESSION_IDLE:
-                idle_event.set()
+            handle = _EVENT_HANDLERS.get(event.type)
+            if handle is not None:
+                handle(event, send_queue, state, idle_event)
 
         unsub = session.on(_handler)
         try:
@@ -366,7 +409,6 @@ async def ws_ingest():
                 "manually (sections: %s)",
                 state.sections_filled,
             )
-            from . import tools as ingestor_tools
             ingestor_tools.tool_finalize(state)
 
         if state.final_markdown:
@@ -404,12 +446,13 @@ async def ws_ingest():
         except Exception:
             pass
     finally:
-        # Signal the drain loop to stop
+        # Signal the drain loop to stop and give it a moment to flush;
+        # wait_for cancels it if the socket is stuck.
         send_queue.put_nowait(None)
-        # Give the drain loop a moment to flush
-        await asyncio.sleep(0.1)
-        for task in background_tasks:
-            task.cancel()
+        try:
+            await asyncio.wait_for(drain_task, timeout=1.0)
+        except asyncio.TimeoutError:
+            pass
         if session and agent:
             try:
                 await agent.destroy_session(session_id)
@@ -429,8 +472,8 @@ def create_ingestor_app() -> Quart:
     """Create a standalone Quart app for the docs ingestor."""
     app = Quart(
         __name__,
-        static_folder=str(_PKG_DIR / "static"),
-        template_folder=str(_PKG_DIR / "templates_html"),
+        static_folder=os.path.join(_PKG_DIR, "static"),
+        template_folder=os.path.join(_PKG_DIR, "templates_html"),
     )
 
     # CORS — restrict when OAuth is enabled
@@ -20,7 +20,9 @@ from .docs_gen import write_docs
 from sciagent_wizard.rendering import (
     render_docs,
     render_template,
+    render_template_to,
     copy_blank_templates,
+    precompile_templates,
 )
 
 
@@ -57,5 +59,7 @@ __all__ = [
     "write_docs",
     "render_docs",
     "render_template",
+    "render_template_to",
     "copy_blank_templates",
+    "precompile_templates",
 ]
@@ -21,15 +21,18 @@ Or, in plugin mode:
 
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import re
+import string
 from pathlib import Path
 from typing import Any, Optional
 
 from sciagent_wizard.models import WizardState
 from .docs_gen import write_docs
-from .prompt_gen import _build_expertise_text
+from .paths import _make_dirs, _make_project_dir, _write_files
+from .prompt_gen import _build_instructions_text
 from .profiles import (
     get_profile,
     is_excluded_agent,
@@ -37,6 +40,7 @@ from .profiles import (
     REVIEWER_PROMPT_MODULES,
 )
 from sciagent_wizard.rendering import (
+    _ANCHOR_TABLE,
     _get_templates_dir,
     _build_context,
     _humanize_unfilled_placeholders,
@@ -66,6 +70,12 @@ _RIGOR_LINK_PATTERN = re.compile(
     r"\([^)]*sciagent-rigor\.instructions\.md\)\.",
 )
 
+# Frontmatter lines rewritten during agent compilation.
+_FM_NAME_RE = re.compile(r"^(name:\s*).+$", flags=re.MULTILINE)
+_FM_AGENT_RE = re.compile(r"^(\s*agent:\s*)(.+)$", flags=re.MULTILINE)
+_FM_HANDOFF_LABEL_RE = re.compile(r"^\s*- label:")
+_FM_HANDOFF_TAIL_RE = re.compile(r"^\s+(prompt|send):")
+
 # Matches a markdown table row with a bold agent name in the second column:
 #   | <need> | **<agent-stem>** | <when> |
 _ROUTING_ROW_RE = re.compile(
@@ -77,34 +87,36 @@ _ROUTING_ROW_RE = re.compile(
 # injected once via the ``_RIGOR_LINK_PATTERN`` inline replacement so that
 # each agent receives exactly one copy.  See ``build_plugin.py`` for the
 # matching change in the core repo.
-_AGENT_PROMPT_MAP: dict[str, list[str]] = {
-    "coordinator": ["communication_style.md", "clarification.md"],
-    "analysis-planner": ["communication_style.md", "clarification.md"],
-    "data-qc": [
+_BASE_PROMPTS = ("communication_style.md", "clarification.md")
+
+_AGENT_PROMPT_MAP: dict[str, tuple[str, ...]] = {
+    "coordinator": _BASE_PROMPTS,
+    "analysis-planner": _BASE_PROMPTS,
+    "data-qc": (
         "communication_style.md",
         "code_execution.md",
         "incremental_execution.md",
         "clarification.md",
-    ],
-    "rigor-reviewer": ["communication_style.md", "clarification.md"],
-    "report-writer": [
+    ),
+    "rigor-reviewer": _BASE_PROMPTS,
+    "report-writer": (
         "communication_style.md",
         "reproducible_script.md",
         "clarification.md",
-    ],
-    "code-reviewer": ["communication_style.md", "clarification.md"],
-    "reviewer": REVIEWER_PROMPT_MODULES,
-    "docs-ingestor": ["communication_style.md", "clarification.md"],
-    "coder": [
+    ),
+    "code-reviewer": _BASE_PROMPTS,
+    "reviewer": tuple(REVIEWER_PROMPT_MODULES),
+    "docs-ingestor": _BASE_PROMPTS,
+    "coder": (
         "communication_style.md",
         "code_execution.md",
         "incremental_execution.md",
         "reproducible_script.md",
         "clarification.md",
-    ],
+    ),
 }
 
-_BUILTIN_AGENTS = {"agent", "ask"}
+_BUILTIN_AGENTS = frozenset({"agent", "ask"})
 
 
 def generate_copilot_project(
@@ -132,25 +144,21 @@ def generate_copilot_project(
     Returns:
         Path to the generated project directory.
     """
-    base = Path(output_dir) if output_dir else Path.cwd()
-    slug = state.agent_name.replace(" ", "_").replace("-", "_")
-    project_dir = base / slug
-    project_dir.mkdir(parents=True, exist_ok=True)
+    project_dir = _make_project_dir(state, output_dir)
 
     logger.info("Generating copilot/claude agent config in %s", project_dir)
 
     # ── Shared domain expertise (instructions) ──────────────────────
-    expertise = _build_expertise_text(state)
-    docs_ref = _docs_reference(state)
-    full_instructions = expertise
-    if docs_ref:
-        full_instructions += "\n\n" + docs_ref
-
-    # ── .github/instructions/<name>.instructions.md ─────────────────
-    instructions_dir = project_dir / ".github" / "instructions"
-    instructions_dir.mkdir(parents=True, exist_ok=True)
-    instructions_path = instructions_dir / f"{state.agent_name}.instructions.md"
-    instructions_path.write_text(full_instructions, encoding="utf-8")
+    full_instructions = _build_instructions_text(state)
+
+    # ── Output layout — every leaf directory created up front ────────
+    _make_dirs(
+        project_dir,
+        ".github/instructions",
+        ".github/agents",
+        ".claude/agents",
+        "docs/domain",
+    )
 
     # ── Compile VS Code agents from templates ───────────────────────
     vscode_agent_names = _compile_agents_from_templates(
@@ -168,12 +176,13 @@ def generate_copilot_project(
     if state.package_docs:
         write_docs(state, docs_dir)
 
-    # ── README ──────────────────────────────────────────────────────
-    readme_path = project_dir / "README.md"
-    readme_path.write_text(
-        _readme(state, vscode_agent_names, claude_agent_names),
-        encoding="utf-8",
-    )
+    # ── Instructions + README ───────────────────────────────────────
+    _write_files(project_dir, {
+        f".github/instructions/{state.agent_name}.instructions.md": (
+            full_instructions
+        ),
+        "README.md": _readme(state, vscode_agent_names, claude_agent_names),
+    })
 
     state.project_dir = str(project_dir)
     logger.info("Copilot/Claude agent config generated: %s", project_dir)
@@ -227,6 +236,22 @@ def _apply_replacements(text: str, replacements: dict[str, str]) -> str:
     return _REPLACE_PATTERN.sub(_sub, text)
 
 
+@functools.lru_cache(maxsize=8)
+def _expertise_section(domain_expertise: str) -> str:
+    """The ``## Domain Expertise`` tail appended to every compiled agent.
+
+    Built once per expertise text and shared by the VS Code and Claude
+    compilers (including merged agents).
+    """
+    return "\n\n---\n\n## Domain Expertise\n\n" + domain_expertise + "\n"
+
+
+def _write_agent_file(path: Path, fm_text: str, body: str) -> None:
+    """Write ``---`` frontmatter ``---`` + *body* without joining them first."""
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.writelines(("---\n", fm_text, "\n---\n\n", body))
+
+
 def _prefixed(name: str, prefix: str) -> str:
     """Return *name* with *prefix*- prepended (or unchanged if prefix is empty)."""
     return f"{prefix}-{name}" if prefix else name
@@ -282,6 +307,9 @@ def _compile_agents_from_templates(
                 _, body = _split_frontmatter(content)
                 prompt_cache[p.name] = body.strip() if body.strip() else content
 
+    appendix_cache: dict[tuple[str, ...], str] = {}
+    rigor_block = "### Shared Scientific Rigor Principles\n\n" + rigor_text
+
     agents_dir = output_dir / dest_subdir
     agents_dir.mkdir(parents=True, exist_ok=True)
     agent_names: list[str] = []
@@ -308,64 +336,45 @@ def _compile_agents_from_templates(
 
         # 2. Inline rigor instructions (replace link with full content)
         if rigor_text:
-            replacement_block = (
-                "### Shared Scientific Rigor Principles\n\n" + rigor_text
-            )
-            body = _RIGOR_LINK_PATTERN.sub(replacement_block, body)
+            body = _RIGOR_LINK_PATTERN.sub(rigor_block, body)
 
-        # 3. Append prompt modules
+        # 3. Append prompt modules (joined once per distinct module set)
         if agent_stem in _AGENT_PROMPT_MAP:
-            appendices: list[str] = []
-            for prompt_name in _AGENT_PROMPT_MAP[agent_stem]:
-                if prompt_name in prompt_cache:
-                    appendices.append(prompt_cache[prompt_name])
-            if appendices:
-                body = (
-                    body.rstrip()
-                    + "\n\n---\n\n"
-                    + "\n\n---\n\n".join(appendices)
-                    + "\n"
+            modules = _AGENT_PROMPT_MAP[agent_stem]
+            appendix = appendix_cache.get(modules)
+            if appendix is None:
+                appendix = "\n\n---\n\n".join(
+                    prompt_cache[name] for name in modules if name in prompt_cache
                 )
+                appendix_cache[modules] = appendix
+            if appendix:
+                body = body.rstrip() + "\n\n---\n\n" + appendix + "\n"
 
         # 4. Append domain expertise
         if domain_expertise:
-            body = (
-                body.rstrip()
-                + "\n\n---\n\n"
-                + "## Domain Expertise\n\n"
-                + domain_expertise
-                + "\n"
-            )
+            body = body.rstrip() + _expertise_section(domain_expertise)
 
         # 5. Name prefixing — update frontmatter name
         prefixed_stem = _prefixed(agent_stem, name_prefix)
-        fm_text = re.sub(
-            r"^(name:\s*).+$",
-            rf"\g<1>{prefixed_stem}",
-            fm_text,
-            flags=re.MULTILINE,
-        )
+        fm_text = _FM_NAME_RE.sub(rf"\g<1>{prefixed_stem}", fm_text)
 
         # 6. Prefix agent references in handoffs
         if name_prefix:
-            fm_text = re.sub(
-                r"^(\s*agent:\s*)(.+)$",
+            fm_text = _FM_AGENT_RE.sub(
                 lambda m: (
                     f"{m.group(1)}{m.group(2).strip()}"
                     if m.group(2).strip() in _BUILTIN_AGENTS
                     else f"{m.group(1)}{_prefixed(m.group(2).strip(), name_prefix)}"
                 ),
                 fm_text,
-                flags=re.MULTILINE,
             )
 
         # 7. Humanize remaining unfilled placeholders
         body = _humanize_unfilled_placeholders(body)
 
         # Reassemble and write
-        output_content = f"---\n{fm_text}\n---\n\n{body}"
         dest = agents_dir / f"{prefixed_stem}.md"
-        dest.write_text(output_content, encoding="utf-8")
+        _write_agent_file(dest, fm_text, body)
         agent_names.append(prefixed_stem)
         logger.debug("Compiled agent template %s → %s", src_file.name, dest)
 
@@ -482,8 +491,7 @@ def _rewrite_routing_table(
         new_lines.append(row)
 
     new_body = "\n".join(new_lines)
-    output_text = f"---\n{fm_text}\n---\n\n{new_body}"
-    coord_file.write_text(output_text, encoding="utf-8")
+    _write_agent_file(coord_file, fm_text, new_body)
 
 
 def _merge_agent_bodies(
@@ -540,13 +548,13 @@ def _merge_agent_bodies(
         body_parts.append(body.strip())
 
         # Collect prompt modules (union, deduplicated)
-        for pname in _AGENT_PROMPT_MAP.get(src_name, []):
+        for pname in _AGENT_PROMPT_MAP.get(src_name, ()):
             if pname not in seen_prompts:
                 seen_prompts.add(pname)
                 prompt_names.append(pname)
 
     # Also add prompt modules for the merged name itself
-    for pname in _AGENT_PROMPT_MAP.get(merged_name, []):
+    for pname in _AGENT_PROMPT_MAP.get(merged_name, ()):
         if pname not in seen_prompts:
             seen_prompts.add(pname)
             prompt_names.append(pname)
@@ -568,13 +576,7 @@ def _merge_agent_bodies(
 
     # Append domain expertise
     if domain_expertise:
-        merged_body = (
-            merged_body.rstrip()
-            + "\n\n---\n\n"
-            + "## Domain Expertise\n\n"
-            + domain_expertise
-            + "\n"
-        )
+        merged_body = merged_body.rstrip() + _expertise_section(domain_expertise)
 
     # Build unified frontmatter
     prefixed_stem = _prefixed(merged_name, name_prefix)
@@ -587,8 +589,7 @@ def _merge_agent_bodies(
         fm_lines.append(f"argument-hint: \"{spec['argument_hint']}\"")
     if spec.get("tools"):
         fm_lines.append("tools:")
-        for t in spec["tools"]:
-            fm_lines.append(f"  - {t}")
+        fm_lines.extend(f"  - {t}" for t in spec["tools"])
     if spec.get("handoffs"):
         fm_lines.append("handoffs:")
         for ho in spec["handoffs"]:
@@ -654,7 +655,7 @@ def _apply_post_rewrites(
             while i < len(fm_lines_list):
                 line = fm_lines_list[i]
                 # Detect `agent: <name>` in handoffs
-                m = re.match(r"^(\s*agent:\s*)(.+)$", line)
+                m = _FM_AGENT_RE.match(line)
                 if m:
                     ref = m.group(2).strip()
                     if ref in prefixed_handoff:
@@ -663,18 +664,18 @@ def _apply_post_rewrites(
                             # Remove entire handoff block — backtrack to
                             # remove the `- label:` line and following lines
                             # (agent, prompt, send)
-                            while new_fm_lines and not re.match(
-                                r"^\s*- label:", new_fm_lines[-1]
+                            while new_fm_lines and not _FM_HANDOFF_LABEL_RE.match(
+                                new_fm_lines[-1]
                             ):
                                 new_fm_lines.pop()
-                            if new_fm_lines and re.match(
-                                r"^\s*- label:", new_fm_lines[-1]
+                            if new_fm_lines and _FM_HANDOFF_LABEL_RE.match(
+                                new_fm_lines[-1]
                             ):
                                 new_fm_lines.pop()
                             # Skip remaining lines of this handoff entry
                             i += 1
-                            while i < len(fm_lines_list) and re.match(
-                                r"^\s+(prompt|send):", fm_lines_list[i]
+                            while i < len(fm_lines_list) and _FM_HANDOFF_TAIL_RE.match(
+                                fm_lines_list[i]
                             ):
                                 i += 1
                             changed = True
@@ -683,25 +684,23 @@ def _apply_post_rewrites(
                             # Check for duplicate — skip if another handoff
                             # already references the same target
                             already_has = any(
-                                re.match(
-                                    rf"^\s*agent:\s*{re.escape(replacement)}\s*$",
-                                    ln,
-                                )
+                                (prev := _FM_AGENT_RE.match(ln)) is not None
+                                and prev.group(2).strip() == replacement
                                 for ln in new_fm_lines
                             )
                             if already_has:
                                 # Remove this duplicate handoff block
-                                while new_fm_lines and not re.match(
-                                    r"^\s*- label:", new_fm_lines[-1]
+                                while new_fm_lines and not _FM_HANDOFF_LABEL_RE.match(
+                                    new_fm_lines[-1]
                                 ):
                                     new_fm_lines.pop()
-                                if new_fm_lines and re.match(
-                                    r"^\s*- label:", new_fm_lines[-1]
+                                if new_fm_lines and _FM_HANDOFF_LABEL_RE.match(
+                                    new_fm_lines[-1]
                                 ):
                                     new_fm_lines.pop()
                                 i += 1
-                                while i < len(fm_lines_list) and re.match(
-                                    r"^\s+(prompt|send):", fm_lines_list[i]
+                                while i < len(fm_lines_list) and _FM_HANDOFF_TAIL_RE.match(
+                                    fm_lines_list[i]
                                 ):
                                     i += 1
                                 changed = True
@@ -722,7 +721,7 @@ def _apply_post_rewrites(
                 changed = True
 
         if changed:
-            path.write_text(f"---\n{fm_text}\n---\n\n{new_body}", encoding="utf-8")
+            _write_agent_file(path, fm_text, new_body)
 
 
 def _compile_claude_agents_from_templates(
@@ -770,30 +769,18 @@ def _compile_claude_agents_from_templates(
 
         # 1. Name prefixing
         prefixed_stem = _prefixed(agent_stem, name_prefix)
-        fm_text = re.sub(
-            r"^(name:\s*).+$",
-            rf"\g<1>{prefixed_stem}",
-            fm_text,
-            flags=re.MULTILINE,
-        )
+        fm_text = _FM_NAME_RE.sub(rf"\g<1>{prefixed_stem}", fm_text)
 
         # 2. Append domain expertise
         if domain_expertise:
-            body = (
-                body.rstrip()
-                + "\n\n---\n\n"
-                + "## Domain Expertise\n\n"
-                + domain_expertise
-                + "\n"
-            )
+            body = body.rstrip() + _expertise_section(domain_expertise)
 
         # 3. Humanize remaining unfilled placeholders
         body = _humanize_unfilled_placeholders(body)
 
         # Reassemble and write
-        output_content = f"---\n{fm_text}\n---\n\n{body}"
         dest = claude_dir / f"{prefixed_stem}.md"
-        dest.write_text(output_content, encoding="utf-8")
+        _write_agent_file(dest, fm_text, body)
         agent_names.append(prefixed_stem)
         logger.debug("Compiled Claude agent template %s → %s", src_file.name, dest)
 
@@ -859,13 +846,7 @@ def _merge_claude_agent_bodies(
 
     merged_body = "\n\n---\n\n".join(body_parts)
     if domain_expertise:
-        merged_body = (
-            merged_body.rstrip()
-            + "\n\n---\n\n"
-            + "## Domain Expertise\n\n"
-            + domain_expertise
-            + "\n"
-        )
+        merged_body = merged_body.rstrip() + _expertise_section(domain_expertise)
 
     prefixed_stem = _prefixed(merged_name, name_prefix)
     fm_lines = [
@@ -964,78 +945,35 @@ def _copy_template_docs(
 # ── Helpers ─────────────────────────────────────────────────────────────
 
 
-def _docs_reference(state: WizardState) -> str:
-    """Build a section pointing the agent to the local docs."""
-    if not state.package_docs:
-        return ""
-    lines = [
-        "### Package Documentation",
-        "",
-        "Local reference documentation is available in the `docs/` directory "
-        "for each installed library. Consult these docs when you need "
-        "detailed API information or usage examples:",
-        "",
-    ]
-    for name in sorted(state.package_docs.keys()):
-        lines.append(f"- `docs/{name.lower().replace(' ', '_')}.md`")
-    return "\n".join(lines)
+_README_TEMPLATE = string.Template("""\
+# $agent_display_name
 
-
-def _readme(
-    state: WizardState,
-    vscode_agent_names: list[str] | None = None,
-    claude_agent_names: list[str] | None = None,
-) -> str:
-    """Generate a README for the copilot/claude agent project."""
-    slug = state.agent_name
-    pkgs = "\n".join(
-        f"- **{p.name}**: {p.description[:80]}"
-        for p in state.confirmed_packages
-    )
-
-    vscode_names = vscode_agent_names or []
-    claude_names = claude_agent_names or []
-
-    vscode_list = (
-        "\n".join(f"- `@{n}`" for n in vscode_names)
-        if vscode_names
-        else f"- `@{slug}`"
-    )
-    claude_list = (
-        "\n".join(f"- `{n}`" for n in claude_names)
-        if claude_names
-        else f"- `{slug}`"
-    )
-
-    return f"""\
-# {state.agent_display_name}
-
-{state.agent_description}
+$agent_description
 
 > Auto-generated by the **sciagent self-assembly wizard**.
 
 ## Output Mode: Copilot / Claude Code Agent
 
-This project contains **{len(vscode_names)} VS Code agents** and
-**{len(claude_names)} Claude Code agents** compiled from SciAgent templates
+This project contains **$vscode_count VS Code agents** and
+**$claude_count Claude Code agents** compiled from SciAgent templates
 with domain-specific expertise.
 
 ### VS Code GitHub Copilot
 
 Agents are in `.github/agents/`:
 
-{vscode_list}
+$vscode_list
 
 To use them:
 1. Copy this project into your workspace
 2. Open VS Code with GitHub Copilot enabled
-3. Select an agent from the Agents dropdown in chat (e.g. `@{slug}-coordinator`)
+3. Select an agent from the Agents dropdown in chat (e.g. `@${slug}-coordinator`)
 
 ### Claude Code
 
 Agents are in `.claude/agents/`:
 
-{claude_list}
+$claude_list
 
 To use them:
 1. Copy the `.claude/agents/` folder into your project
@@ -1044,7 +982,7 @@ To use them:
 ### Shared Instructions
 
 Domain expertise and instructions are in:
-`.github/instructions/{slug}.instructions.md`
+`.github/instructions/${slug}.instructions.md`
 
 ### Package Documentation
 
@@ -1052,8 +990,46 @@ Local docs for each domain package are in `docs/`.
 
 ## Domain Packages
 
-{pkgs or "No additional packages configured."}
-"""
+$pkgs
+""")
+
+
+def _readme(
+    state: WizardState,
+    vscode_agent_names: list[str] | None = None,
+    claude_agent_names: list[str] | None = None,
+) -> str:
+    """Generate a README for the copilot/claude agent project."""
+    slug = state.agent_name
+    pkgs = "\n".join(
+        f"- **{p.name}**: {p.short_description}"
+        for p in state.confirmed_packages
+    )
+
+    vscode_names = vscode_agent_names or []
+    claude_names = claude_agent_names or []
+
+    vscode_list = (
+        "\n".join(f"- `@{n}`" for n in vscode_names)
+        if vscode_names
+        else f"- `@{slug}`"
+    )
+    claude_list = (
+        "\n".join(f"- `{n}`" for n in claude_names)
+        if claude_names
+        else f"- `{slug}`"
+    )
+
+    return _README_TEMPLATE.substitute(
+        agent_display_name=state.agent_display_name,
+        agent_description=state.agent_description,
+        slug=slug,
+        vscode_count=len(vscode_names),
+        claude_count=len(claude_names),
+        vscode_list=vscode_list,
+        claude_list=claude_list,
+        pkgs=pkgs or "No additional packages configured.",
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════
@@ -1088,19 +1064,12 @@ def generate_copilot_plugin(
     Returns:
         Path to the generated plugin directory.
     """
-    base = Path(output_dir) if output_dir else Path.cwd()
-    slug = state.agent_name.replace(" ", "_").replace("-", "_")
-    project_dir = base / slug
-    project_dir.mkdir(parents=True, exist_ok=True)
+    project_dir = _make_project_dir(state, output_dir)
 
     logger.info("Generating copilot plugin in %s", project_dir)
 
     # ── Domain expertise text ───────────────────────────────────────
-    expertise = _build_expertise_text(state)
-    docs_ref = _docs_reference(state)
-    full_instructions = expertise
-    if docs_ref:
-        full_instructions += "\n\n" + docs_ref
+    full_instructions = _build_instructions_text(state)
 
     # ── Compile agents from templates ───────────────────────────────
     agent_names = _compile_agents_from_templates(
@@ -1221,7 +1190,7 @@ def _build_plugin_skills(
         if not combined:
             continue
 
-        pkg_slug = pkg.name.lower().replace(" ", "-").replace("_", "-")
+        pkg_slug = pkg.name.lower().translate(_ANCHOR_TABLE)
         pkg_skill_dir = skills_dir / pkg_slug
         pkg_skill_dir.mkdir(parents=True, exist_ok=True)
         pkg_skill_path = pkg_skill_dir / "SKILL.md"
@@ -1253,7 +1222,7 @@ user-invokable: false
 
 def _package_skill_md(name: str, description: str, doc_content: str) -> str:
     """Generate a per-package SKILL.md with API reference and usage info."""
-    slug = name.lower().replace(" ", "-").replace("_", "-")
+    slug = name.lower().translate(_ANCHOR_TABLE)
     desc_line = description[:120] if description else f"Reference documentation for {name}."
     return f"""\
 ---
@@ -1318,36 +1287,11 @@ def _derive_keywords(state: WizardState) -> list[str]:
 # ── Plugin README ──────────────────────────────────────────────────────
 
 
-def _plugin_readme(
-    state: WizardState,
-    agent_names: list[str],
-    skill_names: list[str],
-) -> str:
-    """Generate README.md for the plugin project."""
-    agent_table = "\n".join(
-        f"| `@{name}` | Compiled from template with domain expertise |" for name in agent_names
-    )
-    skill_table = "\n".join(
-        f"| {name} | `/{name}` |" for name in skill_names
-    )
-    pkgs = "\n".join(
-        f"- **{p.name}**: {p.description[:80]}"
-        for p in state.confirmed_packages
-    )
-
-    n_agents = len(agent_names)
-    n_skills = len(skill_names)
-
-    agent_short_names = ", ".join(
-        n.removeprefix(state.agent_name + "-") if n.startswith(state.agent_name + "-") else n
-        for n in agent_names
-    )
-
-    return f"""\
-# {state.agent_display_name} — Copilot Plugin
+_PLUGIN_README_TEMPLATE = string.Template("""\
+# $agent_display_name — Copilot Plugin
 
-> **{n_agents} specialized agents** and **{n_skills} skills** for
-> {state.agent_description}
+> **$n_agents specialized agents** and **$n_skills skills** for
+> $agent_description
 
 > Auto-generated by the **sciagent self-assembly wizard**.
 
@@ -1359,30 +1303,30 @@ Add this plugin directory to your VS Code settings:
 
 ```jsonc
 // settings.json
-"chat.plugins.paths": {{
-    "/path/to/{state.agent_name}": true
-}}
+"chat.plugins.paths": {
+    "/path/to/$agent_name": true
+}
 ```
 
 ## Agents
 
 | Agent | Description |
 |-------|-------------|
-{agent_table}
+$agent_table
 
 ## Skills
 
 | Skill | Slash Command |
 |-------|---------------|
-{skill_table}
+$skill_table
 
 ## Domain Packages
 
-{pkgs or "No additional packages configured."}
+$pkgs
 
 ## What's Included
 
-- **{n_agents} compiled agents** from SciAgent templates — {agent_short_names} — each with inlined rigor instructions,
+- **$n_agents compiled agents** from SciAgent templates — $agent_short_names — each with inlined rigor instructions,
   appended prompt modules, and domain expertise.
 - **Skills** for scientific rigor enforcement, domain-specific knowledge, and
   per-package API reference.
@@ -1408,4 +1352,42 @@ wizard.
 ## License
 
 MIT
-"""
+""")
+
+
+def _plugin_readme(
+    state: WizardState,
+    agent_names: list[str],
+    skill_names: list[str],
+) -> str:
+    """Generate README.md for the plugin project."""
+    agent_table = "\n".join(
+        f"| `@{name}` | Compiled from template with domain expertise |" for name in agent_names
+    )
+    skill_table = "\n".join(
+        f"| {name} | `/{name}` |" for name in skill_names
+    )
+    pkgs = "\n".join(
+        f"- **{p.name}**: {p.short_description}"
+        for p in state.confirmed_packages
+    )
+
+    n_agents = len(agent_names)
+    n_skills = len(skill_names)
+
+    agent_short_names = ", ".join(
+        n.removeprefix(state.agent_name + "-") if n.startswith(state.agent_name + "-") else n
+        for n in agent_names
+    )
+
+    return _PLUGIN_README_TEMPLATE.substitute(
+        agent_display_name=state.agent_display_name,
+        agent_description=state.agent_description,
+        agent_name=state.agent_name,
+        n_agents=n_agents,
+        n_skills=n_skills,
+        agent_table=agent_table,
+        skill_table=skill_table,
+        pkgs=pkgs or "No additional packages configured.",
+        agent_short_names=agent_short_names,
+    )
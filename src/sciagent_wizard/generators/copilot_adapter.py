@@ -27,12 +27,14 @@ from typing import Optional
 
 from sciagent_wizard.models import WizardState
 from sciagent_wizard.rendering import (
+    _ANCHOR_TABLE,
     _get_templates_dir,
     _build_context,
     render_docs_with_domain_links,
 )
-from .prompt_gen import _build_expertise_text
+from .prompt_gen import _build_instructions_text
 from .docs_gen import write_docs
+from .paths import _make_project_dir
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +114,7 @@ user-invokable: false
 
 def _package_skill_md(name: str, description: str, doc_content: str) -> str:
     """Generate a per-package SKILL.md with API reference."""
-    slug = name.lower().replace(" ", "-").replace("_", "-")
+    slug = name.lower().translate(_ANCHOR_TABLE)
     desc_line = description[:120] if description else f"Reference documentation for {name}."
     return f"""\
 ---
@@ -128,23 +130,6 @@ argument-hint: Ask about {name} APIs, usage patterns, or troubleshooting.
 """
 
 
-def _docs_reference(state: WizardState) -> str:
-    """Build a section pointing the agent to the local docs."""
-    if not state.package_docs:
-        return ""
-    lines = [
-        "### Package Documentation",
-        "",
-        "Local reference documentation is available in the `docs/` directory "
-        "for each installed library. Consult these docs when you need "
-        "detailed API information or usage examples:",
-        "",
-    ]
-    for name in sorted(state.package_docs.keys()):
-        lines.append(f"- `docs/{name.lower().replace(' ', '_')}.md`")
-    return "\n".join(lines)
-
-
 # ── README ──────────────────────────────────────────────────────────────
 
 def _plugin_readme(
@@ -155,7 +140,7 @@ def _plugin_readme(
     """Generate a wizard-specific README for the plugin."""
     slug = state.agent_name
     pkgs = "\n".join(
-        f"- **{p.name}**: {p.description[:80]}"
+        f"- **{p.name}**: {p.short_description}"
         for p in state.confirmed_packages
     )
     agent_list = "\n".join(f"- `@{n}`" for n in agent_names)
@@ -218,19 +203,12 @@ def generate_copilot_via_build(
         Path to the generated plugin directory.
     """
     build_cmd = _find_build_command()
-    base = Path(output_dir) if output_dir else Path.cwd()
-    slug = state.agent_name.replace(" ", "_").replace("-", "_")
-    project_dir = base / slug
-    project_dir.mkdir(parents=True, exist_ok=True)
+    project_dir = _make_project_dir(state, output_dir)
 
     logger.info("Generating copilot plugin via build_plugin.py → %s", project_dir)
 
     # ── Assemble domain expertise ───────────────────────────────────
-    expertise = _build_expertise_text(state)
-    docs_ref = _docs_reference(state)
-    full_instructions = expertise
-    if docs_ref:
-        full_instructions += "\n\n" + docs_ref
+    full_instructions = _build_instructions_text(state)
 
     # ── Build replacements dict from state ──────────────────────────
     replacements = _build_context(state)
@@ -269,7 +247,7 @@ def generate_copilot_via_build(
             combined = "\n\n".join(filter(None, [doc, api_doc]))
             if not combined:
                 continue
-            pkg_slug = pkg.name.lower().replace(" ", "-").replace("_", "-")
+            pkg_slug = pkg.name.lower().translate(_ANCHOR_TABLE)
             pkg_dir = extra_skills / pkg_slug
             pkg_dir.mkdir(exist_ok=True)
             (pkg_dir / "SKILL.md").write_text(
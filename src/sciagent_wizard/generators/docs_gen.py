@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 
@@ -17,35 +18,56 @@ from sciagent_wizard.models import WizardState
 
 logger = logging.getLogger(__name__)
 
+# Doc writes are I/O bound; a handful of threads is plenty.
+_MAX_WRITE_WORKERS = 8
+
 
 def write_docs(state: WizardState, docs_dir: Path) -> List[Path]:
     """Write package documentation markdown files.
 
+    Each package doc is an independent file, so they are written
+    concurrently from a small thread pool.
+
     Args:
         state: Populated wizard state with ``package_docs``.
         docs_dir: Directory to write docs into (created if needed).
 
     Returns:
-        List of paths to written files.
+        List of paths to written files (package docs first, then the index).
     """
     docs_dir.mkdir(parents=True, exist_ok=True)
-    written: List[Path] = []
 
-    # Individual package docs
-    for pkg_name, content in state.package_docs.items():
-        filename = _safe_filename(pkg_name) + ".md"
-        path = docs_dir / filename
-        path.write_text(content, encoding="utf-8")
-        written.append(path)
-        logger.debug("Wrote doc: %s", path)
+    with ThreadPoolExecutor(max_workers=_MAX_WRITE_WORKERS) as pool:
+        futures = [
+            pool.submit(write_package_doc, pkg_name, content, docs_dir)
+            for pkg_name, content in state.package_docs.items()
+        ]
+        written = [f.result() for f in futures]
+
+    # Written last so it still wins if a package slugs to "index".
+    written.append(_write_index(state, docs_dir))
+
+    return written
+
+
+def write_package_doc(pkg_name: str, content: str, docs_dir: Path) -> Path:
+    """Write a single package's documentation file into *docs_dir*.
+
+    Returns:
+        Path to the written file.
+    """
+    path = docs_dir / (_safe_filename(pkg_name) + ".md")
+    path.write_text(content, encoding="utf-8")
+    logger.debug("Wrote doc: %s", path)
+    return path
+
 
-    # Index file
+def _write_index(state: WizardState, docs_dir: Path) -> Path:
+    """Write ``index.md`` cataloguing every package doc."""
     index_path = docs_dir / "index.md"
     index_path.write_text(_build_index(state), encoding="utf-8")
-    written.append(index_path)
     logger.debug("Wrote doc index: %s", index_path)
-
-    return written
+    return index_path
 
 
 def _build_index(state: WizardState) -> str:
@@ -60,7 +82,7 @@ def _build_index(state: WizardState) -> str:
         "",
     ]
 
-    for pkg_name in sorted(state.package_docs.keys()):
+    for pkg_name in state.sorted_package_doc_names:
         filename = _safe_filename(pkg_name) + ".md"
         # Extract first non-empty description line from the doc
         summary = _extract_summary(state.package_docs[pkg_name])
@@ -93,6 +115,15 @@ def _extract_summary(doc_content: str) -> str:
     return "See documentation file for details."
 
 
+def _doc_slugs(state: WizardState) -> Dict[str, str]:
+    """Map each documented package name to its doc filename stem.
+
+    Built once per generation so every link to ``docs/<slug>.md`` uses
+    the same stem :func:`write_package_doc` writes.
+    """
+    return {name: _safe_filename(name) for name in state.package_docs}
+
+
 def _safe_filename(name: str) -> str:
     """Convert a package name to a safe filename slug."""
     return re.sub(r"[^a-zA-Z0-9_-]", "_", name.lower())
@@ -26,6 +26,7 @@ from sciagent_wizard.models import OutputMode, WizardState
 from .config_gen import generate_config_source
 from .copilot_adapter import generate_copilot_via_build as generate_copilot_plugin
 from .docs_gen import write_docs
+from .paths import _make_project_dir
 from .markdown import generate_markdown_project
 from .prompt_gen import generate_prompt_source
 from .tools_gen import generate_tools_source
@@ -48,10 +49,7 @@ def generate_project(
     Returns:
         Path to the generated project directory.
     """
-    base = Path(output_dir) if output_dir else Path.cwd()
-    slug = state.agent_name.replace(" ", "_").replace("-", "_")
-    project_dir = base / slug
-    project_dir.mkdir(parents=True, exist_ok=True)
+    project_dir = _make_project_dir(state, output_dir)
 
     logger.info("Generating agent project in %s (mode=%s)", project_dir, state.output_mode)
 
@@ -124,7 +122,7 @@ def _main_source(state: WizardState) -> str:
     config_const = state.agent_name.upper().replace("-", "_").replace(" ", "_") + "_CONFIG"
     return f'''\
 """
-Entry point: ``python -m {state.agent_name.replace("-", "_")}``
+Entry point: ``python -m {state.agent_slug}``
 """
 
 import sys
@@ -160,8 +158,8 @@ def _requirements(state: WizardState) -> str:
 
 
 def _readme(state: WizardState) -> str:
-    slug = state.agent_name.replace("-", "_")
-    pkgs = "\n".join(f"- {p.name}: {p.description[:80]}" for p in state.confirmed_packages)
+    slug = state.agent_slug
+    pkgs = "\n".join(f"- {p.name}: {p.short_description}" for p in state.confirmed_packages)
     return f"""\
 # {state.agent_display_name}
 
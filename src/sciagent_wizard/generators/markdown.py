@@ -21,19 +21,22 @@ Output structure::
 
 from __future__ import annotations
 
+import itertools
 import logging
-import re
+import string
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional
 
 from sciagent_wizard.models import WizardState
-from .docs_gen import write_docs
+from .docs_gen import _doc_slugs, write_docs
+from .paths import _join_lines, _make_project_dir, _write_files
 from .prompt_gen import _build_expertise_text
 from .profiles import get_profile, get_agent_roster
 from sciagent_wizard.rendering import (
-    _get_templates_dir,
     _build_context,
     _humanize_unfilled_placeholders,
+    _load_template,
+    _sub_placeholders,
     render_docs as render_doc_templates,
 )
 
@@ -56,25 +59,25 @@ def generate_markdown_project(
     Returns:
         Path to the generated project directory.
     """
-    base = Path(output_dir) if output_dir else Path.cwd()
-    slug = state.agent_name.replace(" ", "_").replace("-", "_")
-    project_dir = base / slug
-    project_dir.mkdir(parents=True, exist_ok=True)
+    project_dir = _make_project_dir(state, output_dir)
 
     logger.info("Generating markdown agent spec in %s", project_dir)
 
-    _write = lambda name, content: (project_dir / name).write_text(
-        content, encoding="utf-8"
-    )
-
-    _write("system-prompt.md", _system_prompt(state))
-    _write("tools-reference.md", _tools_reference(state))
-    _write("data-guide.md", _data_guide(state))
-    _write("guardrails.md", _guardrails(state))
-    _write("workflow.md", _workflow(state))
-    _write("agents.md", _agent_roster(state))
-    _write("agent-spec.md", _agent_spec(state))
-    _write("README.md", _readme(state))
+    # Shared by the system prompt and the agent roster.
+    expertise = _build_expertise_text(state)
+    slugs = _doc_slugs(state)
+
+    _write_files(project_dir, {
+        "system-prompt.md": _system_prompt(state, expertise),
+        "tools-reference.md": _tools_reference(state, slugs),
+        # Streamed: grows with the number of example files and columns.
+        "data-guide.md": _join_lines(_iter_data_guide_lines(state)),
+        "guardrails.md": _guardrails(state),
+        "workflow.md": _workflow(state),
+        "agents.md": _agent_roster(state, expertise),
+        "agent-spec.md": _agent_spec(state, slugs),
+        "README.md": _readme(state),
+    })
 
     # Package docs
     docs_dir = project_dir / "docs"
@@ -90,9 +93,12 @@ def generate_markdown_project(
 # ── Individual file generators ──────────────────────────────────────────
 
 
-def _system_prompt(state: WizardState) -> str:
+def _system_prompt(
+    state: WizardState, expertise: Optional[str] = None
+) -> str:
     """Generate the raw system prompt (copy-paste ready)."""
-    expertise = _build_expertise_text(state)
+    if expertise is None:
+        expertise = _build_expertise_text(state)
     return f"""\
 # System Prompt — {state.agent_display_name}
 
@@ -122,8 +128,12 @@ def _system_prompt(state: WizardState) -> str:
 """
 
 
-def _tools_reference(state: WizardState) -> str:
+def _tools_reference(
+    state: WizardState, slugs: Optional[Dict[str, str]] = None
+) -> str:
     """Document available packages and how to use them."""
+    if slugs is None:
+        slugs = _doc_slugs(state)
     lines = [
         f"# Tools & Packages Reference — {state.agent_display_name}",
         "",
@@ -133,27 +143,31 @@ def _tools_reference(state: WizardState) -> str:
         "",
     ]
 
+    append = lines.append
+    extend = lines.extend
+
     for pkg in state.confirmed_packages:
-        mod = pkg.pip_name.replace("-", "_")
-        lines.extend([
-            f"## {pkg.name}",
+        name = pkg.name
+        pip = pkg.pip_name
+        extend((
+            f"## {name}",
             "",
-            f"- **Install**: `{pkg.install_command or f'pip install {pkg.pip_name}'}`",
-            f"- **Import**: `import {mod}`",
-        ])
+            f"- **Install**: `{pkg.effective_install_command}`",
+            f"- **Import**: `import {pip.replace('-', '_')}`",
+        ))
         if pkg.description:
-            lines.extend(["", pkg.description[:300]])
+            extend(("", pkg.description[:300]))
         if pkg.homepage:
-            lines.append(f"- **Homepage**: {pkg.homepage}")
+            append(f"- **Homepage**: {pkg.homepage}")
         if pkg.repository_url:
-            lines.append(f"- **Repository**: {pkg.repository_url}")
+            append(f"- **Repository**: {pkg.repository_url}")
 
         # Reference to detailed docs if available
-        if pkg.name in state.package_docs:
-            safe = pkg.name.lower().replace(" ", "_").replace("-", "_")
-            lines.append(f"- **Detailed docs**: [docs/{safe}.md](docs/{safe}.md)")
+        safe = slugs.get(name)
+        if safe is not None:
+            append(f"- **Detailed docs**: [docs/{safe}.md](docs/{safe}.md)")
 
-        lines.extend(["", "---", ""])
+        extend(("", "---", ""))
 
     if not state.confirmed_packages:
         lines.append("*No domain-specific packages configured.*")
@@ -163,60 +177,66 @@ def _tools_reference(state: WizardState) -> str:
 
 def _data_guide(state: WizardState) -> str:
     """Document supported data formats and structure."""
-    lines = [
-        f"# Data Guide — {state.agent_display_name}",
-        "",
-        "## Supported File Types",
-        "",
-    ]
+    return "\n".join(_iter_data_guide_lines(state))
+
+
+def _iter_data_guide_lines(state: WizardState) -> Iterator[str]:
+    """Yield the lines of ``data-guide.md`` one at a time."""
+    yield f"# Data Guide — {state.agent_display_name}"
+    yield ""
+    yield "## Supported File Types"
+    yield ""
 
     if state.accepted_file_types:
         for ft in state.accepted_file_types:
-            lines.append(f"- `{ft}`")
+            yield f"- `{ft}`"
     else:
-        lines.append("- `.csv` (default)")
+        yield "- `.csv` (default)"
 
-    lines.extend(["", "## Data Structure", ""])
+    yield ""
+    yield "## Data Structure"
+    yield ""
 
     if state.example_files:
         for fi in state.example_files:
-            lines.append(f"### {fi.extension.upper()} files")
+            yield f"### {fi.extension.upper()} files"
             if fi.columns:
                 cols = ", ".join(f"`{c}`" for c in fi.columns[:30])
-                lines.append(f"- **Columns**: {cols}")
+                yield f"- **Columns**: {cols}"
             if fi.row_count:
-                lines.append(f"- **Typical row count**: ~{fi.row_count}")
+                yield f"- **Typical row count**: ~{fi.row_count}"
             if fi.dtypes:
                 type_items = ", ".join(
-                    f"`{k}`: {v}" for k, v in list(fi.dtypes.items())[:10]
+                    f"`{k}`: {v}"
+                    for k, v in itertools.islice(fi.dtypes.items(), 10)
                 )
-                lines.append(f"- **Data types**: {type_items}")
+                yield f"- **Data types**: {type_items}"
             if fi.value_ranges:
-                lines.append("- **Value ranges**:")
+                yield "- **Value ranges**:"
                 for param, (lo, hi) in fi.value_ranges.items():
-                    lines.append(f"  - `{param}`: {lo} – {hi}")
+                    yield f"  - `{param}`: {lo} – {hi}"
             if fi.inferred_domain_hints:
                 hints = ", ".join(fi.inferred_domain_hints)
-                lines.append(f"- **Domain patterns**: {hints}")
-            lines.append("")
+                yield f"- **Domain patterns**: {hints}"
+            yield ""
     else:
-        lines.append(
+        yield (
             "No example data has been analyzed. Inspect the data structure "
             "before starting analysis."
         )
 
     # Expected value ranges (if bounds are set)
     if state.bounds:
-        lines.extend(["", "## Expected Value Ranges", ""])
-        lines.append(
+        yield ""
+        yield "## Expected Value Ranges"
+        yield ""
+        yield (
             "Values outside these ranges should be flagged as potentially "
             "erroneous:"
         )
-        lines.append("")
+        yield ""
         for param, (lo, hi) in state.bounds.items():
-            lines.append(f"- **{param}**: {lo} – {hi}")
-
-    return "\n".join(lines)
+            yield f"- **{param}**: {lo} – {hi}"
 
 
 def _guardrails(state: WizardState) -> str:
@@ -237,39 +257,36 @@ def _guardrails(state: WizardState) -> str:
     ]
 
     if state.bounds:
-        lines.extend([
+        lines.extend((
             "## Value Range Checks",
             "",
             "Flag values outside these ranges:",
             "",
-        ])
-        for param, (lo, hi) in state.bounds.items():
-            lines.append(f"- **{param}**: expected {lo} – {hi}")
+        ))
+        lines.extend(state.bounds_lines)
         lines.append("")
 
     if state.forbidden_patterns:
-        lines.extend([
+        lines.extend((
             "## Forbidden Patterns",
             "",
             "Never generate code that matches these patterns:",
             "",
-        ])
-        for pat, msg in state.forbidden_patterns:
-            lines.append(f"- `{pat}`: {msg}")
+        ))
+        lines.extend(state.forbidden_lines)
         lines.append("")
 
     if state.warning_patterns:
-        lines.extend([
+        lines.extend((
             "## Warning Patterns",
             "",
             "These patterns should trigger a warning — proceed with caution:",
             "",
-        ])
-        for pat, msg in state.warning_patterns:
-            lines.append(f"- `{pat}`: {msg}")
+        ))
+        lines.extend(state.warning_lines)
         lines.append("")
 
-    lines.extend([
+    lines.extend((
         "## Code Safety",
         "",
         "- Never generate synthetic data to replace real experimental data",
@@ -277,7 +294,7 @@ def _guardrails(state: WizardState) -> str:
         "- Always preserve raw data — work on copies",
         "- Include error handling in all analysis code",
         "- Make all analysis steps reproducible",
-    ])
+    ))
 
     return "\n".join(lines)
 
@@ -310,13 +327,14 @@ def _workflow(state: WizardState) -> str:
     ]
 
     if state.confirmed_packages:
-        lines.append("Available packages for analysis:")
-        lines.append("")
-        for pkg in state.confirmed_packages:
-            lines.append(f"- **{pkg.name}**: {pkg.description[:80]}")
+        lines.extend(("Available packages for analysis:", ""))
+        lines.extend(
+            f"- **{pkg.name}**: {pkg.short_description}"
+            for pkg in state.confirmed_packages
+        )
         lines.append("")
 
-    lines.extend([
+    lines.extend((
         "## 4. Visualisation",
         "",
         "- Generate clear, labelled plots for all results",
@@ -330,12 +348,14 @@ def _workflow(state: WizardState) -> str:
         "- Export results in a standard format (CSV, JSON)",
         "- Generate a reproducible script that captures the full analysis",
         "- Include all parameters and settings used",
-    ])
+    ))
 
     return "\n".join(lines)
 
 
-def _agent_roster(state: WizardState) -> str:
+def _agent_roster(
+    state: WizardState, expertise: Optional[str] = None
+) -> str:
     """Render a customised agent roster from the builtin_agents template.
 
     Reads the ``builtin_agents.md`` template, applies wizard-state
@@ -345,23 +365,18 @@ def _agent_roster(state: WizardState) -> str:
     prefix = state.agent_name
 
     # Read the template
-    template_path = _get_templates_dir() / _BUILTIN_AGENTS_TEMPLATE
-    if not template_path.exists():
-        logger.warning("Agent roster template not found: %s", template_path)
+    try:
+        text = _load_template(_BUILTIN_AGENTS_TEMPLATE)
+    except FileNotFoundError as exc:
+        logger.warning("Agent roster template not found: %s", exc)
         return f"# {state.agent_display_name} — Agent Roster\n\n*No agent roster template available.*\n"
 
-    text = template_path.read_text(encoding="utf-8")
-
-    # Apply REPLACE placeholder substitutions from wizard state
+    # Apply REPLACE placeholder substitutions from wizard state in one
+    # pass; placeholders without a context value are left intact.
     context = _build_context(state)
-    for key, value in context.items():
-        pattern = re.compile(
-            r"<!--\s*REPLACE:\s*"
-            + re.escape(key)
-            + r"\s*(?:—.*?)?\s*-->",
-            re.DOTALL,
-        )
-        text = pattern.sub(value, text)
+    text = _sub_placeholders(
+        text, lambda m: context.get(m.group(1), m.group(0)),
+    )
 
     # Prefix agent names throughout the roster text.
     # Build stems list from the active profile roster.
@@ -409,7 +424,8 @@ def _agent_roster(state: WizardState) -> str:
         text = text.replace(prefixed_old, prefixed_new)
 
     # Append domain expertise section
-    expertise = _build_expertise_text(state)
+    if expertise is None:
+        expertise = _build_expertise_text(state)
     if expertise:
         text = (
             text.rstrip()
@@ -425,19 +441,12 @@ def _agent_roster(state: WizardState) -> str:
     return text
 
 
-def _agent_spec(state: WizardState) -> str:
-    """Master specification that ties everything together."""
-    roster = get_agent_roster(state.profile)
-    agent_table_rows = "\n".join(
-        f"| `{state.agent_name}-{stem}` | {role} |"
-        for stem, role in roster
-    )
-    return f"""\
-# {state.agent_display_name} — Agent Specification
+_AGENT_SPEC_TEMPLATE = string.Template("""\
+# $agent_display_name — Agent Specification
 
-{state.agent_emoji} **{state.agent_display_name}**
+$agent_emoji **$agent_display_name**
 
-{state.agent_description}
+$agent_description
 
 > Auto-generated by the **sciagent self-assembly wizard**.
 > These files define a platform-agnostic scientific analysis agent.
@@ -460,7 +469,7 @@ For best results, provide the LLM with all of these files:
 
 ### Package Documentation
 Detailed documentation for each domain package is in `docs/`:
-{"".join(chr(10) + f"- [docs/{n.lower().replace(' ', '_')}.md](docs/{n.lower().replace(' ', '_')}.md)" for n in sorted(state.package_docs.keys())) if state.package_docs else chr(10) + "*No package docs generated.*"}
+$doc_links
 
 ### Extended Reference Documentation
 The `docs/` directory also contains detailed reference templates:
@@ -478,39 +487,83 @@ for full details):
 
 | Agent | Role |
 |-------|------|
-{agent_table_rows}
+$agent_table_rows
 
 ## Agent Identity
 
 | Field | Value |
 |-------|-------|
-| Name  | {state.agent_name} |
-| Display Name | {state.agent_display_name} |
-| Description | {state.agent_description} |
-| Emoji | {state.agent_emoji} |
+| Name  | $agent_name |
+| Display Name | $agent_display_name |
+| Description | $agent_description |
+| Emoji | $agent_emoji |
 
 ## Domain
 
-{state.domain_description or "Not specified."}
+$domain
 
 ## Research Goals
 
-{"".join(chr(10) + f"- {g}" for g in state.research_goals) if state.research_goals else chr(10) + "Not specified."}
+$goals
 
 ## Packages
 
 | Package | Description | Install |
 |---------|-------------|---------|
-{"".join(f"| {p.name} | {p.description[:60]} | `{p.install_command}` |" + chr(10) for p in state.confirmed_packages) if state.confirmed_packages else "| *None* | | |" + chr(10)}
-"""
+$package_rows
+""")
 
 
-def _readme(state: WizardState) -> str:
-    """README for the markdown agent project."""
-    return f"""\
-# {state.agent_display_name}
+def _agent_spec(
+    state: WizardState, slugs: Optional[Dict[str, str]] = None
+) -> str:
+    """Master specification that ties everything together."""
+    if slugs is None:
+        slugs = _doc_slugs(state)
+    roster = get_agent_roster(state.profile)
+    agent_table_rows = "\n".join(
+        f"| `{state.agent_name}-{stem}` | {role} |"
+        for stem, role in roster
+    )
+
+    if state.package_docs:
+        doc_links = "".join(
+            f"\n- [docs/{slug}.md](docs/{slug}.md)"
+            for slug in (slugs[n] for n in state.sorted_package_doc_names)
+        )
+    else:
+        doc_links = "\n*No package docs generated.*"
+
+    if state.research_goals:
+        goals = "".join(f"\n- {g}" for g in state.research_goals)
+    else:
+        goals = "\nNot specified."
+
+    if state.confirmed_packages:
+        package_rows = "".join(
+            f"| {p.name} | {p.description[:60]} | `{p.install_command}` |\n"
+            for p in state.confirmed_packages
+        )
+    else:
+        package_rows = "| *None* | | |\n"
+
+    return _AGENT_SPEC_TEMPLATE.substitute(
+        agent_name=state.agent_name,
+        agent_display_name=state.agent_display_name,
+        agent_description=state.agent_description,
+        agent_emoji=state.agent_emoji,
+        doc_links=doc_links,
+        agent_table_rows=agent_table_rows,
+        domain=state.domain_description or "Not specified.",
+        goals=goals,
+        package_rows=package_rows,
+    )
+
 
-{state.agent_description}
+_README_TEMPLATE = string.Template("""\
+# $agent_display_name
+
+$agent_description
 
 > Auto-generated by the **sciagent self-assembly wizard**.
 
@@ -541,4 +594,12 @@ paste the system prompt and relevant context into your preferred tool.
 
 For best results, also provide `tools-reference.md` and `data-guide.md`
 in your conversation context.
-"""
+""")
+
+
+def _readme(state: WizardState) -> str:
+    """README for the markdown agent project."""
+    return _README_TEMPLATE.substitute(
+        agent_display_name=state.agent_display_name,
+        agent_description=state.agent_description,
+    )
@@ -0,0 +1,94 @@
+"""
+paths — Project-directory helpers shared by every output mode.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from sciagent_wizard.models import WizardState
+
+# Buffer size for generated-file writes; one flush per file for typical output.
+_WRITE_BUFFER = 1 << 16
+
+# Spaces and hyphens both collapse to underscores in directory slugs.
+_SLUG_TABLE = str.maketrans({" ": "_", "-": "_"})
+
+
+def _slugify(name: str) -> str:
+    """Convert an agent name to a filesystem/module-safe slug."""
+    return name.translate(_SLUG_TABLE)
+
+
+def _make_project_dir(
+    state: WizardState,
+    output_dir: Optional[str | Path] = None,
+) -> Path:
+    """Create and return ``<output_dir>/<agent slug>``.
+
+    Args:
+        state: Wizard state providing ``agent_name``.
+        output_dir: Parent directory. Defaults to CWD.
+    """
+    base = Path(output_dir) if output_dir else Path.cwd()
+    project_dir = base / _slugify(state.agent_name)
+    project_dir.mkdir(parents=True, exist_ok=True)
+    return project_dir
+
+
+def _make_dirs(root: Path, *leaves: str) -> None:
+    """Create the given sub-directories of *root* in one pass.
+
+    Leaves that are an ancestor of another requested leaf are skipped,
+    since ``mkdir(parents=True)`` on the deeper one creates them anyway.
+    """
+    parts = {PurePosixPath(leaf).parts for leaf in leaves}
+    for leaf in parts:
+        if any(other[: len(leaf)] == leaf and other != leaf for other in parts):
+            continue
+        root.joinpath(*leaf).mkdir(parents=True, exist_ok=True)
+
+
+def _join_lines(lines: Iterable[str]) -> Iterator[str]:
+    """Yield *lines* newline-separated, like ``"\\n".join`` but lazily."""
+    it = iter(lines)
+    for line in it:
+        yield line
+        break
+    for line in it:
+        yield "\n"
+        yield line
+
+
+def _write_files(
+    project_dir: Path,
+    files: Dict[str, Union[str, Iterable[str]]],
+) -> List[str]:
+    """Write ``{relative_path: content}`` under *project_dir*.
+
+    *content* is either a complete string or an iterable of chunks; chunks
+    are streamed into the file as they are produced, so a large document
+    never has to exist as one string.  The files are independent, so they
+    are written from a small thread pool (file I/O releases the GIL),
+    each through one buffered handle.
+
+    Returns:
+        Paths written (as strings), in the order of *files*.
+    """
+    base = os.fspath(project_dir)
+
+    def _write(item: tuple[str, Union[str, Iterable[str]]]) -> str:
+        name, content = item
+        path = os.path.join(base, name)
+        with open(path, "w", encoding="utf-8", buffering=_WRITE_BUFFER) as fh:
+            if isinstance(content, str):
+                fh.write(content)
+            else:
+                fh.writelines(content)
+        return path
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        return list(pool.map(_write, files.items()))
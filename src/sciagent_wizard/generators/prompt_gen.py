@@ -4,7 +4,11 @@ Generate the domain expertise prompt section for a new agent.
 
 from __future__ import annotations
 
+import functools
+from typing import Dict, Optional, Tuple
+
 from sciagent_wizard.models import WizardState
+from .docs_gen import _doc_slugs
 
 
 def generate_prompt_source(state: WizardState) -> str:
@@ -32,26 +36,59 @@ DOMAIN_EXPERTISE = """
 
 
 def _build_expertise_text(state: WizardState) -> str:
-    """Compose domain expertise from wizard state fields."""
+    """Compose domain expertise from wizard state fields.
+
+    Memoized on a snapshot of the fields it reads, so repeated calls for
+    an unchanged state (several generators, re-runs) reuse the text.
+    """
+    return _expertise_text(
+        state.agent_display_name,
+        state.domain_description,
+        tuple(state.research_goals),
+        tuple((p.name, p.description) for p in state.confirmed_packages),
+        tuple(state.accepted_file_types),
+        tuple(
+            (fi.extension, tuple(fi.columns[:20]), tuple(fi.inferred_domain_hints))
+            for fi in state.example_files
+        ),
+        tuple((param, tuple(rng)) for param, rng in state.bounds.items()),
+        state.sorted_package_doc_names,
+        state.domain_prompt,
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _expertise_text(
+    display_name: str,
+    domain_description: str,
+    research_goals: Tuple[str, ...],
+    packages: Tuple[Tuple[str, str], ...],
+    file_types: Tuple[str, ...],
+    example_files: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...],
+    bounds: Tuple[Tuple[str, Tuple[float, float]], ...],
+    doc_names: Tuple[str, ...],
+    domain_prompt: str,
+) -> str:
+    """Build the expertise text from a hashable state snapshot."""
     sections: list[str] = []
 
     # Header
-    sections.append(f"## {state.agent_display_name} — Domain Expertise")
+    sections.append(f"## {display_name} — Domain Expertise")
 
     # Domain description
-    if state.domain_description:
-        sections.append(f"### Domain\n{state.domain_description}")
+    if domain_description:
+        sections.append(f"### Domain\n{domain_description}")
 
     # Research goals
-    if state.research_goals:
-        goals = "\n".join(f"- {g}" for g in state.research_goals)
+    if research_goals:
+        goals = "\n".join(f"- {g}" for g in research_goals)
         sections.append(f"### Research Goals\n{goals}")
 
     # Available libraries
-    if state.confirmed_packages:
+    if packages:
         libs = []
-        for pkg in state.confirmed_packages:
-            desc = f"  - **{pkg.name}**: {pkg.description}" if pkg.description else f"  - **{pkg.name}**"
+        for name, description in packages:
+            desc = f"  - **{name}**: {description}" if description else f"  - **{name}**"
             libs.append(desc)
         lib_text = "\n".join(libs)
         sections.append(
@@ -63,27 +100,27 @@ def _build_expertise_text(state: WizardState) -> str:
         )
 
     # File types
-    if state.accepted_file_types:
-        types = ", ".join(f"`{t}`" for t in state.accepted_file_types)
+    if file_types:
+        types = ", ".join(f"`{t}`" for t in file_types)
         sections.append(f"### Supported File Types\n{types}")
 
     # Data characteristics (from example data)
-    if state.example_files:
+    if example_files:
         data_hints: list[str] = []
-        for fi in state.example_files:
-            if fi.columns:
-                cols = ", ".join(fi.columns[:20])
-                data_hints.append(f"- **{fi.extension}** files with columns: {cols}")
-            if fi.inferred_domain_hints:
-                hints = ", ".join(fi.inferred_domain_hints)
+        for extension, columns, domain_hints in example_files:
+            if columns:
+                cols = ", ".join(columns)
+                data_hints.append(f"- **{extension}** files with columns: {cols}")
+            if domain_hints:
+                hints = ", ".join(domain_hints)
                 data_hints.append(f"  Domain patterns detected: {hints}")
         if data_hints:
             sections.append("### Typical Data Structure\n" + "\n".join(data_hints))
 
     # Bounds / expected ranges
-    if state.bounds:
+    if bounds:
         range_items = []
-        for param, (lo, hi) in state.bounds.items():
+        for param, (lo, hi) in bounds:
             range_items.append(f"- **{param}**: {lo} – {hi}")
         sections.append(
             "### Expected Value Ranges\n"
@@ -92,7 +129,7 @@ def _build_expertise_text(state: WizardState) -> str:
         )
 
     # Package documentation reference
-    if state.package_docs:
+    if doc_names:
         doc_lines = [
             "### Package Documentation",
             "",
@@ -101,17 +138,63 @@ def _build_expertise_text(state: WizardState) -> str:
             "to access them by name:",
             "",
         ]
-        for name in sorted(state.package_docs.keys()):
+        for name in doc_names:
             doc_lines.append(f"- `{name}`")
         sections.append("\n".join(doc_lines))
 
     # Use any pre-generated prompt content from the LLM refinement step
-    if state.domain_prompt:
-        sections.append(f"### Additional Domain Knowledge\n{state.domain_prompt}")
+    if domain_prompt:
+        sections.append(f"### Additional Domain Knowledge\n{domain_prompt}")
 
     return "\n\n".join(sections)
 
 
+def _docs_reference(
+    state: WizardState, slugs: Optional[Dict[str, str]] = None
+) -> str:
+    """Build a section pointing the agent to the local docs."""
+    if not state.package_docs:
+        return ""
+    if slugs is None:
+        slugs = _doc_slugs(state)
+    return _docs_reference_text(
+        tuple(slugs[name] for name in state.sorted_package_doc_names)
+    )
+
+
+@functools.lru_cache(maxsize=128)
+def _docs_reference_text(doc_slugs: Tuple[str, ...]) -> str:
+    """Build the local-docs section for the given (sorted) doc slugs."""
+    lines = [
+        "### Package Documentation",
+        "",
+        "Local reference documentation is available in the `docs/` directory "
+        "for each installed library. Consult these docs when you need "
+        "detailed API information or usage examples:",
+        "",
+    ]
+    lines.extend(f"- `docs/{slug}.md`" for slug in doc_slugs)
+    return "\n".join(lines)
+
+
+def _build_instructions_text(
+    state: WizardState,
+    expertise: Optional[str] = None,
+) -> str:
+    """Domain expertise followed by the local-docs pointer (if any).
+
+    This is the instruction body shared by the Copilot project, plugin
+    and build-script outputs.  Pass *expertise* when the caller has
+    already built it.
+    """
+    if expertise is None:
+        expertise = _build_expertise_text(state)
+    docs_ref = _docs_reference(state)
+    if not docs_ref:
+        return expertise
+    return f"{expertise}\n\n{docs_ref}"
+
+
 def _esc_triple(text: str) -> str:
     """Escape text for embedding inside triple-quoted Python strings."""
     return text.replace("\\", "\\\\").replace('"""', '\\"\\"\\"')
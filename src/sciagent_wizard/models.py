@@ -4,9 +4,19 @@ Data models shared across the wizard subsystem.
 
 from __future__ import annotations
 
+import functools
+import hashlib
+import json
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Value types created in bulk (discovery fan-in, file analysis) are
+# slotted where the interpreter supports it (``slots=`` is 3.10+).
+_SLOTS: dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 # ── Discovery models ────────────────────────────────────────────────────
@@ -24,71 +34,92 @@ class OutputMode(str, Enum):
     COPILOT_PLUGIN = "copilot"
 
 
-# Supported LLM models for wizard backend (billing selection)
-SUPPORTED_MODELS: tuple[str, ...] = (
-    "claude-opus-4.5",
-    "claude-sonnet-4.5",
-    "claude-sonnet-4.6",
-    "gpt-5.3",
-    "gpt-5.3-codex",
-    "claude-haiku-3.5",
-    "gpt-4o",
-    "gpt-4o-mini",
+# Supported LLM models for wizard backend (billing selection), as
+# ``(model_id, UI label, is_default)`` rows.  Every model table below is
+# derived from these rows in a single pass.  Model ids are interned so
+# membership and equality checks against them are mostly pointer compares.
+_MODEL_ROWS: tuple[tuple[str, str, bool], ...] = tuple(
+    (sys.intern(model), label, is_default)
+    for model, label, is_default in (
+        ("claude-opus-4.5", "Claude Opus 4.5 — Most capable", False),
+        ("claude-sonnet-4.5", "Claude Sonnet 4.5 — Fast & capable", False),
+        ("claude-sonnet-4.6", "Claude Sonnet 4.6 — Latest Sonnet; 1x rates but strong", True),
+        ("gpt-5.3", "GPT-5.3 — OpenAI flagship", False),
+        ("gpt-5.3-codex", "GPT-5.3 Codex — Code-optimized", False),
+        ("claude-haiku-3.5", "Claude Haiku 3.5 — Fastest, lowest cost", False),
+        ("gpt-4o", "GPT-4o — OpenAI multi-modal", False),
+        ("gpt-4o-mini", "GPT-4o Mini — Cost-effective", False),
+    )
 )
 
+SUPPORTED_MODELS: tuple[str, ...] = tuple(row[0] for row in _MODEL_ROWS)
+_SUPPORTED_MODELS_SET: frozenset[str] = frozenset(SUPPORTED_MODELS)
+
+
+def is_supported_model(model: str) -> bool:
+    """Return True if *model* is one of :data:`SUPPORTED_MODELS`."""
+    return model in _SUPPORTED_MODELS_SET
+
+
 # Display metadata for each model (label shown in UI)
 MODEL_METADATA: dict[str, dict[str, Any]] = {
-    "claude-opus-4.5": {
-        "label": "Claude Opus 4.5 — Most capable",
-        "default": False,
-    },
-    "claude-sonnet-4.5": {
-        "label": "Claude Sonnet 4.5 — Fast & capable",
-        "default": False,
-    },
-    "claude-sonnet-4.6": {
-        "label": "Claude Sonnet 4.6 — Latest Sonnet; 1x rates but strong",
-        "default": True,
-    },
-    "gpt-5.3": {
-        "label": "GPT-5.3 — OpenAI flagship",
-        "default": False,
-    },
-    "gpt-5.3-codex": {
-        "label": "GPT-5.3 Codex — Code-optimized",
-        "default": False,
-    },
-    "claude-haiku-3.5": {
-        "label": "Claude Haiku 3.5 — Fastest, lowest cost",
-        "default": False,
-    },
-    "gpt-4o": {
-        "label": "GPT-4o — OpenAI multi-modal",
-        "default": False,
-    },
-    "gpt-4o-mini": {
-        "label": "GPT-4o Mini — Cost-effective",
-        "default": False,
-    },
+    model: {"label": label, "default": is_default}
+    for model, label, is_default in _MODEL_ROWS
+}
+
+
+# Frontend model configuration, materialised once at import.
+MODELS_CONFIG: dict[str, Any] = {
+    "models": [{"value": model, "label": label} for model, label, _ in _MODEL_ROWS],
+    # The last default-flagged row wins.
+    "default_model": next(
+        (model for model, _, is_default in reversed(_MODEL_ROWS) if is_default),
+        SUPPORTED_MODELS[0],
+    ),
 }
 
 
 def get_models_config() -> dict[str, Any]:
-    """Return model configuration for the frontend."""
-    models = []
-    default_model = SUPPORTED_MODELS[0]  # fallback
-    for model_id in SUPPORTED_MODELS:
-        meta = MODEL_METADATA.get(model_id, {})
-        models.append({
-            "value": model_id,
-            "label": meta.get("label", model_id),
-        })
-        if meta.get("default"):
-            default_model = model_id
-    return {
-        "models": models,
-        "default_model": default_model,
-    }
+    """Return model configuration for the frontend.
+
+    This is the shared :data:`MODELS_CONFIG` constant; callers must not
+    mutate it.
+    """
+    return MODELS_CONFIG
+
+
+@functools.lru_cache(maxsize=1)
+def get_models_config_json() -> bytes:
+    """Return :func:`get_models_config` pre-serialised as UTF-8 JSON."""
+    return json.dumps(get_models_config()).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=1)
+def get_models_config_etag() -> str:
+    """Return a stable (unquoted) ETag for :func:`get_models_config_json`."""
+    return hashlib.sha1(get_models_config_json()).hexdigest()
+
+
+# /api/config only changes on redeploy; browsers revalidate via ETag.
+_CONFIG_CACHE_CONTROL = "public, max-age=300"
+
+
+def models_config_response(if_none_match: Any) -> Any:
+    """Build the Quart response for an ``/api/config`` endpoint.
+
+    *if_none_match* is the request's parsed ``If-None-Match`` header; a
+    client already holding the current ETag gets an empty ``304``.
+    """
+    from quart import Response
+
+    etag = get_models_config_etag()
+    if if_none_match.contains(etag):
+        response = Response(b"", status=304)
+    else:
+        response = Response(get_models_config_json(), mimetype="application/json")
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = _CONFIG_CACHE_CONTROL
+    return response
 
 
 class WizardPhase(str, Enum):
@@ -102,7 +133,7 @@ class WizardPhase(str, Enum):
     COMPLETE = "complete"          # Done
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class PendingQuestion:
     """A structured question awaiting the user's response."""
 
@@ -126,7 +157,11 @@ class DiscoverySource(str, Enum):
     USER = "user"  # manually specified by the researcher
 
 
-@dataclass
+# Length of the package description previews shown in generated listings.
+SHORT_DESCRIPTION_CHARS = 80
+
+
+@dataclass(**_SLOTS)
 class PackageCandidate:
     """A discovered software package that may be useful in the researcher's domain."""
 
@@ -149,6 +184,16 @@ class PackageCandidate:
         """The name to use with ``pip install``."""
         return self.python_package or self.name
 
+    @property
+    def effective_install_command(self) -> str:
+        """``install_command``, or ``pip install <pip_name>`` if unset."""
+        return self.install_command or f"pip install {self.pip_name}"
+
+    @property
+    def short_description(self) -> str:
+        """The description cut to a one-line listing preview (80 chars)."""
+        return self.description[:SHORT_DESCRIPTION_CHARS]
+
     def merge(self, other: "PackageCandidate") -> "PackageCandidate":
         """Merge another candidate for the same package (union of metadata)."""
         return PackageCandidate(
@@ -162,8 +207,10 @@ class PackageCandidate:
             downloads=max(self.downloads, other.downloads),
             relevance_score=max(self.relevance_score, other.relevance_score),
             peer_reviewed=self.peer_reviewed or other.peer_reviewed,
-            publication_dois=list(set(self.publication_dois + other.publication_dois)),
-            keywords=list(set(self.keywords + other.keywords)),
+            publication_dois=list(
+                dict.fromkeys((*self.publication_dois, *other.publication_dois))
+            ),
+            keywords=list(dict.fromkeys((*self.keywords, *other.keywords))),
             python_package=self.python_package or other.python_package,
         )
 
@@ -171,7 +218,7 @@ class PackageCandidate:
 # ── Wizard state ────────────────────────────────────────────────────────
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DataFileInfo:
     """Metadata inferred from an uploaded example data file."""
 
@@ -184,6 +231,16 @@ class DataFileInfo:
     inferred_domain_hints: List[str] = field(default_factory=list)
 
 
+def _pattern_bullets(patterns) -> Iterator[str]:
+    """Format ``(pattern, message)`` pairs as markdown bullets."""
+    return (f"- `{pat}`: {msg}" for pat, msg in patterns)
+
+
+# Field getters for the per-item rows in ``WizardState.to_dict``.
+_PACKAGE_ROW = attrgetter("name", "description", "source")
+_FILE_ROW = attrgetter("path", "columns", "row_count")
+
+
 @dataclass
 class WizardState:
     """Accumulated state throughout the wizard conversation.
@@ -242,14 +299,76 @@ class WizardState:
     pending_question: Optional["PendingQuestion"] = None
     last_generate_result: Optional[Dict[str, Any]] = None
 
+    # Derived views (guardrail bullets, sorted doc names), each stored with
+    # a snapshot of the data it was built from.
+    _derived: Dict[str, Tuple[Any, Tuple[str, ...]]] = field(
+        default_factory=dict, init=False, repr=False, compare=False,
+    )
+
     def __post_init__(self):
         if self.output_mode is None:
             self.output_mode = OutputMode.FULLSTACK
         if self.phase is None:
             self.phase = WizardPhase.INTAKE
 
+    @property
+    def agent_slug(self) -> str:
+        """``agent_name`` as a module name (hyphens → underscores)."""
+        return self.agent_name.replace("-", "_")
+
+    # ── Derived views (cached until the source data changes) ────────
+
+    @property
+    def bounds_lines(self) -> Tuple[str, ...]:
+        """``- **param**: expected lo – hi`` bullets for ``bounds``."""
+        return self._cached_view(
+            "bounds",
+            tuple(self.bounds.items()),
+            lambda items: (
+                f"- **{param}**: expected {lo} – {hi}"
+                for param, (lo, hi) in items
+            ),
+        )
+
+    @property
+    def forbidden_lines(self) -> Tuple[str, ...]:
+        """``- `pattern`: message`` bullets for ``forbidden_patterns``."""
+        return self._cached_view(
+            "forbidden", tuple(self.forbidden_patterns), _pattern_bullets
+        )
+
+    @property
+    def warning_lines(self) -> Tuple[str, ...]:
+        """``- `pattern`: message`` bullets for ``warning_patterns``."""
+        return self._cached_view(
+            "warning", tuple(self.warning_patterns), _pattern_bullets
+        )
+
+    @property
+    def sorted_package_doc_names(self) -> Tuple[str, ...]:
+        """``package_docs`` keys in sorted order."""
+        return self._cached_view("doc_names", tuple(self.package_docs), sorted)
+
+    def _cached_view(
+        self,
+        key: str,
+        snapshot: Tuple[Any, ...],
+        build: Callable[[Tuple[Any, ...]], Iterable[str]],
+    ) -> Tuple[str, ...]:
+        """Return the view for *key*, rebuilding only if *snapshot* changed."""
+        cached = self._derived.get(key)
+        if cached is not None and cached[0] == snapshot:
+            return cached[1]
+        view = tuple(build(snapshot))
+        self._derived[key] = (snapshot, view)
+        return view
+
     def to_dict(self) -> Dict[str, Any]:
-        """Serialise for LLM tool results / JSON storage."""
+        """Serialise for LLM tool results / JSON storage.
+
+        Enum fields are left as their ``str``-mixin members, which JSON
+        encoders already write out as the plain value.
+        """
         d = {
             "domain_description": self.domain_description,
             "research_goals": self.research_goals,
@@ -259,20 +378,20 @@ class WizardState:
             "agent_description": self.agent_description,
             "accepted_file_types": self.accepted_file_types,
             "confirmed_packages": [
-                {"name": p.name, "description": p.description, "source": p.source.value}
-                for p in self.confirmed_packages
+                {"name": name, "description": desc, "source": source}
+                for name, desc, source in map(_PACKAGE_ROW, self.confirmed_packages)
             ],
             "example_files": [
-                {"path": f.path, "columns": f.columns, "rows": f.row_count}
-                for f in self.example_files
+                {"path": path, "columns": columns, "rows": rows}
+                for path, columns, rows in map(_FILE_ROW, self.example_files)
             ],
             "bounds": self.bounds,
-            "output_mode": self.output_mode.value,
+            "output_mode": self.output_mode,
             "profile": self.profile,
             "package_docs_count": len(self.package_docs),
             "output_dir": self.output_dir,
             "project_dir": self.project_dir,
-            "phase": self.phase.value,
+            "phase": self.phase,
             "guided_mode": self.guided_mode,
             "data_types": self.data_types,
             "analysis_goals": self.analysis_goals,
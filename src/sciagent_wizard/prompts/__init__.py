@@ -2,23 +2,46 @@
 Wizard prompt templates — system messages for both normal and public/guided mode.
 
 Prompt text lives in sibling ``.md`` files for readability and diffability.
-This module loads them at import time and re-exports the same public names
+This module exposes them under the same public names
 (``WIZARD_EXPERTISE``, ``PUBLIC_WIZARD_EXPERTISE``) so downstream imports
-are unchanged.
+are unchanged.  Each file is read lazily on first attribute access
+(PEP 562), so importers that never touch a prompt pay no disk I/O.
 """
 
+import functools
 from pathlib import Path
 
 _PROMPT_DIR = Path(__file__).resolve().parent
 
 
+@functools.lru_cache(maxsize=None)
 def _load(name: str) -> str:
-    """Read a Markdown prompt file from the prompts directory."""
+    """Read a Markdown prompt file from the prompts directory.
+
+    Cached, so repeated loads of the same prompt never touch the disk
+    again; call ``_load.cache_clear()`` to pick up edited files.
+    """
     return (_PROMPT_DIR / name).read_text(encoding="utf-8")
 
 
-# ── Wizard system prompt ───────────────────────────────────────────────
-WIZARD_EXPERTISE = _load("wizard_expertise.md")
+# Public attribute name → Markdown file it is loaded from.
+_PROMPT_FILES = {
+    # ── Wizard system prompt ───────────────────────────────────────────
+    "WIZARD_EXPERTISE": "wizard_expertise.md",
+    # ── Public / guided-mode system prompt ─────────────────────────────
+    "PUBLIC_WIZARD_EXPERTISE": "public_wizard_expertise.md",
+}
+
+
+def __getattr__(name: str) -> str:
+    """Load a prompt on first access and bind it as a module global."""
+    try:
+        filename = _PROMPT_FILES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = globals()[name] = _load(filename)
+    return value
+
 
-# ── Public / guided-mode system prompt ─────────────────────────────────
-PUBLIC_WIZARD_EXPERTISE = _load("public_wizard_expertise.md")
+def __dir__():
+    return sorted({*globals(), *_PROMPT_FILES})
@@ -12,48 +12,103 @@ from __future__ import annotations
 import json
 import logging
 import os
-import uuid
-from pathlib import Path
+import secrets
+import time
+from collections import deque
 
-from quart import Blueprint, request, jsonify, send_from_directory
+from quart import Blueprint, Response, request, send_from_directory
 
 from .auth import require_auth, is_oauth_configured, get_github_token
-from .models import get_models_config
+from .models import get_models_config, models_config_response
 
 logger = logging.getLogger(__name__)
 
-_PKG_DIR = Path(__file__).resolve().parent
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
 
 public_bp = Blueprint(
     "public_wizard",
     __name__,
-    static_folder=str(_PKG_DIR / "static"),
-    template_folder=str(_PKG_DIR / "templates_html"),
+    static_folder=os.path.join(_PKG_DIR, "static"),
+    template_folder=os.path.join(_PKG_DIR, "templates_html"),
     url_prefix="/public",
 )
 
 # ── Rate-limit state (simple IP-based, in-memory) ────────────────────
-_rate_limit_window: dict[str, list[float]] = {}  # IP -> list of timestamps
+
+
+class _RateEntry:
+    """Per-IP rate-limit bookkeeping."""
+
+    __slots__ = ("times",)
+
+    def __init__(self) -> None:
+        self.times: deque[float] = deque()  # request timestamps, oldest first
+
+
+_rate_limit_window: dict[str, _RateEntry] = {}  # IP -> entry
 RATE_LIMIT_MAX = int(os.environ.get("SCIAGENT_RATE_LIMIT_MAX", "10"))
 RATE_LIMIT_WINDOW_SECS = int(os.environ.get("SCIAGENT_RATE_LIMIT_WINDOW", "3600"))
+# How often idle IPs are swept out of ``_rate_limit_window``.
+_RATE_LIMIT_SWEEP_SECS = 300
+_next_sweep = 0.0
+
+# Closing section of every guided-mode kickoff prompt.
+_KICKOFF_GUIDED_NOTE = (
+    "This is a GUIDED public session. The user has already provided all "
+    "of the above information via the intake form. Do NOT re-ask for it. "
+    "Proceed directly with discovery and recommendations using "
+    "present_question for all user interactions."
+)
 
 
-def _check_rate_limit(ip: str) -> bool:
-    """Return True if the request should be allowed."""
-    import time
+def _sweep_rate_limit(cutoff: float) -> None:
+    """Drop IPs whose newest request has aged out of the window."""
+    stale = [
+        ip for ip, entry in _rate_limit_window.items()
+        if not entry.times or entry.times[-1] <= cutoff
+    ]
+    for ip in stale:
+        del _rate_limit_window[ip]
 
-    now = time.time()
-    window = _rate_limit_window.setdefault(ip, [])
-    # Prune old entries
-    cutoff = now - RATE_LIMIT_WINDOW_SECS
-    _rate_limit_window[ip] = [t for t in window if t > cutoff]
-    window = _rate_limit_window[ip]
-    if len(window) >= RATE_LIMIT_MAX:
+
+def _check_rate_limit(
+    ip: str,
+    _now=time.time,
+    _max: int = RATE_LIMIT_MAX,
+    _window_secs: int = RATE_LIMIT_WINDOW_SECS,
+) -> bool:
+    """Return True if the request should be allowed.
+
+    The clock and the env-driven limits are bound as default arguments
+    (fast locals); they are fixed at import like the constants themselves.
+    """
+    global _next_sweep  # noqa: PLW0603
+
+    now = _now()
+    cutoff = now - _window_secs
+    if now >= _next_sweep:
+        _sweep_rate_limit(cutoff)
+        _next_sweep = now + _RATE_LIMIT_SWEEP_SECS
+
+    entry = _rate_limit_window.get(ip)
+    if entry is None:
+        entry = _rate_limit_window[ip] = _RateEntry()
+    window = entry.times
+    # Prune expired entries from the (chronologically ordered) head
+    while window and window[0] <= cutoff:
+        window.popleft()
+    if len(window) >= _max:
         return False
     window.append(now)
     return True
 
 
+def _json(data, status: int = 200) -> Response:
+    """Serialise *data* into a compact JSON response."""
+    body = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return Response(body, status=status, mimetype="application/json")
+
+
 @public_bp.route("/")
 @require_auth
 async def public_index():
@@ -65,12 +120,14 @@ async def public_index():
 async def public_config():
     """Return available models and other frontend configuration."""
     try:
-        config = get_models_config()
-        logger.debug("Returning config with %d models", len(config.get("models", [])))
-        return jsonify(config)
+        logger.debug(
+            "Returning config with %d models",
+            len(get_models_config().get("models", [])),
+        )
+        return models_config_response(request.if_none_match)
     except Exception as e:
         logger.exception("Error in /api/config endpoint")
-        return jsonify({"error": str(e), "models": [], "default_model": "claude-opus-4.5"}), 500
+        return _json({"error": str(e), "models": [], "default_model": "claude-opus-4.5"}, 500)
 
 
 @public_bp.route("/api/start", methods=["POST"])
@@ -85,13 +142,17 @@ async def public_start():
     # Rate limiting
     ip = request.remote_addr or "unknown"
     if not _check_rate_limit(ip):
-        return jsonify({
+        return _json({
             "error": "Rate limit exceeded. Please try again later."
-        }), 429
+        }, 429)
 
-    data = await request.get_json(silent=True) or {}
+    # Nothing to parse for an explicitly empty body.
+    if request.content_length == 0:
+        data = {}
+    else:
+        data = await request.get_json(silent=True) or {}
 
-    session_id = str(uuid.uuid4())
+    session_id = secrets.token_urlsafe(16)
     domain_description = data.get("domain_description", "")
     research_goals = data.get("research_goals", [])
     data_types = data.get("data_types", [])
@@ -100,53 +161,30 @@ async def public_start():
     file_types = data.get("file_types", [])
     known_packages = data.get("known_packages", [])
 
-    # Build an enriched kickoff prompt with all form data
-    prompt_parts = []
-
-    if domain_description:
-        prompt_parts.append(
-            f"The researcher describes their domain as:\n\n"
-            f'"{domain_description}"'
-        )
-
-    if data_types:
-        prompt_parts.append(
-            f"They work with these types of data: {', '.join(data_types)}"
-        )
-
-    if analysis_goals:
-        goals_str = "\n".join(f"- {g}" for g in analysis_goals)
-        prompt_parts.append(f"Their analysis goals include:\n{goals_str}")
-
-    if research_goals:
-        rg_str = "\n".join(f"- {g}" for g in research_goals)
-        prompt_parts.append(f"Additional research goals:\n{rg_str}")
-
-    if experience_level:
-        prompt_parts.append(
-            f"Their Python experience level is: {experience_level}"
-        )
-
-    if file_types:
-        prompt_parts.append(
-            f"They work with these file formats: {', '.join(file_types)}"
-        )
-
-    if known_packages:
-        prompt_parts.append(
-            f"They already know about / use these packages: {', '.join(known_packages)}"
-        )
-
-    prompt_parts.append(
-        "This is a GUIDED public session. The user has already provided all "
-        "of the above information via the intake form. Do NOT re-ask for it. "
-        "Proceed directly with discovery and recommendations using "
-        "present_question for all user interactions."
+    # Build an enriched kickoff prompt with all form data; sections for
+    # missing fields are empty and dropped by the join.
+    sections = (
+        f'The researcher describes their domain as:\n\n"{domain_description}"'
+        if domain_description else "",
+        f"They work with these types of data: {', '.join(data_types)}"
+        if data_types else "",
+        "Their analysis goals include:\n"
+        + "\n".join([f"- {g}" for g in analysis_goals])
+        if analysis_goals else "",
+        "Additional research goals:\n"
+        + "\n".join([f"- {g}" for g in research_goals])
+        if research_goals else "",
+        f"Their Python experience level is: {experience_level}"
+        if experience_level else "",
+        f"They work with these file formats: {', '.join(file_types)}"
+        if file_types else "",
+        f"They already know about / use these packages: {', '.join(known_packages)}"
+        if known_packages else "",
+        _KICKOFF_GUIDED_NOTE,
     )
+    kickoff_prompt = "\n\n".join([part for part in sections if part])
 
-    kickoff_prompt = "\n\n".join(prompt_parts)
-
-    return jsonify({
+    return _json({
         "session_id": session_id,
         "kickoff_prompt": kickoff_prompt,
     })
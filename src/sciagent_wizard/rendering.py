@@ -16,11 +16,16 @@ completed manually.
 
 from __future__ import annotations
 
+import functools
 import importlib.resources
 import logging
+import os
 import re
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
 
 from sciagent_wizard.models import WizardState
 
@@ -87,18 +92,34 @@ def _get_templates_dir() -> Path:
 # Matches:  <!-- REPLACE: key — description -->
 #   group 1 = key
 #   group 2 = description (optional)
+# DOTALL stays: descriptions in the library templates wrap across lines
+# and may contain ">" (block-quotes, return-type arrows).  The lazy
+# description only ever runs inside a comment — _iter_placeholders
+# anchors each match at a "<!--" found with str.find.
 _REPLACE_RE = re.compile(
     r"<!--\s*REPLACE:\s*(\w+)\s*(?:—\s*(.*?))?\s*-->",
     re.DOTALL,
 )
 
-# Matches:  <!-- REPEAT: name --> ... <!-- END_REPEAT -->
-_REPEAT_RE = re.compile(
-    r"(<!--\s*REPEAT:\s*(\w+)\s*(?:—[^>]*)?\s*-->)"  # open
-    r"(.*?)"  # body
-    r"(<!--\s*END_REPEAT\s*-->)",  # close
-    re.DOTALL,
-)
+# Matches the markers around a REPEAT block:
+#   <!-- REPEAT: name --> ... <!-- END_REPEAT -->
+# The body between them is found by scanning forward to the next close
+# marker, never by a backtracking ``.*?``.
+#   group 1 = name
+_REPEAT_OPEN_RE = re.compile(r"<!--\s*REPEAT:\s*(\w+)\s*(?:—[^>]*)?\s*-->")
+_REPEAT_CLOSE_RE = re.compile(r"<!--\s*END_REPEAT\s*-->")
+
+# Slug tables: " "/"_" → "-" for Markdown anchors and package slugs, and
+# "-" → "_" for Python module names.  One C-level pass per string.
+_ANCHOR_TABLE = str.maketrans(" _", "--")
+_MODULE_TABLE = str.maketrans("-", "_")
+
+# A compiled template is a flat tuple of segments:
+#   ("lit", text)
+#   ("var", key, original_placeholder)
+#   ("repeat", name, body_segments, original_block_segments)
+_Segment = Tuple
+_Segments = Tuple[_Segment, ...]
 
 # ── Template names ──────────────────────────────────────────────────────
 
@@ -111,6 +132,9 @@ TEMPLATE_FILES = [
     "workflows.md",
 ]
 
+# Per-template renders and writes are independent and I/O bound.
+_MAX_WRITE_WORKERS = len(TEMPLATE_FILES)
+
 
 # ── Public API ──────────────────────────────────────────────────────────
 
@@ -136,12 +160,31 @@ def render_template(
     Returns:
         The rendered Markdown string.
     """
-    tdir = _get_templates_dir()
-    path = tdir / template_name
-    if not path.exists():
-        raise FileNotFoundError(f"Template not found: {path}")
-    text = path.read_text(encoding="utf-8")
-    return _render(text, context, repeat_context or {})
+    return _render_segments(
+        _compiled_template(template_name),
+        context,
+        {} if repeat_context is None else repeat_context,
+    )
+
+
+def render_template_to(
+    template_name: str,
+    context: Dict[str, str],
+    repeat_context: Optional[Dict[str, List[Dict[str, str]]]],
+    fh: TextIO,
+) -> None:
+    """Render a single template straight into the open text file *fh*.
+
+    Same arguments as :func:`render_template`, but each rendered segment
+    is written as it is produced instead of being assembled into one
+    string first.
+    """
+    _write_segments(
+        _compiled_template(template_name),
+        context,
+        {} if repeat_context is None else repeat_context,
+        fh.write,
+    )
 
 
 def render_docs(
@@ -161,17 +204,30 @@ def render_docs(
     output_dir.mkdir(parents=True, exist_ok=True)
     context = _build_context(state)
     repeat_ctx = _build_repeat_context(state)
-    written: List[Path] = []
 
-    for name in TEMPLATE_FILES:
+    def _render_one(name: str) -> Optional[Path]:
+        dest = output_dir / name
+        # Stream into a temp file and move it into place only once the
+        # render succeeds, so a failure never leaves a partial doc behind.
+        tmp = dest.with_name(dest.name + ".tmp")
         try:
-            rendered = render_template(name, context, repeat_ctx)
-            dest = output_dir / name
-            dest.write_text(rendered, encoding="utf-8")
-            written.append(dest)
+            _compiled_template(name)
+            with open(tmp, "w", encoding="utf-8") as fh:
+                render_template_to(name, context, repeat_ctx, fh)
+            os.replace(tmp, dest)
             logger.debug("Wrote template %s → %s", name, dest)
+            return dest
         except Exception as exc:
             logger.warning("Failed to render template %s: %s", name, exc)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return None
+
+    # Templates are independent; overlap their renders and writes.
+    with ThreadPoolExecutor(max_workers=_MAX_WRITE_WORKERS) as pool:
+        written = [p for p in pool.map(_render_one, TEMPLATE_FILES) if p is not None]
 
     logger.info(
         "Rendered %d/%d documentation templates to %s",
@@ -189,58 +245,211 @@ def copy_blank_templates(output_dir: Path) -> List[Path]:
     """
     output_dir.mkdir(parents=True, exist_ok=True)
     tdir = _get_templates_dir()
-    written: List[Path] = []
+    # (source name, destination name) — also copy the README
+    copies = [(name, name) for name in TEMPLATE_FILES]
+    copies.append(("README.md", "TEMPLATES_README.md"))
+
+    def _copy_one(pair: Tuple[str, str]) -> Optional[Path]:
+        src = tdir / pair[0]
+        if not src.exists():
+            return None
+        dest = output_dir / pair[1]
+        # Byte-for-byte copy; no decode/re-encode round trip.
+        shutil.copyfile(src, dest)
+        return dest
+
+    with ThreadPoolExecutor(max_workers=_MAX_WRITE_WORKERS) as pool:
+        return [p for p in pool.map(_copy_one, copies) if p is not None]
+
+
+def precompile_templates() -> Dict[str, _Segments]:
+    """Compile every documentation template into the segment cache now.
+
+    The templates ship with the installed ``sciagent`` package rather than
+    this one, so they cannot be compiled ahead of time at build time;
+    calling this once at server start moves the parse off the first
+    generation request instead.  Missing templates are skipped, and REPEAT
+    blocks with no context builder are logged.
+
+    Returns:
+        ``{template_name: segments}`` for every template found.
+    """
+    compiled: Dict[str, _Segments] = {}
     for name in TEMPLATE_FILES:
-        src = tdir / name
-        if src.exists():
-            dest = output_dir / name
-            dest.write_text(src.read_text(encoding="utf-8"), encoding="utf-8")
-            written.append(dest)
-    # Also copy the README
-    readme = tdir / "README.md"
-    if readme.exists():
-        dest = output_dir / "TEMPLATES_README.md"
-        dest.write_text(readme.read_text(encoding="utf-8"), encoding="utf-8")
-        written.append(dest)
-    return written
+        try:
+            segments = _compiled_template(name)
+        except FileNotFoundError:
+            continue
+        compiled[name] = segments
+        for seg in segments:
+            if seg[0] == "repeat" and seg[1] not in _REPEAT_BUILDERS:
+                logger.debug(
+                    "Template %s: REPEAT block %r has no context builder",
+                    name, seg[1],
+                )
+    logger.debug("Precompiled %d documentation templates", len(compiled))
+    return compiled
 
 
 # ── Internal helpers ────────────────────────────────────────────────────
 
 
-def _render(
-    text: str,
+@functools.lru_cache(maxsize=32)
+def _load_template(template_name: str) -> str:
+    """Return the raw text of *template_name*, read from disk only once.
+
+    Raises:
+        FileNotFoundError: If the template does not exist.
+    """
+    path = _get_templates_dir() / template_name
+    if not path.exists():
+        raise FileNotFoundError(f"Template not found: {path}")
+    return path.read_text(encoding="utf-8")
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled_template(template_name: str) -> _Segments:
+    """Load *template_name* once and return its compiled segments.
+
+    The regex work happens here, on first use; every later render of the
+    same template is a plain walk over the cached segments.
+    """
+    return _compile(_load_template(template_name))
+
+
+def _compile(text: str) -> _Segments:
+    """Split template *text* into literal, placeholder and REPEAT segments."""
+    segments: List[_Segment] = []
+    pos = 0
+    while (opening := _REPEAT_OPEN_RE.search(text, pos)) is not None:
+        closing = _REPEAT_CLOSE_RE.search(text, opening.end())
+        if closing is None:
+            break  # unterminated — no later block can close either
+        segments.extend(_compile_replacements(text[pos:opening.start()]))
+        segments.append((
+            "repeat",
+            opening.group(1),
+            _compile_replacements(text[opening.end():closing.start()]),
+            _compile_replacements(text[opening.start():closing.end()]),
+        ))
+        pos = closing.end()
+    segments.extend(_compile_replacements(text[pos:]))
+    return tuple(segments)
+
+
+def _iter_placeholders(text: str) -> Iterator[re.Match[str]]:
+    """Yield the ``<!-- REPLACE: … -->`` placeholders in *text*, in order.
+
+    ``str.find`` jumps from one comment opener to the next and
+    :data:`_REPLACE_RE` is only tried, anchored, at each of them — so
+    prose between comments is never fed to the regex engine, while the
+    placeholder grammar itself still has a single definition.
+    """
+    pos = 0
+    while (start := text.find("<!--", pos)) >= 0:
+        m = _REPLACE_RE.match(text, start)
+        if m is None:
+            pos = start + 4
+            continue
+        yield m
+        pos = m.end()
+
+
+def _sub_placeholders(
+    text: str, repl: Callable[[re.Match[str]], str],
+) -> str:
+    """Replace every placeholder in *text* with ``repl(match)``.
+
+    Equivalent to ``_REPLACE_RE.sub(repl, text)``, built on
+    :func:`_iter_placeholders` and a list buffer.
+    """
+    out: List[str] = []
+    pos = 0
+    for m in _iter_placeholders(text):
+        out.append(text[pos:m.start()])
+        out.append(repl(m))
+        pos = m.end()
+    if not out:
+        return text
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _compile_replacements(text: str) -> _Segments:
+    """Split *text* on ``<!-- REPLACE: … -->`` placeholders."""
+    segments: List[_Segment] = []
+    pos = 0
+    for m in _iter_placeholders(text):
+        if m.start() > pos:
+            segments.append(("lit", text[pos:m.start()]))
+        segments.append(("var", m.group(1), m.group(0)))
+        pos = m.end()
+    if pos < len(text):
+        segments.append(("lit", text[pos:]))
+    return tuple(segments)
+
+
+def _render_segments(
+    segments: _Segments,
     context: Dict[str, str],
     repeat_context: Dict[str, List[Dict[str, str]]],
+    row_context: Optional[Dict[str, str]] = None,
 ) -> str:
-    """Apply REPEAT expansion first, then REPLACE substitution."""
+    """Render compiled *segments* to a string (see :func:`_write_segments`)."""
+    out: List[str] = []
+    _write_segments(segments, context, repeat_context, out.append, row_context)
+    return "".join(out)
 
-    # 1. Expand REPEAT blocks
-    def _expand_repeat(m: re.Match) -> str:
-        name = m.group(2)
-        body = m.group(3)
 
-        rows = repeat_context.get(name)
-        if not rows:
-            # No data — leave the block intact as a template example
-            return m.group(0)
-
-        parts: List[str] = []
-        for row_ctx in rows:
-            rendered_body = body
-            for key, value in row_ctx.items():
-                rendered_body = _replace_key(rendered_body, key, value)
-            parts.append(rendered_body)
-
-        return "\n".join(parts)
+def _write_segments(
+    segments: _Segments,
+    context: Dict[str, str],
+    repeat_context: Dict[str, List[Dict[str, str]]],
+    write: Callable[[str], object],
+    row_context: Optional[Dict[str, str]] = None,
+) -> None:
+    """Render compiled *segments*, passing each piece to *write*.
+
+    REPEAT rows are filled from their *row_context* first, falling back to
+    the top-level *context*; placeholders found in neither are left intact.
+    Rows are looked up in place rather than merged into a fresh dict.
+    """
+    for seg in segments:
+        kind = seg[0]
+        if kind == "lit":
+            write(seg[1])
+        elif kind == "var":
+            key = seg[1]
+            if row_context is not None and key in row_context:
+                write(row_context[key])
+            else:
+                write(context.get(key, seg[2]))
+        else:
+            rows = repeat_context.get(seg[1])
+            if not rows:
+                # No data — leave the block intact as a template example
+                _write_segments(seg[3], context, {}, write)
+                continue
+            body = seg[2]
+            for i, row_ctx in enumerate(rows):
+                if i:
+                    write("\n")
+                _write_segments(body, context, {}, write, row_ctx)
 
-    text = _REPEAT_RE.sub(_expand_repeat, text)
 
-    # 2. Apply top-level REPLACE substitutions
-    for key, value in context.items():
-        text = _replace_key(text, key, value)
+@functools.lru_cache(maxsize=None)
+def _key_pattern(key: str) -> re.Pattern[str]:
+    """Compiled matcher for ``<!-- REPLACE: key ... -->`` placeholders.
 
-    return text
+    Group 1 is the whole placeholder, group 2 the description (if any).
+    Compiled once per key and reused by every per-key helper below.
+    """
+    return re.compile(
+        r"(<!--\s*REPLACE:\s*"
+        + re.escape(key)
+        + r"\s*(?:—\s*(.*?))?\s*-->)",
+        re.DOTALL,
+    )
 
 
 def _replace_key(text: str, key: str, value: str) -> str:
@@ -248,15 +457,10 @@ def _replace_key(text: str, key: str, value: str) -> str:
 
     The description after the key may span multiple lines and may contain
     ``>`` characters (e.g. Markdown block-quotes, return-type arrows),
-    so we match non-greedily up to the closing ``-->``.
+    so we match non-greedily up to the closing ``-->``.  *value* is
+    inserted literally (backslashes are not treated as group references).
     """
-    pattern = re.compile(
-        r"<!--\s*REPLACE:\s*"
-        + re.escape(key)
-        + r"\s*(?:—.*?)?\s*-->",
-        re.DOTALL,
-    )
-    return pattern.sub(value, text)
+    return _key_pattern(key).sub(lambda _m: value, text)
 
 
 # ── Humanize unfilled placeholders ──────────────────────────────────────
@@ -308,7 +512,20 @@ def _key_to_heading(key: str) -> str:
 
 def _key_to_anchor(key: str) -> str:
     """Convert a placeholder key to a Markdown anchor fragment."""
-    return key.replace("_", "-").lower()
+    return key.lower().translate(_ANCHOR_TABLE)
+
+
+def _link_marker(description: Optional[str], key: str, domain_doc_relpath: str) -> str:
+    """Humanized marker plus a link to *key*'s section in the domain doc."""
+    heading = _key_to_heading(key)
+    desc = (description or heading).strip()
+    example_idx = desc.find("Example:")
+    if example_idx > 0:
+        desc = desc[:example_idx].rstrip().rstrip(".")
+    desc = " ".join(desc.split())
+    marker = f"<!replace --- {desc} --- or add a link--->"
+    link = f"\nSee [{heading}]({domain_doc_relpath}#{_key_to_anchor(key)})\n"
+    return marker + "\n" + link
 
 
 def _replace_key_with_link(
@@ -321,27 +538,35 @@ def _replace_key_with_link(
     The marker is kept so users can see what the placeholder is for.
     A Markdown link to the domain doc section is inserted below it.
     """
-    anchor = _key_to_anchor(key)
-    heading = _key_to_heading(key)
-
-    pattern = re.compile(
-        r"(<!--\s*REPLACE:\s*"
-        + re.escape(key)
-        + r"\s*(?:—\s*(.*?))?\s*-->)",
-        re.DOTALL,
+    return _key_pattern(key).sub(
+        lambda m: _link_marker(m.group(2), key, domain_doc_relpath), text,
     )
 
+
+def _link_filled_placeholders(
+    text: str,
+    context: Dict[str, str],
+    domain_doc_relpath: str,
+) -> Tuple[str, List[str]]:
+    """Swap every placeholder whose key is in *context* for a marker + link.
+
+    Done in one :func:`_sub_placeholders` sweep rather than a search and
+    a substitution per context key.
+
+    Returns:
+        The linked text and the filled keys, in *context* order.
+    """
+    found: set = set()
+
     def _repl(m: re.Match[str]) -> str:
-        desc = (m.group(2) or heading).strip()
-        example_idx = desc.find("Example:")
-        if example_idx > 0:
-            desc = desc[:example_idx].rstrip().rstrip(".")
-        desc = " ".join(desc.split())
-        marker = f"<!replace --- {desc} --- or add a link--->"
-        link = f"\nSee [{heading}]({domain_doc_relpath}#{anchor})\n"
-        return marker + "\n" + link
+        key = m.group(1)
+        if key not in context:
+            return m.group(0)
+        found.add(key)
+        return _link_marker(m.group(2), key, domain_doc_relpath)
 
-    return pattern.sub(_repl, text)
+    text = _sub_placeholders(text, _repl)
+    return text, [k for k in context if k in found]
 
 
 def render_docs_with_domain_links(
@@ -373,43 +598,29 @@ def render_docs_with_domain_links(
     except ValueError:
         rel_domain = Path("domain")
 
-    tdir = _get_templates_dir()
     for name in TEMPLATE_FILES:
         try:
-            path = tdir / name
-            if not path.exists():
+            try:
+                segments = _compiled_template(name)
+            except FileNotFoundError:
                 continue
-            text = path.read_text(encoding="utf-8")
-
-            # 1. Expand REPEAT blocks (same as normal rendering)
-            def _expand_repeat(m: re.Match, rc=repeat_ctx) -> str:
-                rname = m.group(2)
-                body = m.group(3)
-                rows = rc.get(rname)
-                if not rows:
-                    return m.group(0)
-                parts: List[str] = []
-                for row_ctx in rows:
-                    rendered_body = body
-                    for k, v in row_ctx.items():
-                        rendered_body = _replace_key(rendered_body, k, v)
-                    parts.append(rendered_body)
-                return "\n".join(parts)
-
-            text = _REPEAT_RE.sub(_expand_repeat, text)
+
+            # 1. Expand REPEAT blocks from the cached compiled template;
+            #    top-level placeholders stay intact for the link pass below.
+            text = _render_segments(segments, {}, repeat_ctx)
 
             # 2. Collect filled values into domain doc content
             domain_doc_name = _DOMAIN_DOC_MAP.get(name, name)
             domain_sections: List[str] = []
             domain_relpath = str(rel_domain / domain_doc_name)
 
-            filled_keys = [k for k in context if _has_placeholder(text, k)]
+            text, filled_keys = _link_filled_placeholders(
+                text, context, domain_relpath,
+            )
 
             for key in filled_keys:
-                value = context[key]
                 heading = _key_to_heading(key)
-                domain_sections.append(f"## {heading}\n\n{value}\n")
-                text = _replace_key_with_link(text, key, domain_relpath)
+                domain_sections.append(f"## {heading}\n\n{context[key]}\n")
 
             # 3. Humanize any remaining unfilled placeholders
             text = _humanize_unfilled_placeholders(text)
@@ -447,11 +658,7 @@ def render_docs_with_domain_links(
 
 def _has_placeholder(text: str, key: str) -> bool:
     """Check if *text* contains a ``<!-- REPLACE: key … -->`` placeholder."""
-    pattern = re.compile(
-        r"<!--\s*REPLACE:\s*" + re.escape(key) + r"\s*(?:—.*?)?\s*-->",
-        re.DOTALL,
-    )
-    return bool(pattern.search(text))
+    return _key_pattern(key).search(text) is not None
 
 
 # ── Context builders ────────────────────────────────────────────────────
@@ -479,34 +686,29 @@ def _build_context(state: WizardState) -> Dict[str, str]:
         rows = [
             "| Parameter | Default Range | Context |",
             "|-----------|---------------|---------|"]
-        for param, (lo, hi) in state.bounds.items():
-            rows.append(
-                f"| {param} | {lo} – {hi} | Expected range |"
-            )
+        rows.extend(
+            f"| {param} | {lo} – {hi} | Expected range |"
+            for param, (lo, hi) in state.bounds.items()
+        )
         ctx["analysis_parameters"] = "\n".join(rows)
 
         precision_rows = [
             "| Measurement | Precision | Units |",
             "|-------------|-----------|-------|",
         ]
-        for param in state.bounds:
-            precision_rows.append(f"| {param} | appropriate | domain units |")
+        precision_rows.extend(
+            f"| {param} | appropriate | domain units |" for param in state.bounds
+        )
         ctx["reporting_precision_table"] = "\n".join(precision_rows)
 
     # ── tools.md ────────────────────────────────────────────────────
     if state.confirmed_packages:
         toc_lines = []
+        append = toc_lines.append
         for pkg in state.confirmed_packages:
-            anchor = (
-                pkg.name.lower()
-                .replace(" ", "-")
-                .replace("_", "-")
-                + "-tools"
-            )
-            desc = pkg.description[:60]
-            toc_lines.append(
-                f"- [{pkg.name} Tools](#{anchor}) — {desc}"
-            )
+            name = pkg.name
+            anchor = name.lower().translate(_ANCHOR_TABLE) + "-tools"
+            append(f"- [{name} Tools](#{anchor}) — {pkg.description[:60]}")
         ctx["tool_categories_toc"] = "\n".join(toc_lines)
 
     # ── library_api.md ──────────────────────────────────────────────
@@ -536,11 +738,11 @@ def _build_context(state: WizardState) -> Dict[str, str]:
             "| Workflow | Purpose | Key Steps |",
             "|----------|---------|-----------|",
         ]
-        for i, goal in enumerate(state.research_goals, 1):
-            overview_rows.append(
-                f"| Workflow {i} | {goal[:60]} "
-                f"| Load → Validate → Analyse → Report |"
-            )
+        overview_rows.extend(
+            f"| Workflow {i} | {goal[:60]} "
+            f"| Load → Validate → Analyse → Report |"
+            for i, goal in enumerate(state.research_goals, 1)
+        )
         ctx["workflow_overview_table"] = "\n".join(overview_rows)
 
     # ── skills.md ───────────────────────────────────────────────────
@@ -549,111 +751,145 @@ def _build_context(state: WizardState) -> Dict[str, str]:
             "| Skill | Location | Description |",
             "|-------|----------|-------------|",
         ]
-        for pkg in state.confirmed_packages:
-            skills_rows.append(
-                f"| {pkg.name} Analysis | tools/ | "
-                f"Analysis using {pkg.name} |"
-            )
+        skills_rows.extend(
+            f"| {name} Analysis | tools/ | Analysis using {name} |"
+            for name in map(attrgetter("name"), state.confirmed_packages)
+        )
         ctx["skills_overview_table"] = "\n".join(skills_rows)
 
     return ctx
 
 
+class _LazyRepeatContext(dict):
+    """Repeat-block contexts, each built on its first lookup.
+
+    Every REPEAT section is referenced by a single template, so building
+    all of them up front wastes work for templates that never ask.
+    """
+
+    def __init__(self, state: WizardState) -> None:
+        super().__init__()
+        self._state = state
+
+    def get(self, name, default=None):
+        if name not in self:
+            builder = _REPEAT_BUILDERS.get(name)
+            if builder is None:
+                return default
+            self[name] = builder(self._state)
+        return self[name] or default
+
+
 def _build_repeat_context(
     state: WizardState,
 ) -> Dict[str, List[Dict[str, str]]]:
-    """Build repeat-block contexts from wizard state."""
-    repeat: Dict[str, List[Dict[str, str]]] = {}
+    """Build repeat-block contexts from wizard state (lazily, per block)."""
+    return _LazyRepeatContext(state)
 
-    # ── tool_category (one per confirmed package) ───────────────────
-    if state.confirmed_packages:
-        categories: List[Dict[str, str]] = []
-        for pkg in state.confirmed_packages:
-            mod = pkg.pip_name.replace("-", "_")
-            cat_ctx: Dict[str, str] = {
-                "tool_category_name": f"{pkg.name} Tools",
-                "tool_name": f"run_{mod}",
-                "tool_short_description": (
-                    f"Execute analysis code using the {pkg.name} library."
-                ),
-                "tool_signature": (
-                    f"run_{mod}(code: str) -> str"
-                ),
-                "tool_parameters_table": (
-                    "| Name | Type | Default | Description |\n"
-                    "|------|------|---------|-------------|\n"
-                    f"| code | str | required | Python code using {pkg.name} |"
-                ),
-                "tool_returns": (
-                    "{\n"
-                    '    "output": str,      # stdout from code execution\n'
-                    '    "error": str,        # stderr (if any)\n'
-                    '    "figures": list      # paths to generated figures\n'
-                    "}"
-                ),
-            }
-            categories.append(cat_ctx)
-        repeat["tool_category"] = categories
-
-    # ── skill_section (one per confirmed package) ───────────────────
-    if state.confirmed_packages:
-        skills: List[Dict[str, str]] = []
-        for pkg in state.confirmed_packages:
-            skill_ctx: Dict[str, str] = {
-                "skill_name": f"{pkg.name} Analysis",
-                "skill_file_path": f"skills/{pkg.pip_name}/",
-                "skill_purpose": (
-                    f"Perform analysis using the {pkg.name} library. "
-                    f"{pkg.description[:100]}"
-                ),
-                "skill_capabilities": (
-                    f"- Load and process data using {pkg.name}\n"
-                    f"- Extract domain-specific features and measurements\n"
-                    f"- Generate visualisations of results"
-                ),
-                "skill_trigger_keywords": (
-                    f"{pkg.name.lower()}, analyse, analyze, extract, measure"
-                ),
-            }
-            skills.append(skill_ctx)
-        repeat["skill_section"] = skills
-
-    # ── workflow_section (one per research goal) ────────────────────
-    if state.research_goals:
-        workflows: List[Dict[str, str]] = []
-        for i, goal in enumerate(state.research_goals, 1):
-            wf_ctx: Dict[str, str] = {
-                "workflow_name": f"Workflow {i}: {goal[:50]}",
-                "workflow_purpose": goal,
-                "workflow_when_to_use": (
-                    f'- User asks about "{goal[:40]}"\n'
-                    f"- Data is appropriate for this type of analysis"
-                ),
-                "workflow_steps": (
-                    "```\n"
-                    "1. Load and inspect data\n"
-                    "2. Validate data quality\n"
-                    f"3. Run analysis for: {goal[:60]}\n"
-                    "4. Validate results against expected ranges\n"
-                    "5. Generate summary with visualisations\n"
-                    "6. Export results\n"
-                    "```"
-                ),
-                "workflow_parameters": (
-                    "| Parameter | Default | Description |\n"
-                    "|-----------|---------|-------------|\n"
-                    "| *configure per workflow* | | |"
-                ),
-                "workflow_outputs": (
-                    "- Summary table of results\n"
-                    "- Visualisation figures\n"
-                    "- Exported data files"
-                ),
-            }
-            workflows.append(wf_ctx)
-        repeat["workflow_section"] = workflows
-
-    return repeat
+
+# Row fields that are the same for every package / goal.
+_TOOL_RETURNS = (
+    "{\n"
+    '    "output": str,      # stdout from code execution\n'
+    '    "error": str,        # stderr (if any)\n'
+    '    "figures": list      # paths to generated figures\n'
+    "}"
+)
+_WORKFLOW_PARAMETERS = (
+    "| Parameter | Default | Description |\n"
+    "|-----------|---------|-------------|\n"
+    "| *configure per workflow* | | |"
+)
+_WORKFLOW_OUTPUTS = (
+    "- Summary table of results\n"
+    "- Visualisation figures\n"
+    "- Exported data files"
+)
+
+
+def _tool_category_rows(state: WizardState) -> List[Dict[str, str]]:
+    """``tool_category`` rows — one per confirmed package."""
+    categories: List[Dict[str, str]] = []
+    append = categories.append
+    for pkg in state.confirmed_packages:
+        name = pkg.name
+        tool = f"run_{pkg.pip_name.translate(_MODULE_TABLE)}"
+        append({
+            "tool_category_name": f"{name} Tools",
+            "tool_name": tool,
+            "tool_short_description": (
+                f"Execute analysis code using the {name} library."
+            ),
+            "tool_signature": f"{tool}(code: str) -> str",
+            "tool_parameters_table": (
+                "| Name | Type | Default | Description |\n"
+                "|------|------|---------|-------------|\n"
+                f"| code | str | required | Python code using {name} |"
+            ),
+            "tool_returns": _TOOL_RETURNS,
+        })
+    return categories
+
+
+def _skill_section_rows(state: WizardState) -> List[Dict[str, str]]:
+    """``skill_section`` rows — one per confirmed package."""
+    skills: List[Dict[str, str]] = []
+    append = skills.append
+    for pkg in state.confirmed_packages:
+        name = pkg.name
+        append({
+            "skill_name": f"{name} Analysis",
+            "skill_file_path": f"skills/{pkg.pip_name}/",
+            "skill_purpose": (
+                f"Perform analysis using the {name} library. "
+                f"{pkg.description[:100]}"
+            ),
+            "skill_capabilities": (
+                f"- Load and process data using {name}\n"
+                "- Extract domain-specific features and measurements\n"
+                "- Generate visualisations of results"
+            ),
+            "skill_trigger_keywords": (
+                f"{name.lower()}, analyse, analyze, extract, measure"
+            ),
+        })
+    return skills
+
+
+def _workflow_section_rows(state: WizardState) -> List[Dict[str, str]]:
+    """``workflow_section`` rows — one per research goal."""
+    workflows: List[Dict[str, str]] = []
+    append = workflows.append
+    for i, goal in enumerate(state.research_goals, 1):
+        goal_short = goal[:60]
+        append({
+            "workflow_name": f"Workflow {i}: {goal_short[:50]}",
+            "workflow_purpose": goal,
+            "workflow_when_to_use": (
+                f'- User asks about "{goal_short[:40]}"\n'
+                "- Data is appropriate for this type of analysis"
+            ),
+            "workflow_steps": (
+                "```\n"
+                "1. Load and inspect data\n"
+                "2. Validate data quality\n"
+                f"3. Run analysis for: {goal_short}\n"
+                "4. Validate results against expected ranges\n"
+                "5. Generate summary with visualisations\n"
+                "6. Export results\n"
+                "```"
+            ),
+            "workflow_parameters": _WORKFLOW_PARAMETERS,
+            "workflow_outputs": _WORKFLOW_OUTPUTS,
+        })
+    return workflows
+
+
+_REPEAT_BUILDERS = {
+    "tool_category": _tool_category_rows,
+    "skill_section": _skill_section_rows,
+    "workflow_section": _workflow_section_rows,
+}
 
 
 def _build_agent_overview_table(state: WizardState) -> str:
@@ -0,0 +1,192 @@
+"""
+On-disk cache for documentation fetches.
+
+Entries live under ``~/.cache/sciagent_wizard/<namespace>/`` (or
+``$SCIAGENT_CACHE_DIR/<namespace>/``), one JSON file per URL named by
+the SHA-256 of the URL.  Each entry stores the *extracted* value — not
+the raw response — plus the ``ETag`` / ``Last-Modified`` validators, so
+a stale entry is revalidated with a conditional request and a ``304``
+reuses the stored value.
+
+The first lookup in a namespace per process sweeps its directory:
+entries not rewritten for ``_MAX_KEEP_SECS`` are deleted, and only the
+newest ``_MAX_ENTRIES`` are kept.  File I/O runs in worker threads
+(``asyncio.to_thread``) so it never blocks the event loop.
+
+Cache failures are never fatal: an unreadable or unwritable cache just
+means the request goes to the network.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Mapping, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAX_AGE_SECS = 24 * 60 * 60  # serve without revalidating for a day
+_MAX_KEEP_SECS = 30 * 24 * 60 * 60  # delete entries untouched for a month
+_MAX_ENTRIES = 2_000  # per namespace
+
+_swept: Set[str] = set()  # namespaces swept by this process
+
+
+def _cache_dir(namespace: str) -> Path:
+    root = os.environ.get("SCIAGENT_CACHE_DIR")
+    base = Path(root) if root else Path.home() / ".cache" / "sciagent_wizard"
+    return base / namespace
+
+
+def _entry_path(namespace: str, url: str) -> Path:
+    digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    return _cache_dir(namespace) / f"{digest}.json"
+
+
+def _read_entry(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception as exc:
+        logger.debug("Ignoring unreadable cache entry %s: %s", path, exc)
+        return None
+
+
+def _write_entry(path: Path, entry: Dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Per-thread temp name: writes now run concurrently in workers
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(entry, fh)
+        os.replace(tmp, path)
+    except Exception as exc:
+        logger.debug("Could not write cache entry %s: %s", path, exc)
+
+
+def _sweep(directory: Path) -> None:
+    """Delete stale entries in *directory* and trim it to ``_MAX_ENTRIES``.
+
+    Entry age is the file's mtime, i.e. when it was last stored or
+    revalidated.
+    """
+    entries = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+    except FileNotFoundError:
+        return
+    except OSError as exc:
+        logger.debug("Could not sweep cache directory %s: %s", directory, exc)
+        return
+
+    cutoff = time.time() - _MAX_KEEP_SECS
+    entries.sort(reverse=True)
+    for i, (mtime, path) in enumerate(entries):
+        if i >= _MAX_ENTRIES or mtime < cutoff:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+async def cached_get(
+    client: Any,
+    namespace: str,
+    url: str,
+    extract: Callable[[bytes], Optional[str]],
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: Optional[int] = None,
+    follow_redirects: bool = False,
+) -> Optional[str]:
+    """GET *url* through the disk cache and return ``extract(body)``.
+
+    *extract* receives the body of a ``200`` response and returns the
+    value to keep (or ``None``).  With *max_bytes* the body is streamed
+    and only its first *max_bytes* bytes are read; *follow_redirects*
+    is passed on to the request.  Non-200 responses
+    other than ``304`` return ``None`` and are not cached.
+    """
+    if namespace not in _swept:
+        _swept.add(namespace)
+        await asyncio.to_thread(_sweep, _cache_dir(namespace))
+
+    path = _entry_path(namespace, url)
+    entry = await asyncio.to_thread(_read_entry, path)
+    now = time.time()
+
+    if entry is not None and now - entry.get("stored_at", 0) < _MAX_AGE_SECS:
+        return entry.get("value")
+
+    req_headers = dict(headers or {})
+    if entry is not None:
+        if entry.get("etag"):
+            req_headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            req_headers["If-Modified-Since"] = entry["last_modified"]
+
+    status, resp_headers, body = await get_body(
+        client, url, req_headers, max_bytes, follow_redirects,
+    )
+
+    if status == 304 and entry is not None:
+        entry["stored_at"] = now
+        await asyncio.to_thread(_write_entry, path, entry)
+        return entry.get("value")
+    if status != 200:
+        return None
+
+    value = extract(body)
+    await asyncio.to_thread(_write_entry, path, {
+        "url": url,
+        "etag": resp_headers.get("ETag"),
+        "last_modified": resp_headers.get("Last-Modified"),
+        "stored_at": now,
+        "value": value,
+    })
+    return value
+
+
+async def get_body(
+    client: Any,
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: Optional[int] = None,
+    follow_redirects: bool = False,
+) -> Tuple[int, Mapping[str, str], bytes]:
+    """GET *url* and return ``(status, headers, body)``.
+
+    With *max_bytes* the response is streamed and reading stops once
+    that many bytes have arrived; the rest is never downloaded or
+    decoded.  The body is empty for non-200 responses.
+    """
+    if max_bytes is None:
+        resp = await client.get(
+            url, headers=headers, follow_redirects=follow_redirects,
+        )
+        body = resp.content if resp.status_code == 200 else b""
+        return resp.status_code, resp.headers, body
+
+    async with client.stream(
+        "GET", url, headers=headers, follow_redirects=follow_redirects,
+    ) as resp:
+        if resp.status_code != 200:
+            return resp.status_code, resp.headers, b""
+        buf = bytearray()
+        async for chunk in resp.aiter_bytes():
+            buf += chunk
+            if len(buf) >= max_bytes:
+                break
+        return resp.status_code, resp.headers, bytes(buf[:max_bytes])
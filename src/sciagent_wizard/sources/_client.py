@@ -0,0 +1,74 @@
+"""
+Shared ``httpx.AsyncClient`` for discovery and doc fetching.
+
+A client cannot be kept at module level: discovery runs on whichever
+event loop its caller provides (``tools._run_async``'s background loop,
+the ingestor's, or a script's own ``asyncio.run``) and a pooled client
+cannot outlive or cross the loop it was created on.  Instead, the
+outermost :func:`shared_client` block opens one client and publishes
+it through a context variable; every nested block — including tasks
+started with ``asyncio.gather`` inside it — reuses that client, its
+connection pool and its TLS sessions.
+
+A caller that owns a long-lived loop can go further: create a client
+with :func:`new_client`, keep it for the loop's lifetime and publish it
+with :func:`bind_client`, so pools survive from one call to the next.
+
+HTTP/2 is enabled when the optional ``h2`` package is installed.
+"""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Iterator, Optional
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (only needed by httpx for http2=True)
+except ImportError:
+    _HTTP2 = False
+else:
+    _HTTP2 = True
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+_current: ContextVar[Optional[httpx.AsyncClient]] = ContextVar(
+    "sciagent_wizard_http_client", default=None,
+)
+
+
+@asynccontextmanager
+async def shared_client(timeout: float = 20.0) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the enclosing block's client, or open one for this block.
+
+    *timeout* only applies when this block opens the client.
+    """
+    client = _current.get()
+    if client is not None:
+        yield client
+        return
+
+    async with new_client(timeout) as client:
+        with bind_client(client):
+            yield client
+
+
+def new_client(timeout: float = 20.0) -> httpx.AsyncClient:
+    """Return a new client with the shared pool limits; the caller closes it."""
+    return httpx.AsyncClient(timeout=timeout, limits=_LIMITS, http2=_HTTP2)
+
+
+@contextmanager
+def bind_client(client: httpx.AsyncClient) -> Iterator[httpx.AsyncClient]:
+    """Make *client* the one :func:`shared_client` yields inside this block.
+
+    The client must belong to the running event loop and stays open
+    when the block exits.
+    """
+    token = _current.set(client)
+    try:
+        yield client
+    finally:
+        _current.reset(token)
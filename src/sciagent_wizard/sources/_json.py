@@ -0,0 +1,31 @@
+"""
+JSON decoding for discovery API responses.
+
+Uses ``orjson`` when it is installed — it decodes the larger registry
+payloads (bio.tools pages, PyPI metadata) several times faster than the
+stdlib — and falls back to ``httpx``'s own ``Response.json()`` otherwise.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def response_json(resp: Any) -> Any:
+    """Decode the JSON body of an ``httpx`` response."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode a JSON document already read into memory."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
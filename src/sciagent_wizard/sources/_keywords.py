@@ -0,0 +1,43 @@
+"""
+Keyword matching for discovery relevance scoring.
+
+Sources score a result by which search keywords occur (as substrings)
+in its lowercased title / description.  :func:`keyword_matcher` is built
+once per search and finds all of them in a single pass over the text
+with an Aho–Corasick automaton when ``pyahocorasick`` is installed;
+otherwise it falls back to one ``in`` test per keyword.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, FrozenSet, Iterable
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+def keyword_matcher(kw_lower: Iterable[str]) -> Callable[[str], FrozenSet[str]]:
+    """Return ``match(text) -> {keywords found in text}``.
+
+    *kw_lower* and the text passed to ``match`` must already be
+    lowercased.  An empty keyword matches every text, as with ``in``.
+    """
+    words = frozenset(kw_lower)
+    always = frozenset(w for w in words if not w)
+    words -= always
+
+    if ahocorasick is None or not words:
+        def match(text: str) -> FrozenSet[str]:
+            return always | {w for w in words if w in text}
+        return match
+
+    automaton = ahocorasick.Automaton()
+    for word in words:
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+
+    def match(text: str) -> FrozenSet[str]:
+        return always | {word for _, word in automaton.iter(text)}
+    return match
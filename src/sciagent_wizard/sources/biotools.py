@@ -8,15 +8,23 @@ https://bio.tools/api/tool/
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import List
+import math
+from typing import Callable, FrozenSet, List
 
 from sciagent_wizard.models import DiscoverySource, PackageCandidate
+from ._client import shared_client
+from ._json import response_json
+from ._keywords import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
 _API_BASE = "https://bio.tools/api/tool/"
 
+# Results per page returned by the bio.tools API.
+_PAGE_SIZE = 10
+
 
 async def search_biotools(
     keywords: List[str],
@@ -32,34 +40,52 @@ async def search_biotools(
     Returns:
         List of ``PackageCandidate`` from bio.tools.
     """
-    import httpx
-
     candidates: List[PackageCandidate] = []
     query = " ".join(keywords)
+    # Lowercased once here rather than per tool in ``_parse_tool``.
+    kw_lower = [kw.lower() for kw in keywords]
+    match_keywords = keyword_matcher(kw_lower)
+    n_pages = max(1, math.ceil(max_results / _PAGE_SIZE))
 
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
-            resp = await client.get(
-                _API_BASE,
-                params={
-                    "q": query,
-                    "format": "json",
-                    "page": "1",
-                    "sort": "score",
-                },
-                follow_redirects=True,
+        async with shared_client(timeout=20) as client:
+
+            async def _fetch_page(page: int) -> list:
+                resp = await client.get(
+                    _API_BASE,
+                    params={
+                        "q": query,
+                        "format": "json",
+                        "page": str(page),
+                        "sort": "score",
+                    },
+                    follow_redirects=True,
+                )
+                if resp.status_code != 200:
+                    # Pages past the last result also land here.
+                    logger.warning(
+                        "bio.tools page %d returned %d", page, resp.status_code,
+                    )
+                    return []
+                return response_json(resp).get("list", [])
+
+            # Pages are independent, so fetch them all at once.
+            pages = await asyncio.gather(
+                *[_fetch_page(p) for p in range(1, n_pages + 1)],
+                return_exceptions=True,
             )
-            if resp.status_code != 200:
-                logger.warning("bio.tools returned %d", resp.status_code)
-                return []
 
-            data = resp.json()
-            tools = data.get("list", [])
+        tools: list = []
+        for page, result in enumerate(pages, 1):
+            if isinstance(result, BaseException):
+                logger.warning("bio.tools page %d failed: %s", page, result)
+                continue
+            tools.extend(result)
 
-            for tool in tools[:max_results]:
-                cand = _parse_tool(tool, keywords)
-                if cand is not None:
-                    candidates.append(cand)
+        for tool in tools[:max_results]:
+            cand = _parse_tool(tool, kw_lower, match_keywords)
+            if cand is not None:
+                candidates.append(cand)
 
     except Exception as exc:
         logger.warning("bio.tools search failed: %s", exc)
@@ -67,8 +93,16 @@ async def search_biotools(
     return candidates
 
 
-def _parse_tool(tool: dict, keywords: List[str]) -> PackageCandidate | None:
-    """Convert a bio.tools API result into a ``PackageCandidate``."""
+def _parse_tool(
+    tool: dict,
+    kw_lower: List[str],
+    match_keywords: Callable[[str], FrozenSet[str]],
+) -> PackageCandidate | None:
+    """Convert a bio.tools API result into a ``PackageCandidate``.
+
+    *kw_lower* are the search keywords, already lowercased, and
+    *match_keywords* the search's :func:`keyword_matcher`.
+    """
     name = tool.get("name", "")
     if not name:
         return None
@@ -94,27 +128,33 @@ def _parse_tool(tool: dict, keywords: List[str]) -> PackageCandidate | None:
 
     # Try to find a download/repository link
     links = tool.get("link", []) or []
-    repo_url = ""
-    for link in links:
-        link_type = (link.get("type") or "").lower()
-        url = link.get("url", "")
-        if "repository" in link_type or "github" in link_type:
-            repo_url = url
-            break
+    repo_link = next(
+        (
+            link for link in links
+            if "repository" in (link_type := (link.get("type") or "").lower())
+            or "github" in link_type
+        ),
+        None,
+    )
+    repo_url = repo_link.get("url", "") if repo_link is not None else ""
 
     # Downloads / install info
     downloads = tool.get("download", []) or []
     install_cmd = ""
     python_package = ""
-    for dl in downloads:
-        dl_type = (dl.get("type") or "").lower()
-        dl_url = dl.get("url", "")
-        if "package" in dl_type and "pypi" in dl_url.lower():
-            # Extract package name from PyPI URL
-            parts = dl_url.rstrip("/").split("/")
-            python_package = parts[-1] if parts else ""
-            install_cmd = f"pip install {python_package}"
-            break
+    pypi_dl = next(
+        (
+            dl for dl in downloads
+            if "package" in (dl.get("type") or "").lower()
+            and "pypi" in dl.get("url", "").lower()
+        ),
+        None,
+    )
+    if pypi_dl is not None:
+        # Extract package name from PyPI URL
+        parts = pypi_dl.get("url", "").rstrip("/").split("/")
+        python_package = parts[-1] if parts else ""
+        install_cmd = f"pip install {python_package}"
 
     if not install_cmd and has_python:
         # Guess: package name is often the lowercase tool name
@@ -123,8 +163,9 @@ def _parse_tool(tool: dict, keywords: List[str]) -> PackageCandidate | None:
 
     # Relevance scoring
     search_text = f"{name} {description} {' '.join(topic_labels)}".lower()
-    hit_count = sum(1 for kw in keywords if kw.lower() in search_text)
-    relevance = min(hit_count / max(len(keywords), 1), 1.0)
+    matched = match_keywords(search_text)
+    hit_count = sum(1 for kw in kw_lower if kw in matched)
+    relevance = min(hit_count / max(len(kw_lower), 1), 1.0)
 
     # Boost for having publications (peer reviewed)
     if dois:
@@ -10,14 +10,25 @@ reference suitable for embedding in the generated agent's ``docs/`` dir.
 from __future__ import annotations
 
 import asyncio
+import codecs
+import json
 import logging
+import os
 import re
-from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from typing import Awaitable, Dict, List, Mapping, Optional, Set, Tuple
+from urllib.parse import SplitResult, urlsplit
 
 import httpx
 
+try:  # optional: libxml2-backed HTML parsing
+    import lxml.html as lxml_html
+except ImportError:
+    lxml_html = None
+
 from sciagent_wizard.models import PackageCandidate
+from ._cache import cached_get, get_body
+from ._client import shared_client
+from ._json import loads as json_loads
 
 logger = logging.getLogger(__name__)
 
@@ -25,8 +36,11 @@ logger = logging.getLogger(__name__)
 
 _PYPI_JSON = "https://pypi.org/pypi/{name}/json"
 _GITHUB_README = "https://api.github.com/repos/{owner}/{repo}/readme"
+_GITHUB_GRAPHQL = "https://api.github.com/graphql"
 _TIMEOUT = 30.0  # seconds
 _MAX_DOC_CHARS = 12_000  # truncate raw docs before summarisation
+_MAX_DOC_BYTES = _MAX_DOC_CHARS * 4  # UTF-8 worst case for _MAX_DOC_CHARS
+_CACHE_NAMESPACE = "doc_fetcher"  # PyPI / GitHub responses, see _cache.py
 
 
 # ── Public API ──────────────────────────────────────────────────────────
@@ -46,10 +60,19 @@ async def fetch_package_docs(
     4. Package homepage (generic scrape)
 
     The raw content is trimmed and formatted into a clean Markdown
-    reference document per package.
+    reference document per package.  When ``GITHUB_TOKEN`` is set, the
+    GitHub READMEs of all packages are fetched up front in a single
+    GraphQL request.
     """
-    async with httpx.AsyncClient(timeout=_TIMEOUT) as client:
-        tasks = [_fetch_one(client, pkg) for pkg in packages]
+    urls = [_analyze_urls(pkg) for pkg in packages]
+    async with shared_client(timeout=_TIMEOUT) as client:
+        readmes = await _prefetch_github_readmes(
+            client, [github for github, _, _ in urls if github],
+        )
+        tasks = [
+            _fetch_one(client, pkg, pkg_urls, readmes)
+            for pkg, pkg_urls in zip(packages, urls)
+        ]
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
     docs: Dict[str, str] = {}
@@ -71,38 +94,52 @@ async def fetch_package_docs(
 async def _fetch_one(
     client: httpx.AsyncClient,
     pkg: PackageCandidate,
+    urls: Tuple[Optional[Tuple[str, str]], str, Optional[str]],
+    readmes: Dict[Tuple[str, str], str],
 ) -> str:
-    """Try multiple sources for *pkg* and return the best doc found."""
-    # Try sources in priority order; first non-empty wins
-    github_owner_repo = _extract_github(pkg)
+    """Try multiple sources for *pkg* and return the best doc found.
 
-    raw_parts: List[Tuple[str, str]] = []  # (source_label, content)
+    *urls* is the package's :func:`_analyze_urls` result and *readmes*
+    any READMEs already fetched by :func:`_prefetch_github_readmes`.
+    The sources are independent URLs (usually on different hosts), so
+    they are all requested at once; duplicates are then dropped in
+    priority order.
+    """
+    github_owner_repo, rtd_url, homepage = urls
 
+    # (source_label, fetch) in priority order
+    sources: List[Tuple[str, Awaitable[Optional[str]]]] = []
     # 1 — GitHub README
-    if github_owner_repo:
+    if github_owner_repo in readmes:
+        sources.append(("GitHub README", _prefetched(readmes[github_owner_repo])))
+    elif github_owner_repo:
         owner, repo = github_owner_repo
-        content = await _fetch_github_readme(client, owner, repo)
-        if content:
-            raw_parts.append(("GitHub README", content))
-
+        sources.append(("GitHub README", _fetch_github_readme(client, owner, repo)))
     # 2 — PyPI description (often duplicates GH README but serves as fallback)
-    pypi_content = await _fetch_pypi_description(client, pkg.pip_name)
-    if pypi_content and not _is_duplicate(pypi_content, raw_parts):
-        raw_parts.append(("PyPI description", pypi_content))
-
+    sources.append(("PyPI description", _fetch_pypi_description(client, pkg.pip_name)))
     # 3 — ReadTheDocs
-    rtd_url = _readthedocs_url(pkg)
     if rtd_url:
-        rtd_content = await _fetch_webpage_text(client, rtd_url)
-        if rtd_content and not _is_duplicate(rtd_content, raw_parts):
-            raw_parts.append(("ReadTheDocs", rtd_content))
-
+        sources.append(("ReadTheDocs", _fetch_webpage_text(client, rtd_url)))
     # 4 — Homepage (if distinct from above)
-    homepage = _distinct_homepage(pkg, github_owner_repo, rtd_url)
     if homepage:
-        hp_content = await _fetch_webpage_text(client, homepage)
-        if hp_content and not _is_duplicate(hp_content, raw_parts):
-            raw_parts.append(("Homepage", hp_content))
+        sources.append(("Homepage", _fetch_webpage_text(client, homepage)))
+
+    results = await asyncio.gather(
+        *(fetch for _, fetch in sources), return_exceptions=True,
+    )
+
+    raw_parts: List[Tuple[str, str]] = []  # (source_label, content)
+    kept_shingles: List[Set[str]] = []  # parallel to raw_parts
+    for (label, _), content in zip(sources, results):
+        if isinstance(content, BaseException):
+            logger.debug("%s fetch for %s: %s", label, pkg.name, content)
+            continue
+        if not content:
+            continue
+        shingles = _shingles(content)
+        if not _is_duplicate(shingles, kept_shingles):
+            raw_parts.append((label, content))
+            kept_shingles.append(shingles)
 
     if not raw_parts:
         return _fallback_doc(pkg)
@@ -120,170 +157,291 @@ async def _fetch_pypi_description(
     client: httpx.AsyncClient,
     pip_name: str,
 ) -> Optional[str]:
-    """Fetch the long_description (rendered README) from PyPI JSON API."""
+    """Fetch the long_description (rendered README) from PyPI JSON API.
+
+    Goes through the on-disk cache; only the trimmed description is
+    stored, not the whole PyPI payload.
+    """
     url = _PYPI_JSON.format(name=pip_name)
     try:
-        resp = await client.get(url)
-        if resp.status_code != 200:
-            return None
-        data = resp.json()
-        desc = data.get("info", {}).get("description", "")
-        if len(desc) < 80:
-            return None
-        return desc[:_MAX_DOC_CHARS]
+        return await cached_get(client, _CACHE_NAMESPACE, url, _pypi_description)
     except Exception as exc:
         logger.debug("PyPI fetch for %s: %s", pip_name, exc)
         return None
 
 
+def _pypi_description(body: bytes) -> Optional[str]:
+    data = json_loads(body)
+    desc = data.get("info", {}).get("description", "")
+    if len(desc) < 80:
+        return None
+    return desc[:_MAX_DOC_CHARS]
+
+
 async def _fetch_github_readme(
     client: httpx.AsyncClient,
     owner: str,
     repo: str,
 ) -> Optional[str]:
-    """Fetch raw README from GitHub API."""
+    """Fetch raw README from GitHub API (through the on-disk cache).
+
+    Only the first :data:`_MAX_DOC_BYTES` of the body are downloaded
+    and decoded.
+    """
     url = _GITHUB_README.format(owner=owner, repo=repo)
     headers = {"Accept": "application/vnd.github.raw+json"}
     try:
-        resp = await client.get(url, headers=headers)
-        if resp.status_code != 200:
-            return None
-        text = resp.text
-        return text[:_MAX_DOC_CHARS] if text else None
+        return await cached_get(
+            client, _CACHE_NAMESPACE, url, _readme_text,
+            headers=headers, max_bytes=_MAX_DOC_BYTES,
+        )
     except Exception as exc:
         logger.debug("GitHub README for %s/%s: %s", owner, repo, exc)
         return None
 
 
+def _readme_text(body: bytes) -> Optional[str]:
+    # A cut multi-byte sequence at the end decodes to U+FFFD and is
+    # normally sliced off again by the character cap.
+    text = body.decode("utf-8", errors="replace")
+    return text[:_MAX_DOC_CHARS] if text else None
+
+
+async def _prefetch_github_readmes(
+    client: httpx.AsyncClient,
+    repos: List[Tuple[str, str]],
+) -> Dict[Tuple[str, str], str]:
+    """Fetch ``README.md`` for every repo in one GitHub GraphQL request.
+
+    GraphQL needs authentication, so this only runs when ``GITHUB_TOKEN``
+    is set; otherwise (or on any failure) it returns ``{}`` and each
+    package falls back to the REST README endpoint.  Repos without a
+    ``README.md`` at ``HEAD`` are left out, so they fall back too.
+    """
+    token = os.environ.get("GITHUB_TOKEN")
+    repos = list(dict.fromkeys(repos))
+    if not token or not repos:
+        return {}
+
+    fields = "\n".join(
+        f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(repo)}) "
+        '{ object(expression: "HEAD:README.md") { ... on Blob { text } } }'
+        for i, (owner, repo) in enumerate(repos)
+    )
+    try:
+        resp = await client.post(
+            _GITHUB_GRAPHQL,
+            json={"query": f"query {{\n{fields}\n}}"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        if resp.status_code != 200:
+            logger.debug("GitHub GraphQL README batch: HTTP %d", resp.status_code)
+            return {}
+        data = json_loads(resp.content).get("data") or {}
+    except Exception as exc:
+        logger.debug("GitHub GraphQL README batch: %s", exc)
+        return {}
+
+    readmes: Dict[Tuple[str, str], str] = {}
+    for i, owner_repo in enumerate(repos):
+        text = ((data.get(f"r{i}") or {}).get("object") or {}).get("text")
+        if text:
+            readmes[owner_repo] = text[:_MAX_DOC_CHARS]
+    return readmes
+
+
+async def _prefetched(text: str) -> str:
+    return text
+
+
 async def _fetch_webpage_text(
     client: httpx.AsyncClient,
     url: str,
 ) -> Optional[str]:
-    """Fetch a web page and extract its text content (basic HTML stripping)."""
+    """Fetch a web page and extract its text content (basic HTML stripping).
+
+    Only the first :data:`_MAX_DOC_BYTES` of the page are downloaded, so
+    the stripper works on a bounded input.  A tag left open by the cut
+    is dropped before stripping.
+    """
     try:
-        resp = await client.get(url)
-        if resp.status_code != 200:
+        status, headers, body = await get_body(
+            client, url, max_bytes=_MAX_DOC_BYTES,
+        )
+        if status != 200:
             return None
-        return _strip_html(resp.text)[:_MAX_DOC_CHARS]
+        html = body.decode(_charset(headers), errors="replace")
+        if len(body) >= _MAX_DOC_BYTES and html.rfind("<") > html.rfind(">"):
+            html = html[:html.rfind("<")]
+        return _strip_html(html)[:_MAX_DOC_CHARS]
     except Exception as exc:
         logger.debug("Webpage fetch %s: %s", url, exc)
         return None
 
 
-# ── URL helpers ─────────────────────────────────────────────────────────
+def _charset(headers: Mapping[str, str]) -> str:
+    """Text encoding named in a ``Content-Type`` header (default UTF-8)."""
+    m = _CHARSET_RE.search(headers.get("Content-Type", ""))
+    if m:
+        try:
+            return codecs.lookup(m.group(1)).name
+        except LookupError:
+            pass
+    return "utf-8"
 
 
-def _extract_github(pkg: PackageCandidate) -> Optional[Tuple[str, str]]:
-    """Extract (owner, repo) from any URL in the package metadata."""
-    for url in (pkg.repository_url, pkg.homepage):
-        if not url:
-            continue
-        m = re.match(
-            r"https?://github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$",
-            url,
-        )
-        if m:
-            return m.group(1), m.group(2)
-    return None
+# ── URL helpers ─────────────────────────────────────────────────────────
 
 
-def _readthedocs_url(pkg: PackageCandidate) -> Optional[str]:
-    """Return a ReadTheDocs URL if the homepage looks like one."""
-    for url in (pkg.homepage, pkg.repository_url):
-        if url and "readthedocs.io" in url:
-            return url
-    # Try the conventional URL
-    name = pkg.pip_name.replace("_", "-").lower()
-    return f"https://{name}.readthedocs.io/en/latest/"
+def _analyze_urls(
+    pkg: PackageCandidate,
+) -> Tuple[Optional[Tuple[str, str]], str, Optional[str]]:
+    """Work out every doc source URL for *pkg* in one pass.
 
+    Each metadata URL is split once and checked with plain string
+    operations.
 
-def _distinct_homepage(
-    pkg: PackageCandidate,
-    github: Optional[Tuple[str, str]],
-    rtd_url: Optional[str],
-) -> Optional[str]:
-    """Return the homepage URL only if it's distinct from GitHub / RTD."""
-    hp = pkg.homepage
-    if not hp:
+    Returns:
+        ``(github, rtd_url, homepage)`` — the GitHub ``(owner, repo)``
+        if any URL points at a repository, the ReadTheDocs URL (the
+        conventional one if none is listed), and the homepage if it is
+        distinct from GitHub / ReadTheDocs / PyPI.
+    """
+    repo_url, hp = pkg.repository_url, pkg.homepage
+    repo_split = urlsplit(repo_url) if repo_url else None
+    hp_split = urlsplit(hp) if hp else None
+
+    github = None
+    for split in (repo_split, hp_split):
+        if split is not None and (github := _github_owner_repo(split)):
+            break
+
+    rtd_url = next(
+        (url for url in (hp, repo_url) if url and "readthedocs.io" in url),
+        None,
+    )
+    if rtd_url is None:
+        # Try the conventional URL
+        name = pkg.pip_name.replace("_", "-").lower()
+        rtd_url = f"https://{name}.readthedocs.io/en/latest/"
+
+    homepage = None
+    if hp_split is not None:
+        host = hp_split.hostname or ""
+        if not ("github.com" in host or "readthedocs.io" in host or "pypi.org" in host):
+            homepage = hp
+
+    return github, rtd_url, homepage
+
+
+def _github_owner_repo(split: SplitResult) -> Optional[Tuple[str, str]]:
+    """``(owner, repo)`` for an ``http(s)://github.com/<owner>/<repo>`` URL."""
+    if split.scheme not in ("http", "https") or split.netloc != "github.com":
         return None
-    parsed = urlparse(hp)
-    host = parsed.hostname or ""
-    if "github.com" in host or "readthedocs.io" in host or "pypi.org" in host:
+    parts = split.path.strip("/").split("/")
+    if len(parts) != 2 or not parts[0]:
         return None
-    return hp
+    repo = parts[1].removesuffix(".git")
+    return (parts[0], repo) if repo else None
 
 
 # ── Text processing ────────────────────────────────────────────────────
 
+# Length of the character shingles compared by _is_duplicate, and how
+# much of each source they are taken from.  Badges and title lines fill
+# the first few hundred characters of most READMEs, so the window is
+# wide enough to reach the prose.
+_SHINGLE_LEN = 8
+_SHINGLE_WINDOW = 2_000
+
+_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
 _TAG_RE = re.compile(r"<[^>]+>")
 _WS_RE = re.compile(r"\n{3,}")
+# README badges: linked images [![...](...)](...) and standalone
+# build/CI/coverage/... images, removed in one pass.
+_BADGE_RE = re.compile(
+    r"\[!\[.*?\]\(.*?\)\]\(.*?\)"
+    r"|!\[(?:build|ci|coverage|license|pypi|version|badge).*?\]\(.*?\)",
+    re.IGNORECASE,
+)
 
 
 def _strip_html(html: str) -> str:
-    """Crude HTML → text conversion for webpage scraping."""
-    text = _TAG_RE.sub("", html)
+    """HTML → text conversion for webpage scraping.
+
+    Uses ``lxml`` when it is installed, which also drops ``<script>`` /
+    ``<style>`` bodies and decodes entities; otherwise (or if the page
+    cannot be parsed) falls back to crude tag stripping.
+    """
+    text = None
+    if lxml_html is not None:
+        try:
+            doc = lxml_html.fromstring(html)
+            for bad in doc.xpath("//script|//style|//noscript"):
+                bad.drop_tree()
+            text = doc.text_content()
+        except Exception as exc:
+            logger.debug("lxml could not parse page: %s", exc)
+    if text is None:
+        text = _TAG_RE.sub("", html)
     text = _WS_RE.sub("\n\n", text)
     return text.strip()
 
 
+def _shingles(text: str) -> Set[str]:
+    """Overlapping ``_SHINGLE_LEN``-char slices of the start of *text*."""
+    head = text[:_SHINGLE_WINDOW]
+    return {head[i:i + _SHINGLE_LEN] for i in range(len(head) - _SHINGLE_LEN + 1)}
+
+
 def _is_duplicate(
-    new_content: str,
-    existing: List[Tuple[str, str]],
+    new_shingles: Set[str],
+    existing: List[Set[str]],
     threshold: float = 0.6,
 ) -> bool:
-    """Rough duplication check — if >60 % of first 500 chars overlap."""
-    snippet = new_content[:500]
-    for _, existing_content in existing:
-        overlap = sum(
-            1 for c in snippet if c in existing_content[:500]
-        )
-        if overlap / max(len(snippet), 1) > threshold:
+    """Rough duplication check — if >60 % of the new shingles are kept.
+
+    Compares the :func:`_shingles` of a new source against those of
+    each source already kept, so shared text counts rather than shared
+    letters.
+    """
+    if not new_shingles:
+        return False
+    for existing_shingles in existing:
+        if len(new_shingles & existing_shingles) / len(new_shingles) > threshold:
             return True
     return False
 
 
 def _compose_doc(pkg: PackageCandidate, raw_content: str, source_label: str) -> str:
     """Format raw doc content into a clean reference document."""
-    install = pkg.install_command or f"pip install {pkg.pip_name}"
+    install = pkg.effective_install_command
     homepage = pkg.homepage or ""
     repo = pkg.repository_url or ""
 
-    header_lines = [
-        f"# {pkg.name}",
-        "",
-        f"> {pkg.description}" if pkg.description else "",
-        "",
-        "## Quick Reference",
-        "",
-        f"- **Install**: `{install}`",
+    parts = [
+        f"# {pkg.name}\n\n",
+        f"> {pkg.description}\n\n" if pkg.description else "\n\n",
+        f"## Quick Reference\n\n- **Install**: `{install}`\n",
     ]
     if homepage:
-        header_lines.append(f"- **Homepage**: {homepage}")
+        parts.append(f"- **Homepage**: {homepage}\n")
     if repo:
-        header_lines.append(f"- **Repository**: {repo}")
+        parts.append(f"- **Repository**: {repo}\n")
     if pkg.keywords:
-        header_lines.append(f"- **Keywords**: {', '.join(pkg.keywords[:10])}")
-
-    header_lines.extend([
-        "",
-        f"---",
-        "",
-        f"*Source: {source_label}*",
-        "",
-    ])
+        parts.append(f"- **Keywords**: {', '.join(pkg.keywords[:10])}\n")
+    parts.append(f"\n---\n\n*Source: {source_label}*\n")
 
     # Clean up the raw content: remove badges, build-status images, etc.
-    cleaned = _clean_readme(raw_content)
+    parts.append(_clean_readme(raw_content))
 
-    return "\n".join(header_lines) + cleaned
+    return "".join(parts)
 
 
 def _clean_readme(text: str) -> str:
     """Remove common README noise (badges, CI links, etc.)."""
-    # Remove badge images: [![...](...)(...)]
-    text = re.sub(r"\[!\[.*?\]\(.*?\)\]\(.*?\)", "", text)
-    # Remove standalone badge images: ![...](...)
-    text = re.sub(r"!\[(?:build|ci|coverage|license|pypi|version|badge).*?\]\(.*?\)", "", text, flags=re.IGNORECASE)
+    # Remove linked and standalone badge images
+    text = _BADGE_RE.sub("", text)
     # Collapse excessive blank lines
     text = _WS_RE.sub("\n\n", text)
     return text.strip()
@@ -291,33 +449,22 @@ def _clean_readme(text: str) -> str:
 
 def _fallback_doc(pkg: PackageCandidate) -> str:
     """Minimal doc when no online sources are reachable."""
-    install = pkg.install_command or f"pip install {pkg.pip_name}"
+    install = pkg.effective_install_command
     desc = pkg.description or "No description available."
     homepage = pkg.homepage or ""
 
-    lines = [
-        f"# {pkg.name}",
-        "",
-        f"> {desc}",
-        "",
-        "## Quick Reference",
-        "",
-        f"- **Install**: `{install}`",
+    parts = [
+        f"# {pkg.name}\n\n> {desc}\n\n"
+        f"## Quick Reference\n\n- **Install**: `{install}`\n",
     ]
     if homepage:
-        lines.append(f"- **Homepage**: {homepage}")
+        parts.append(f"- **Homepage**: {homepage}\n")
     if pkg.repository_url:
-        lines.append(f"- **Repository**: {pkg.repository_url}")
-
-    lines.extend([
-        "",
-        "## Usage",
-        "",
-        f"```python",
-        f"import {pkg.pip_name.replace('-', '_')}",
-        f"```",
-        "",
+        parts.append(f"- **Repository**: {pkg.repository_url}\n")
+    parts.append(
+        "\n## Usage\n\n"
+        f"```python\nimport {pkg.pip_name.replace('-', '_')}\n```\n\n"
         "*Documentation was not available at generation time. "
-        "Refer to the homepage or repository for full API reference.*",
-    ])
-    return "\n".join(lines)
+        "Refer to the homepage or repository for full API reference.*"
+    )
+    return "".join(parts)
@@ -2,10 +2,13 @@
 Google Custom Search Engine discovery — scrape a public Google
 Programmable Search Engine for scientific software results.
 
-No API key is required.  The module uses Playwright to launch a
-headless Chromium browser, navigates to the public CSE page, waits
-for results to render, and extracts them from the DOM — the same
-way a human user would see them in a browser.
+No API key is required.  Results are read from the JSON(P) endpoint
+the public CSE page itself loads them from (with the ``cse_tok`` token
+taken from the engine's bootstrap script), so plain HTTP requests are
+enough.  If that endpoint cannot be used or answers with an error — or
+``SCIAGENT_USE_PLAYWRIGHT`` is set — the module falls back to
+launching a headless Chromium browser with Playwright, navigating to
+the public CSE page and extracting results from the rendered DOM.
 
 The CSE engine ID defaults to the sciagent curated engine
 (``b40081397b0ad47ec``) but can be overridden via the
@@ -14,8 +17,8 @@ The CSE engine ID defaults to the sciagent curated engine
 Query Strategy
 --------------
 Instead of dumping all keywords into a single query, this module
-runs **2–3 focused search phrases** in sequence on the same browser
-session.  If the caller provides explicit ``queries`` (targeted
+runs **2–3 focused search phrases** in sequence on the same HTTP
+client (or browser session).  If the caller provides explicit ``queries`` (targeted
 phrases like ``"patch clamp analysis python package"``), those are
 used directly.  Otherwise, smart queries are auto-generated from
 the raw ``keywords`` list by combining domain terms with software-
@@ -23,18 +26,22 @@ oriented suffixes.
 
 Requirements
 ------------
+Only the browser fallback needs Playwright:
 ``pip install playwright && python -m playwright install chromium``
 """
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import re
 import urllib.parse
-from typing import Any, List, Optional
+from typing import Any, Callable, FrozenSet, List, Optional, Tuple
 
 from sciagent_wizard.models import DiscoverySource, PackageCandidate
+from ._json import loads as json_loads
+from ._keywords import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +49,12 @@ logger = logging.getLogger(__name__)
 
 _DEFAULT_CX = "b40081397b0ad47ec"
 _CSE_BASE = "https://cse.google.com/cse"
+# JSON(P) endpoint the CSE page loads its results from, and the
+# bootstrap script that hands the page its per-engine request token
+_CSE_JSON_URL = "https://cse.google.com/cse/element/v1"
+_CSE_BOOTSTRAP_URL = "https://cse.google.com/cse.js"
+_CSE_TOKEN_RE = re.compile(r'"cse_token"\s*:\s*"([^"]+)"')
+_CSE_LIBV_RE = re.compile(r'"cselibVersion"\s*:\s*"([^"]+)"')
 
 # Maximum number of separate queries to run per invocation
 _MAX_QUERIES = 3
@@ -62,6 +75,7 @@ _GITHUB_RE = re.compile(
     r"github\.com/([A-Za-z0-9_.-]+/[A-Za-z0-9_.-]+)",
     re.IGNORECASE,
 )
+_SPACES_RE = re.compile(r"\s+")
 
 
 # ── Query generation ───────────────────────────────────────────────────
@@ -70,6 +84,15 @@ _GITHUB_RE = re.compile(
 def _generate_queries(keywords: List[str]) -> List[str]:
     """Build 2–3 focused search phrases from a raw keyword list.
 
+    Memoized on the keyword tuple; see :func:`_generate_queries_cached`.
+    """
+    return list(_generate_queries_cached(tuple(keywords)))
+
+
+@functools.lru_cache(maxsize=64)
+def _generate_queries_cached(keywords: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Build 2–3 focused search phrases from a raw keyword list.
+
     Strategy:
         * Pick the most specific / important keywords (the first few
           are typically the domain and technique).
@@ -85,7 +108,7 @@ def _generate_queries(keywords: List[str]) -> List[str]:
         → "ion channel kinetics python library"
     """
     if not keywords:
-        return []
+        return ()
 
     queries: list[str] = []
 
@@ -104,7 +127,7 @@ def _generate_queries(keywords: List[str]) -> List[str]:
     if not queries:
         queries.append(f"{keywords[0]} {_SOFTWARE_SUFFIXES[0]}")
 
-    return queries[:_MAX_QUERIES]
+    return tuple(queries[:_MAX_QUERIES])
 
 
 # ── Public entry point ──────────────────────────────────────────────────
@@ -122,10 +145,10 @@ async def search_google_cse(
     --------
     1. Build 2–3 focused search phrases from *queries* (preferred)
        or auto-generate them from *keywords*.
-    2. Launch a single headless Chromium browser via Playwright.
-    3. For each phrase, navigate to the CSE page, wait for results,
-       and extract candidates.
-    4. Deduplicate across queries and return merged results.
+    2. For each phrase, fetch results from the CSE JSON endpoint
+       (or, as a fallback, render the CSE page in a single headless
+       Chromium browser via Playwright) and extract candidates.
+    3. Deduplicate across queries and return merged results.
 
     Args:
         keywords: Domain-related search terms (used for relevance
@@ -140,16 +163,6 @@ async def search_google_cse(
     Returns:
         List of ``PackageCandidate`` from Google CSE results.
     """
-    try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        logger.warning(
-            "Google CSE search skipped — install playwright: "
-            "pip install playwright && "
-            "python -m playwright install chromium"
-        )
-        return []
-
     # Determine which queries to run
     search_phrases = queries if queries else _generate_queries(keywords)
     if not search_phrases:
@@ -162,25 +175,208 @@ async def search_google_cse(
     )
 
     cx = os.environ.get("GOOGLE_CSE_CX", _DEFAULT_CX)
+    collector = _Collector(keywords, max_results)
+
+    if not os.environ.get("SCIAGENT_USE_PLAYWRIGHT"):
+        try:
+            await _search_json(cx, search_phrases, collector)
+            return collector.candidates[:max_results]
+        except _CseEndpointError as exc:
+            logger.info(
+                "Google CSE: JSON endpoint unavailable (%s); "
+                "falling back to the browser", exc,
+            )
+
+    await _search_browser(cx, search_phrases, collector)
+    return collector.candidates[:max_results]
+
+
+class _CseEndpointError(Exception):
+    """The CSE JSON endpoint could not be used at all."""
+
+
+class _Collector:
+    """Deduplicates raw results across queries and builds candidates."""
+
+    __slots__ = (
+        "keywords", "kw_lower", "max_results", "candidates", "seen_links",
+        "match_keywords",
+    )
 
-    candidates: List[PackageCandidate] = []
-    seen_links: set[str] = set()
+    def __init__(self, keywords: List[str], max_results: int) -> None:
+        self.keywords = keywords
+        self.kw_lower = tuple(kw.lower() for kw in keywords)
+        self.max_results = max_results
+        self.candidates: List[PackageCandidate] = []
+        self.seen_links: set[str] = set()
+        self.match_keywords = keyword_matcher(self.kw_lower)
+
+    @property
+    def full(self) -> bool:
+        return len(self.candidates) >= self.max_results
+
+    def add(self, raw: dict) -> None:
+        link = raw["url"]
+        if link in self.seen_links:
+            return
+        self.seen_links.add(link)
+
+        cand = _build_candidate(
+            raw, self.keywords, self.kw_lower, self.match_keywords,
+        )
+        if cand is not None:
+            self.candidates.append(cand)
+
+
+# ── JSON endpoint ───────────────────────────────────────────────────────
+
+
+async def _search_json(
+    cx: str, search_phrases: List[str], collector: _Collector,
+) -> None:
+    """Run each phrase against the CSE element JSON endpoint.
+
+    This is the request the CSE page itself makes to load its results,
+    including the ``cse_tok`` token it reads from the bootstrap script,
+    so no browser is needed.  Raises :class:`_CseEndpointError` if the
+    token cannot be obtained or the first query does not return a
+    proper result payload; a failure on a later query only skips that
+    query.
+    """
+    from ._client import shared_client
+
+    answered = False
+    async with shared_client() as client:
+        params = await _endpoint_params(client, cx)
+        for phrase in search_phrases:
+            if collector.full:
+                break
+            try:
+                resp = await client.get(
+                    _CSE_JSON_URL, params={**params, "q": phrase},
+                )
+                if resp.status_code != 200:
+                    raise _CseEndpointError(f"HTTP {resp.status_code}")
+                payload = _parse_jsonp(resp.text)
+                if "error" in payload:
+                    raise _CseEndpointError(
+                        f"endpoint error: {payload['error']}"
+                    )
+                if "results" not in payload and not answered:
+                    # An unusable reply looks just like "no results";
+                    # only trust an empty answer once the endpoint has
+                    # produced a proper one.
+                    raise _CseEndpointError("reply has no 'results'")
+                results = payload.get("results", [])
+            except Exception as exc:
+                if not answered:
+                    if isinstance(exc, _CseEndpointError):
+                        raise
+                    raise _CseEndpointError(str(exc)) from exc
+                logger.warning("Google CSE: query %r failed: %s", phrase, exc)
+                continue
+            answered = True
+
+            if not results:
+                logger.info("Google CSE: no results for query %r", phrase)
+            for item in results:
+                if collector.full:
+                    break
+                raw = _json_result(item)
+                if raw is not None:
+                    collector.add(raw)
+
+
+async def _endpoint_params(client: Any, cx: str) -> dict:
+    """Build the element endpoint's query parameters for engine *cx*.
+
+    Reads ``cse_token`` (and the library version) from the engine's
+    bootstrap script, as the CSE page does before its first query.
+    """
+    try:
+        resp = await client.get(_CSE_BOOTSTRAP_URL, params={"cx": cx})
+    except Exception as exc:
+        raise _CseEndpointError(f"bootstrap failed: {exc}") from exc
+    if resp.status_code != 200:
+        raise _CseEndpointError(f"bootstrap HTTP {resp.status_code}")
+
+    token = _CSE_TOKEN_RE.search(resp.text)
+    if token is None:
+        raise _CseEndpointError("no cse_token in bootstrap script")
+    params = {
+        "rsz": "filtered_cse",
+        "num": "10",
+        "hl": "en",
+        "source": "gcsc",
+        "cx": cx,
+        "cse_tok": token.group(1),
+        "callback": "_",
+    }
+    libv = _CSE_LIBV_RE.search(resp.text)
+    if libv is not None:
+        params["cselibv"] = libv.group(1)
+    return params
+
+
+def _parse_jsonp(text: str) -> dict:
+    """Strip the ``_( … );`` JSONP wrapper and decode the payload."""
+    start = text.index("(")
+    end = text.rindex(")")
+    return json_loads(text[start + 1:end])
+
+
+def _json_result(item: dict) -> Optional[dict]:
+    """Map one JSON endpoint result onto the raw result dict."""
+    title = (item.get("titleNoFormatting") or "").strip()
+    href = (item.get("unescapedUrl") or item.get("url") or "").strip()
+    if not title or not href:
+        return None
+    return {
+        "title": title,
+        "url": href,
+        "snippet": (item.get("contentNoFormatting") or "").strip(),
+    }
+
+
+# ── Browser fallback ────────────────────────────────────────────────────
+
+
+async def _search_browser(
+    cx: str, search_phrases: List[str], collector: _Collector,
+) -> None:
+    """Render each phrase's CSE page in headless Chromium and scrape it."""
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        logger.warning(
+            "Google CSE search skipped — install playwright: "
+            "pip install playwright && "
+            "python -m playwright install chromium"
+        )
+        return
 
     try:
+        # One browser per search, shared by every phrase.  It is not kept
+        # at module level: searches may run on different event loops (see
+        # ``_client.py``), Playwright objects cannot outlive the loop that
+        # started them, and a browser left open on a closed loop would
+        # leak its Chromium process.
         async with async_playwright() as pw:
             browser = await pw.chromium.launch(headless=True)
             try:
                 page = await browser.new_page()
 
                 for phrase in search_phrases:
-                    if len(candidates) >= max_results:
+                    if collector.full:
                         break
 
                     encoded_q = urllib.parse.quote_plus(phrase)
                     url = f"{_CSE_BASE}?cx={cx}&q={encoded_q}"
 
+                    # Only the DOM is needed; the selector wait below is
+                    # what guarantees the results have rendered.
                     try:
-                        await page.goto(url, wait_until="networkidle")
+                        await page.goto(url, wait_until="domcontentloaded")
                     except Exception as nav_exc:
                         logger.warning(
                             "Google CSE: navigation failed for %r: %s",
@@ -201,26 +397,22 @@ async def search_google_cse(
                         )
                         continue
 
-                    elements = await page.query_selector_all(
-                        ".gsc-result"
-                    )
+                    # All results in one round-trip to the browser
+                    try:
+                        raws = await page.evaluate(_JS_EXTRACT_RESULTS)
+                    except Exception as exc:
+                        logger.warning(
+                            "Google CSE: result extraction failed for %r: %s",
+                            phrase,
+                            exc,
+                        )
+                        continue
 
-                    for el in elements:
-                        if len(candidates) >= max_results:
+                    for raw in raws:
+                        if collector.full:
                             break
-
-                        raw = await _extract_result(el)
-                        if raw is None:
-                            continue
-
-                        link = raw["url"]
-                        if link in seen_links:
-                            continue
-                        seen_links.add(link)
-
-                        cand = _build_candidate(raw, keywords)
-                        if cand is not None:
-                            candidates.append(cand)
+                        if raw["title"] and raw["url"]:
+                            collector.add(raw)
 
             finally:
                 await browser.close()
@@ -228,70 +420,46 @@ async def search_google_cse(
     except Exception as exc:
         logger.warning("Google CSE search failed: %s", exc)
 
-    return candidates[:max_results]
-
 
 # ── DOM extraction ──────────────────────────────────────────────────────
 
 
-async def _extract_result(
-    el: Any,
-) -> Optional[dict]:
-    """Pull title, URL, and snippet from a ``.gsc-result`` element."""
-    try:
-        a_el = await el.query_selector("a.gs-title")
-        if a_el is None:
-            return None
-        title = (await a_el.inner_text()).strip()
-        href = (await a_el.get_attribute("href") or "").strip()
-        if not title or not href:
-            return None
-
-        snip_el = await el.query_selector(".gs-snippet")
-        snippet = ""
-        if snip_el:
-            snippet = (await snip_el.inner_text()).strip()
-
-        return {
-            "title": title,
-            "url": href,
-            "snippet": snippet,
-        }
-    except Exception:
-        return None
+# Pulls title, URL, and snippet from every ``.gsc-result`` element.
+# ``href`` is read as the raw attribute, not the resolved property.
+_JS_EXTRACT_RESULTS = """
+() => Array.from(document.querySelectorAll('.gsc-result')).map(el => {
+    const a = el.querySelector('a.gs-title');
+    const snip = el.querySelector('.gs-snippet');
+    return {
+        title: a ? a.innerText.trim() : '',
+        url: a ? (a.getAttribute('href') || '').trim() : '',
+        snippet: snip ? snip.innerText.trim() : '',
+    };
+})
+"""
 
 
 # ── Candidate construction ──────────────────────────────────────────────
 
 
 def _build_candidate(
-    raw: dict, keywords: List[str]
+    raw: dict,
+    keywords: List[str],
+    kw_lower: Tuple[str, ...],
+    match_keywords: Callable[[str], FrozenSet[str]],
 ) -> Optional[PackageCandidate]:
-    """Convert an extracted CSE result into a ``PackageCandidate``."""
+    """Convert an extracted CSE result into a ``PackageCandidate``.
+
+    *kw_lower* is *keywords* lowercased once per search and
+    *match_keywords* the search's :func:`keyword_matcher`.
+    """
     title = raw["title"]
     link = raw["url"]
     snippet = raw.get("snippet", "")
 
     homepage = link
-    repo_url = ""
-    python_package = ""
-    install_cmd = ""
-
-    pypi_match = _PYPI_RE.search(link)
-    if pypi_match:
-        python_package = pypi_match.group(1)
-        install_cmd = f"pip install {python_package}"
-
-    github_match = _GITHUB_RE.search(link)
-    if github_match:
-        repo_url = (
-            f"https://github.com/{github_match.group(1)}"
-        )
-        if not python_package:
-            python_package = (
-                github_match.group(1).split("/")[-1]
-            )
-            install_cmd = f"pip install {python_package}"
+    python_package, repo_url, pypi_hit, github_hit = _parse_link(link)
+    install_cmd = f"pip install {python_package}" if python_package else ""
 
     name = python_package or _clean_title(title)
     if not name:
@@ -299,17 +467,17 @@ def _build_candidate(
 
     # ── Relevance scoring ───────────────────────────────────────────
     search_text = f"{title} {snippet} {link}".lower()
-    kw_lower = [kw.lower() for kw in keywords]
+    matched = match_keywords(search_text)
     hit_count = sum(
-        1 for kw in kw_lower if kw in search_text
+        1 for kw in kw_lower if kw in matched
     )
     relevance = min(
         hit_count / max(len(keywords), 1), 1.0
     )
 
-    if pypi_match:
+    if pypi_hit:
         relevance = min(relevance + 0.15, 1.0)
-    if github_match:
+    if github_hit:
         relevance = min(relevance + 0.1, 1.0)
     if "python" in search_text:
         relevance = min(relevance + 0.05, 1.0)
@@ -326,13 +494,37 @@ def _build_candidate(
         publication_dois=[],
         keywords=[
             kw
-            for kw in keywords
-            if kw.lower() in search_text
+            for kw, low in zip(keywords, kw_lower)
+            if low in matched
         ],
         python_package=python_package,
     )
 
 
+@functools.lru_cache(maxsize=1024)
+def _parse_link(link: str) -> Tuple[str, str, bool, bool]:
+    """Pull package / repository info out of a result URL.
+
+    Returns ``(python_package, repo_url, is_pypi, is_github)``.  Cached,
+    since the same URLs recur across queries and searches.
+    """
+    python_package = ""
+    repo_url = ""
+
+    pypi_match = _PYPI_RE.search(link)
+    if pypi_match:
+        python_package = pypi_match.group(1)
+
+    github_match = _GITHUB_RE.search(link)
+    if github_match:
+        repo_url = f"https://github.com/{github_match.group(1)}"
+        if not python_package:
+            python_package = github_match.group(1).split("/")[-1]
+
+    return python_package, repo_url, bool(pypi_match), bool(github_match)
+
+
+@functools.lru_cache(maxsize=1024)
 def _clean_title(title: str) -> str:
     """Extract a usable name from a page title.
 
@@ -343,5 +535,5 @@ def _clean_title(title: str) -> str:
         if sep in title:
             title = title.split(sep)[0]
             break
-    name = re.sub(r"\s+", " ", title).strip()
+    name = _SPACES_RE.sub(" ", title).strip()
     return name[:80]
@@ -7,15 +7,20 @@ https://paperswithcode.com/api/v1/
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
-from typing import List
+from typing import Callable, FrozenSet, List, Tuple
 
 from sciagent_wizard.models import DiscoverySource, PackageCandidate
+from ._json import response_json
+from ._keywords import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
 _API_BASE = "https://paperswithcode.com/api/v1"
+# Cap on in-flight per-paper repository requests (PWC rate limits)
+_MAX_CONCURRENT_REPO_FETCHES = 10
 
 
 async def search_papers_with_code(
@@ -37,14 +42,16 @@ async def search_papers_with_code(
     Returns:
         List of ``PackageCandidate``.
     """
-    import httpx
+    from ._client import shared_client
 
     candidates: List[PackageCandidate] = []
     seen_repos: set[str] = set()
     query = " ".join(keywords)
+    kw_lower = tuple(kw.lower() for kw in keywords)
+    match_keywords = keyword_matcher(kw_lower)
 
     try:
-        async with httpx.AsyncClient(timeout=20) as client:
+        async with shared_client() as client:
             # ── Search papers ───────────────────────────────────────
             resp = await client.get(
                 f"{_API_BASE}/papers/",
@@ -55,24 +62,30 @@ async def search_papers_with_code(
                 logger.warning("Papers With Code papers endpoint returned %d", resp.status_code)
                 return []
 
-            data = resp.json()
+            data = response_json(resp)
             papers = data.get("results", [])
 
-            for paper in papers:
-                paper_id = paper.get("id")
-                if not paper_id:
-                    continue
+            # ── Fetch every paper's repos concurrently ──────────────
+            sem = asyncio.Semaphore(_MAX_CONCURRENT_REPO_FETCHES)
 
-                # Fetch repos for this paper
-                try:
+            async def _fetch_repos(paper_id: str) -> list:
+                async with sem:
                     repo_resp = await client.get(
                         f"{_API_BASE}/papers/{paper_id}/repositories/",
                         follow_redirects=True,
                     )
-                    if repo_resp.status_code != 200:
-                        continue
-                    repos = repo_resp.json().get("results", [])
-                except Exception:
+                if repo_resp.status_code != 200:
+                    return []
+                return response_json(repo_resp).get("results", [])
+
+            papers = [p for p in papers if p.get("id")]
+            repo_lists = await asyncio.gather(
+                *(_fetch_repos(p["id"]) for p in papers),
+                return_exceptions=True,
+            )
+
+            for paper, repos in zip(papers, repo_lists):
+                if isinstance(repos, BaseException):
                     continue
 
                 for repo in repos:
@@ -92,6 +105,8 @@ async def search_papers_with_code(
                         stars=stars,
                         framework=framework,
                         keywords=keywords,
+                        kw_lower=kw_lower,
+                        match_keywords=match_keywords,
                     )
                     candidates.append(cand)
 
@@ -111,8 +126,14 @@ def _build_candidate(
     stars: int,
     framework: str,
     keywords: List[str],
+    kw_lower: Tuple[str, ...],
+    match_keywords: Callable[[str], FrozenSet[str]],
 ) -> PackageCandidate:
-    """Build a ``PackageCandidate`` from a paper+repo pair."""
+    """Build a ``PackageCandidate`` from a paper+repo pair.
+
+    *kw_lower* is *keywords* lowercased once per search and
+    *match_keywords* the search's :func:`keyword_matcher`.
+    """
     title = paper.get("title", "") or ""
     abstract = paper.get("abstract", "") or ""
     arxiv_id = paper.get("arxiv_id", "")
@@ -123,7 +144,8 @@ def _build_candidate(
 
     # Relevance
     search_text = f"{title} {abstract} {repo_name}".lower()
-    hit_count = sum(1 for kw in keywords if kw.lower() in search_text)
+    matched = match_keywords(search_text)
+    hit_count = sum(1 for kw in kw_lower if kw in matched)
     relevance = min(hit_count / max(len(keywords), 1), 1.0)
 
     # Boost for official repos and popular ones
@@ -151,6 +173,6 @@ def _build_candidate(
         relevance_score=round(relevance, 3),
         peer_reviewed=bool(arxiv_id),
         publication_dois=dois,
-        keywords=[kw for kw in keywords if kw.lower() in search_text],
+        keywords=[kw for kw, low in zip(keywords, kw_lower) if low in matched],
         python_package=repo_name,
     )
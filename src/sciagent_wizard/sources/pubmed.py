@@ -9,9 +9,12 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import List
+from typing import Callable, FrozenSet, List, Tuple
 
 from sciagent_wizard.models import DiscoverySource, PackageCandidate
+from ._client import shared_client
+from ._json import response_json
+from ._keywords import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -20,12 +23,21 @@ _EFETCH = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
 _EUROPEPMC = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
 
 # Patterns to extract software mentions from abstracts
-_GITHUB_RE = re.compile(r"github\.com/[\w\-]+/[\w\-]+", re.IGNORECASE)
-_PYPI_RE = re.compile(r"(?:pip install|pypi\.org/project/)([\w\-]+)", re.IGNORECASE)
+# (GitHub and PyPI names are ASCII, so those two skip Unicode tables.)
+_GITHUB_RE = re.compile(r"github\.com/[\w\-]+/[\w\-]+", re.IGNORECASE | re.ASCII)
+_PYPI_RE = re.compile(
+    r"(?:pip install|pypi\.org/project/)([\w\-]+)", re.IGNORECASE | re.ASCII,
+)
 _SOFTWARE_NAME_RE = re.compile(
     r"(?:software|package|library|tool|toolkit|framework)\s+(?:called|named|known as)\s+[\"']?(\w[\w\-]*)",
     re.IGNORECASE,
 )
+# Literals each pattern needs, checked with ``in`` before running it
+# (most abstracts contain none of them)
+_PYPI_MARKERS = ("pip install", "pypi.org/project/")
+_SOFTWARE_WORDS = ("software", "package", "librar", "tool", "framework")
+# Words captured by _SOFTWARE_NAME_RE that are not software names
+_NOT_NAMES = frozenset({"the", "our", "this", "new", "for"})
 
 
 async def search_pubmed(
@@ -48,17 +60,17 @@ async def search_pubmed(
     Returns:
         List of ``PackageCandidate``.
     """
-    import httpx
-
     candidates: List[PackageCandidate] = []
     seen: set[str] = set()
 
     # Build a query that targets software/methods papers
     domain_query = " ".join(keywords)
     query = f'({domain_query}) AND (software OR package OR "open source" OR github OR python)'
+    kw_lower = tuple(kw.lower() for kw in keywords)
+    match_keywords = keyword_matcher(kw_lower)
 
     try:
-        async with httpx.AsyncClient(timeout=25) as client:
+        async with shared_client(timeout=25) as client:
             resp = await client.get(
                 _EUROPEPMC,
                 params={
@@ -68,13 +80,14 @@ async def search_pubmed(
                     "pageSize": str(min(max_results * 3, 50)),
                     "sort": "CITED desc",
                 },
+                headers={"Accept": "application/json"},
                 follow_redirects=True,
             )
             if resp.status_code != 200:
                 logger.warning("Europe PMC returned %d", resp.status_code)
                 return []
 
-            data = resp.json()
+            data = response_json(resp)
             results = data.get("resultList", {}).get("result", [])
 
             for paper in results:
@@ -83,6 +96,8 @@ async def search_pubmed(
                 doi = paper.get("doi", "") or ""
                 cited_by = paper.get("citedByCount", 0) or 0
                 text = f"{title} {abstract}"
+                # Score and keyword list are per paper, shared by its mentions
+                scored = None
 
                 # Extract software mentions
                 for match in _extract_software(text):
@@ -91,15 +106,11 @@ async def search_pubmed(
                         continue
                     seen.add(pkg_name.lower())
 
-                    # Score
-                    search_lower = text.lower()
-                    hit_count = sum(1 for kw in keywords if kw.lower() in search_lower)
-                    relevance = min(hit_count / max(len(keywords), 1), 1.0)
-                    # Boost cited papers
-                    if cited_by > 10:
-                        relevance = min(relevance + 0.1, 1.0)
-                    if cited_by > 100:
-                        relevance = min(relevance + 0.1, 1.0)
+                    if scored is None:
+                        scored = _score_paper(
+                            text, cited_by, keywords, kw_lower, match_keywords,
+                        )
+                    relevance, paper_keywords = scored
 
                     candidates.append(
                         PackageCandidate(
@@ -110,10 +121,10 @@ async def search_pubmed(
                             homepage=f"https://doi.org/{doi}" if doi else "",
                             repository_url=repo_url,
                             citations=cited_by,
-                            relevance_score=round(relevance, 3),
+                            relevance_score=relevance,
                             peer_reviewed=True,
                             publication_dois=[doi] if doi else [],
-                            keywords=[kw for kw in keywords if kw.lower() in search_lower],
+                            keywords=list(paper_keywords),
                             python_package=pkg_name if source_type == "pypi" else "",
                         )
                     )
@@ -127,6 +138,32 @@ async def search_pubmed(
     return candidates[:max_results]
 
 
+def _score_paper(
+    text: str,
+    cited_by: int,
+    keywords: List[str],
+    kw_lower: Tuple[str, ...],
+    match_keywords: Callable[[str], FrozenSet[str]],
+) -> Tuple[float, List[str]]:
+    """Return ``(relevance, matched keywords)`` for a paper's text.
+
+    Relevance is the fraction of keywords found, plus 0.1 each for more
+    than 10 and more than 100 citations, capped at 1.
+    """
+    matched = match_keywords(text.lower())
+    hit_count = sum(1 for kw in kw_lower if kw in matched)
+    relevance = min(
+        hit_count / max(len(keywords), 1)
+        + 0.1 * (cited_by > 10)
+        + 0.1 * (cited_by > 100),
+        1.0,
+    )
+    return (
+        round(relevance, 3),
+        [kw for kw, low in zip(keywords, kw_lower) if low in matched],
+    )
+
+
 def _extract_software(text: str) -> List[tuple]:
     """Extract (name, repo_url, source_type) tuples from text.
 
@@ -135,22 +172,28 @@ def _extract_software(text: str) -> List[tuple]:
         source_type is one of "github", "pypi", "named".
     """
     results: list[tuple] = []
+    # casefold (not lower) so the prefilters never reject text that an
+    # IGNORECASE pattern would match
+    folded = text.casefold()
 
     # GitHub repos
-    for match in _GITHUB_RE.finditer(text):
-        url = f"https://{match.group(0)}"
-        name = url.rstrip("/").split("/")[-1]
-        results.append((name, url, "github"))
+    if "github.com" in folded:
+        for match in _GITHUB_RE.finditer(text):
+            url = f"https://{match.group(0)}"
+            name = url.rstrip("/").split("/")[-1]
+            results.append((name, url, "github"))
 
     # PyPI packages
-    for match in _PYPI_RE.finditer(text):
-        name = match.group(1)
-        results.append((name, "", "pypi"))
+    if any(marker in folded for marker in _PYPI_MARKERS):
+        for match in _PYPI_RE.finditer(text):
+            name = match.group(1)
+            results.append((name, "", "pypi"))
 
     # Explicitly named software
-    for match in _SOFTWARE_NAME_RE.finditer(text):
-        name = match.group(1)
-        if len(name) > 2 and name.lower() not in {"the", "our", "this", "new", "for"}:
-            results.append((name, "", "named"))
+    if any(word in folded for word in _SOFTWARE_WORDS):
+        for match in _SOFTWARE_NAME_RE.finditer(text):
+            name = match.group(1)
+            if len(name) > 2 and name.lower() not in _NOT_NAMES:
+                results.append((name, "", "named"))
 
     return results
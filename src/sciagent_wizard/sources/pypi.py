@@ -20,13 +20,25 @@ Strategy
 from __future__ import annotations
 
 import asyncio
+import functools
+import heapq
 import itertools
+import json
 import logging
 import re
-from typing import List
+from typing import Callable, FrozenSet, Iterator, List, Optional, Set, Tuple
 from urllib.parse import quote_plus
 
+try:  # optional: one-pass multi-keyword matching
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from sciagent_wizard.models import DiscoverySource, PackageCandidate
+from ._client import shared_client
+from ._cache import cached_get
+from ._json import loads as json_loads
+from ._keywords import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -36,11 +48,26 @@ _PYPI_JSON = "https://pypi.org/pypi/{}/json"
 # The Simple Index is not behind bot protection (pip depends on it).
 _PYPI_SIMPLE_INDEX = "https://pypi.org/simple/"
 
-# Concurrency limit for JSON-API probes
-_MAX_CONCURRENT = 15
+_CACHE_NAMESPACE = "pypi_probe"  # trimmed JSON-API metadata, see _cache.py
+
+# Concurrency limit for JSON-API probes; kept below the shared client's
+# connection pool (see _client.py) so probes never queue inside httpx.
+_MAX_CONCURRENT = 50
+
+# Only the head of a project description is searched for keywords
+_MAX_DESCRIPTION_CHARS = 4096
+
+# Probing stops early once 2 × max_results candidates score at least this
+_STRONG_RELEVANCE = 0.5
+
+# JSON-API ``info`` fields used for scoring (and kept in the probe cache)
+_PROBE_FIELDS = (
+    "name", "summary", "description", "home_page", "project_url",
+    "classifiers", "project_urls",
+)
 
 # Science-related classifiers that boost relevance
-_SCIENCE_CLASSIFIERS = {
+_SCIENCE_CLASSIFIERS = frozenset({
     "Topic :: Scientific/Engineering",
     "Topic :: Scientific/Engineering :: Bio-Informatics",
     "Topic :: Scientific/Engineering :: Chemistry",
@@ -51,12 +78,28 @@ _SCIENCE_CLASSIFIERS = {
     "Topic :: Scientific/Engineering :: Artificial Intelligence",
     "Topic :: Scientific/Engineering :: Image Recognition",
     "Topic :: Scientific/Engineering :: Information Analysis",
-}
+})
+
+# "_" and "." compare equal to "-" when looking names up in the index
+_INDEX_KEY_TABLE = str.maketrans("_.", "--")
+
+# Package names in the Simple Index HTML: <a href="...">name</a>
+_NAME_RE = re.compile(rb">([^<]+)</a>")
+# Longest single <a>…</a> entry expected in the Simple Index
+_MAX_TAG_BYTES = 1024
 
 # Common prefixes / suffixes for scientific Python packages
 _PREFIXES = ("py", "python-", "sci", "lib")
 _SUFFIXES = ("-py", "-python", "-lib", "-tools", "-kit", "-utils")
 
+# Keyword pairs ("a-b", "ab", ...) are mostly names nobody registered;
+# only this many pairs of meaningful keywords are tried
+_MAX_KEYWORD_PAIRS = 30
+_PAIR_STOPWORDS = frozenset({
+    "data", "analysis", "python", "package", "tool", "tools", "library",
+    "software", "with", "from", "using", "based",
+})
+
 
 # ── Public entry point ──────────────────────────────────────────────────
 
@@ -75,59 +118,93 @@ async def search_pypi(
     Returns:
         List of ``PackageCandidate`` sorted by relevance (highest first).
     """
-    import httpx
-
     # ── 1. Gather candidate names from multiple strategies ──────────
-    generated = _generate_candidate_names(keywords)
-    logger.info(
-        "PyPI: generated %d candidate names from patterns", len(generated)
-    )
+    # More names than can be probed are generated, so that those the
+    # Simple Index shows do not exist can be dropped and replaced.
+    max_probes = max(max_results * 5, 120)
+    generated = list(itertools.islice(
+        _generate_candidate_names(keywords), 2 * max_probes,
+    ))
 
     # Stream Simple Index for keyword-matching names
     index_names: List[str] = []
     try:
-        index_names = await _search_simple_index(
-            keywords, max_names=max_results * 5
+        index_names, listed = await _search_simple_index(
+            keywords,
+            max_names=max_results * 5,
+            lookup=frozenset(_index_key(n) for n in generated),
         )
         logger.info(
             "PyPI: found %d names from Simple Index", len(index_names)
         )
+        if listed is not None:
+            # Full index seen: skip generated names PyPI does not have
+            generated = [n for n in generated if _index_key(n) in listed]
     except Exception as exc:
         logger.warning("PyPI Simple Index search failed: %s", exc)
 
-    # Merge: index hits first (they are real packages), then generated names
-    all_names: List[str] = list(
-        dict.fromkeys(index_names + generated)
+    # Merge: index hits first (they are real packages), then generated
+    # names — only as many as fit under the probe cap.
+    merged = dict.fromkeys(index_names[:max_probes])
+    n_index = len(merged)
+    for name in generated:
+        if len(merged) >= max_probes:
+            break
+        merged.setdefault(name)
+    all_names: List[str] = list(merged)
+    logger.info(
+        "PyPI: added %d candidate names from patterns",
+        len(all_names) - n_index,
     )
-    # Cap probing to avoid excessive API calls
-    all_names = all_names[:max(max_results * 5, 120)]
 
     # ── 2. Probe JSON API concurrently ──────────────────────────────
     found: List[PackageCandidate] = []
     seen: set[str] = set()
     sem = asyncio.Semaphore(_MAX_CONCURRENT)
+    kw_lower = tuple(kw.lower() for kw in keywords)
+    match_keywords = keyword_matcher(kw_lower)
 
-    async with httpx.AsyncClient(
-        timeout=15, follow_redirects=True
-    ) as client:
+    async with shared_client(timeout=15) as client:
 
         async def _probe(name: str) -> PackageCandidate | None:
             async with sem:
                 try:
                     url = _PYPI_JSON.format(quote_plus(name))
-                    resp = await client.get(url)
-                    if resp.status_code == 200:
-                        return _parse_json_api(resp.json(), keywords)
+                    info = await cached_get(
+                        client, _CACHE_NAMESPACE, url, _probe_info,
+                        follow_redirects=True,
+                    )
+                    if info is not None:
+                        return _parse_json_api(
+                            {"info": json_loads(info)}, keywords,
+                            kw_lower, match_keywords,
+                        )
                 except Exception as exc:
                     logger.debug("PyPI probe failed for %s: %s", name, exc)
                 return None
 
-        results = await asyncio.gather(*[_probe(n) for n in all_names])
-
-    for cand in results:
-        if cand is not None and cand.name.lower() not in seen:
-            seen.add(cand.name.lower())
-            found.append(cand)
+        # Stop probing once enough strong matches are in; index hits are
+        # probed first and are the likeliest winners, so the slowest
+        # probes of the long tail stay off the critical path.
+        tasks = [asyncio.ensure_future(_probe(n)) for n in all_names]
+        strong = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                cand = await next_done
+                if cand is None or cand.name.lower() in seen:
+                    continue
+                seen.add(cand.name.lower())
+                found.append(cand)
+                if cand.relevance_score >= _STRONG_RELEVANCE:
+                    strong += 1
+                    if strong >= max_results * 2:
+                        break
+        finally:
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            # Let the cancellations land before the client closes
+            await asyncio.gather(*pending, return_exceptions=True)
 
     # ── 3. Sort and return ──────────────────────────────────────────
     found.sort(key=lambda c: (-c.relevance_score, c.name.lower()))
@@ -141,15 +218,20 @@ async def _search_simple_index(
     keywords: List[str],
     *,
     max_names: int = 100,
-) -> List[str]:
+    lookup: FrozenSet[str] = frozenset(),
+) -> Tuple[List[str], Optional[Set[str]]]:
     """Stream the PyPI Simple Index and collect names containing a keyword.
 
     The Simple Index lists every package on PyPI.  We stream the HTML in
     chunks and check each ``<a>`` tag for keyword matches, keeping memory
     usage low.
-    """
-    import httpx
 
+    *lookup* holds :func:`_index_key` forms of names the caller wants to
+    check for existence.  Returns ``(matching names, listed)`` where
+    *listed* is the subset of *lookup* present in the index — or
+    ``None`` when the scan stopped early, since names past that point
+    were never seen.
+    """
     # Only use keywords of 3+ chars to avoid excessive false positives.
     # Also generate truncated stems from long keywords to improve recall
     # for domain-specific terms (e.g. "neuroscience" → "neuro").
@@ -157,84 +239,170 @@ async def _search_simple_index(
         [kw.lower() for kw in keywords if len(kw.strip()) >= 3]
     )
     if not kw_literals:
-        return []
+        return [], None
 
-    # For short keywords (< 7 chars), require word-boundary matches to
-    # avoid flooding results (e.g. "elect" matching "selects").
-    # For longer keywords, substring match is specific enough.
-    patterns: List[str] = []
-    for kw in kw_literals:
-        escaped = re.escape(kw)
-        if len(kw) < 7:
-            # Word-boundary: delimited by hyphen, underscore, or string edge
-            patterns.append(rf"(?:^|[-_]){escaped}(?:$|[-_])")
-        else:
-            patterns.append(escaped)
-    kw_re = re.compile("|".join(patterns))
-    name_re = re.compile(r">([^<]+)</a>")
+    name_matches = _name_matcher(tuple(kw_literals))
+    name_re = _NAME_RE
 
     matching: List[str] = []
-
-    async with httpx.AsyncClient(
-        timeout=120, follow_redirects=True
-    ) as client:
+    listed: Set[str] = set()
+
+    def _scan(data) -> bool:
+        """Check the names in *data*; return True once *max_names* match."""
+        for m in name_re.finditer(data):
+            pkg_name = m.group(1).strip().decode("ascii", "replace")
+            pkg_lower = pkg_name.lower()
+            if lookup:
+                key = pkg_lower.translate(_INDEX_KEY_TABLE)
+                if key in lookup:
+                    listed.add(key)
+            if name_matches(pkg_lower):
+                matching.append(pkg_name)
+                if len(matching) >= max_names:
+                    return True
+        return False
+
+    async with shared_client() as client:
         async with client.stream(
-            "GET", _PYPI_SIMPLE_INDEX, headers={"Accept": "text/html"}
+            "GET", _PYPI_SIMPLE_INDEX,
+            headers={"Accept": "text/html"},
+            timeout=120,
+            follow_redirects=True,
         ) as resp:
             if resp.status_code != 200:
                 logger.warning("Simple Index returned %d", resp.status_code)
-                return []
-
-            buffer = ""
-            async for chunk in resp.aiter_text(chunk_size=65_536):
+                return [], None
+
+            # Package names are ASCII, so the index is scanned as bytes
+            # and only the extracted names are decoded.  Each block is
+            # scanned in a worker thread while the next chunk downloads;
+            # at most one scan runs at a time, so _scan's lists need no
+            # locking.
+            buffer = bytearray()
+            scanning: Optional[asyncio.Future] = None
+            async for chunk in resp.aiter_bytes(chunk_size=131_072):
                 buffer += chunk
 
-                # Process up to the last complete </a> tag
-                last_close = buffer.rfind("</a>")
+                # Process up to the last complete </a> tag; only the
+                # unfinished tail after it is carried into the next chunk
+                last_close = buffer.rfind(b"</a>")
                 if last_close < 0:
+                    # No tag ends here: keep just a window long enough
+                    # to hold the start of one, never the whole stream
+                    del buffer[:-_MAX_TAG_BYTES]
                     continue
-                processable = buffer[:last_close + 4]
-                buffer = buffer[last_close + 4:]
+                block = bytes(buffer[:last_close + 4])
+                del buffer[:last_close + 4]
+
+                if scanning is not None and await scanning:
+                    # Sort by specificity before returning
+                    return _sort_index_matches(matching, kw_literals, max_names), None
+                scanning = asyncio.ensure_future(asyncio.to_thread(_scan, block))
+
+            # Finish the last block, then the leftover buffer
+            if scanning is not None and await scanning:
+                return _sort_index_matches(matching, kw_literals, max_names), None
+            if _scan(buffer):
+                return _sort_index_matches(matching, kw_literals, max_names), None
+
+    return _sort_index_matches(matching, kw_literals, max_names), listed
 
-                for m in name_re.finditer(processable):
-                    pkg_name = m.group(1).strip()
-                    if kw_re.search(pkg_name.lower()):
-                        matching.append(pkg_name)
-                        if len(matching) >= max_names:
-                            # Sort by specificity before returning
-                            return _sort_index_matches(matching, kw_literals)
 
-            # Process leftover buffer
-            for m in name_re.finditer(buffer):
-                pkg_name = m.group(1).strip()
-                if kw_re.search(pkg_name.lower()):
-                    matching.append(pkg_name)
-                    if len(matching) >= max_names:
-                        return _sort_index_matches(matching, kw_literals)
+def _index_key(name: str) -> str:
+    """Comparison form of a package name for Simple Index lookups."""
+    return name.lower().translate(_INDEX_KEY_TABLE)
 
-    return _sort_index_matches(matching, kw_literals)
+
+@functools.lru_cache(maxsize=64)
+def _keyword_regex(kw_literals: Tuple[str, ...]) -> re.Pattern[str]:
+    """Compile the Simple Index name matcher for *kw_literals*.
+
+    Cached on the (sorted) keyword tuple, so repeated discoveries with
+    the same keywords skip the compile.
+    """
+    # For short keywords (< 7 chars), require word-boundary matches to
+    # avoid flooding results (e.g. "elect" matching "selects").
+    # For longer keywords, substring match is specific enough.
+    minimal = _minimal_keywords(kw_literals)
+    short = [re.escape(kw) for kw in minimal if len(kw) < 7]
+    patterns = [re.escape(kw) for kw in minimal if len(kw) >= 7]
+    if short:
+        # Word-boundary: delimited by hyphen, underscore, or string edge
+        patterns.append(rf"(?:^|[-_])(?:{'|'.join(short)})(?:$|[-_])")
+    return re.compile("|".join(patterns))
+
+
+def _minimal_keywords(kw_literals: Tuple[str, ...]) -> List[str]:
+    """Drop keywords that cannot match a name no other keyword matches.
+
+    A substring-matched keyword (7+ chars) that contains another one —
+    e.g. ``electrophys`` next to the stem ``electrop`` — is redundant.
+    Short keywords are boundary-matched, so a shorter stem does not
+    imply them and they are all kept.
+    """
+    kept: List[str] = []
+    for kw in sorted(kw_literals, key=len):
+        if len(kw) < 7 or not any(
+            len(other) >= 7 and other in kw for other in kept
+        ):
+            kept.append(kw)
+    return kept
+
+
+@functools.lru_cache(maxsize=64)
+def _name_matcher(kw_literals: Tuple[str, ...]) -> Callable[[str], bool]:
+    """Return a predicate telling whether a lowercased package name matches.
+
+    Same rule as :func:`_keyword_regex`.  With ``pyahocorasick``
+    installed, all keywords are found in one automaton pass and the
+    word-boundary rule for short keywords is checked on the hit
+    offsets; otherwise the compiled alternation is used.
+    """
+    if ahocorasick is None:
+        return _keyword_regex(kw_literals).search
+
+    automaton = ahocorasick.Automaton()
+    for kw in _minimal_keywords(kw_literals):
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+
+    def matches(name: str) -> bool:
+        last = len(name) - 1
+        for end, kw in automaton.iter(name):
+            if len(kw) >= 7:
+                return True
+            start = end - len(kw) + 1
+            if (start == 0 or name[start - 1] in "-_") and (
+                end == last or name[end + 1] in "-_"
+            ):
+                return True
+        return False
+
+    return matches
 
 
 # ── Name generation ─────────────────────────────────────────────────────
 
 
-def _sort_index_matches(names: List[str], keywords: List[str]) -> List[str]:
-    """Sort index-discovered package names by specificity.
+def _sort_index_matches(
+    names: List[str], keywords: List[str], max_names: int,
+) -> List[str]:
+    """Return the *max_names* most specific index-discovered names, best first.
 
     Packages whose names are shorter relative to the keyword length are
     treated as more relevant (e.g. ``numpy`` is more specific than
     ``accelerated-numpy-fast-io``).
     """
-    kw_len = max(len(kw) for kw in keywords) if keywords else 1
+    kw_len = max((len(kw) for kw in keywords), default=1)
+    kw_set = {kw.lower() for kw in keywords}
 
     def _score(name: str) -> float:
-        ratio = kw_len / max(len(name), 1)  # higher = more specific
         # Bonus if exact match with any keyword
-        if name.lower() in {kw.lower() for kw in keywords}:
+        if name.lower() in kw_set:
             return 2.0
-        return ratio
+        return kw_len / max(len(name), 1)  # higher = more specific
 
-    return sorted(names, key=_score, reverse=True)
+    return heapq.nlargest(max_names, names, key=_score)
 
 
 def _expand_keywords(keywords: List[str]) -> List[str]:
@@ -260,67 +428,105 @@ def _expand_keywords(keywords: List[str]) -> List[str]:
     return sorted(expanded)
 
 
-def _generate_candidate_names(keywords: List[str]) -> List[str]:
-    """Produce plausible PyPI package names from *keywords*.
+def _generate_candidate_names(keywords: List[str]) -> Iterator[str]:
+    """Yield plausible PyPI package names from *keywords*.
 
     Creates variations using common scientific-Python naming patterns
     (``py-``, ``sci-``, ``-lib``, keyword pairs, concatenations, etc.).
+    Names are yielded lazily and without duplicates in priority order —
+    direct forms, then prefixed, suffixed, and finally keyword pairs —
+    so callers can stop once they have enough.
     """
-    names: set[str] = set()
     # Use expanded keywords for direct lookups only (not combinations)
     all_keywords = _expand_keywords(
         [kw.lower().strip() for kw in keywords if len(kw.strip()) >= 2]
     )
     # For combinations, use only the original keywords to avoid explosion
     cleaned = [kw.lower().strip() for kw in keywords if len(kw.strip()) >= 2]
+    # ...and only the meaningful ones
+    paired = [kw for kw in cleaned if len(kw) >= 4 and kw not in _PAIR_STOPWORDS]
+
+    forms = [
+        (
+            kw,
+            kw.replace(" ", "-"),                    # slug
+            kw.replace("-", "").replace(" ", ""),    # nodash
+            kw.replace(" ", "_").replace("-", "_"),  # under
+        )
+        for kw in all_keywords
+    ]
 
-    for kw in all_keywords:
-        slug = kw.replace(" ", "-")
-        nodash = kw.replace("-", "").replace(" ", "")
-        under = kw.replace(" ", "_").replace("-", "_")
-
+    def _names() -> Iterator[str]:
         # Direct forms
-        names.update([kw, slug, nodash, under])
-
+        for direct in forms:
+            yield from direct
         # Prefixed
-        for prefix in _PREFIXES:
-            names.add(f"{prefix}{nodash}")     # e.g. "pybiology"
-            names.add(f"{prefix}-{slug}")      # e.g. "py-biology"
-            names.add(f"{prefix}_{under}")     # e.g. "py_biology"
-
+        for _, slug, nodash, under in forms:
+            for prefix in _PREFIXES:
+                yield f"{prefix}{nodash}"     # e.g. "pybiology"
+                yield f"{prefix}-{slug}"      # e.g. "py-biology"
+                yield f"{prefix}_{under}"     # e.g. "py_biology"
         # Suffixed
-        for suffix in _SUFFIXES:
-            names.add(f"{slug}{suffix}")       # e.g. "biology-tools"
-
-    # Pair combinations (original keywords only, not stems)
-    for kw1, kw2 in itertools.combinations(cleaned, 2):
-        a = kw1.replace(" ", "")
-        b = kw2.replace(" ", "")
-        names.update([
-            f"{a}-{b}", f"{b}-{a}",
-            f"{a}_{b}", f"{b}_{a}",
-            f"{a}{b}", f"{b}{a}",
-        ])
-
-    # Filter out empty / invalid package names
-    valid = {
-        n for n in names
-        if n and len(n) >= 2 and re.match(r"^[a-zA-Z0-9]", n)
-    }
-    return sorted(valid)
+        for _, slug, _, _ in forms:
+            for suffix in _SUFFIXES:
+                yield f"{slug}{suffix}"       # e.g. "biology-tools"
+        # Pair combinations (original keywords only, not stems), capped
+        for kw1, kw2 in itertools.islice(
+            itertools.combinations(paired, 2), _MAX_KEYWORD_PAIRS,
+        ):
+            a = kw1.replace(" ", "")
+            b = kw2.replace(" ", "")
+            yield from (
+                f"{a}-{b}", f"{b}-{a}",
+                f"{a}_{b}", f"{b}_{a}",
+                f"{a}{b}", f"{b}{a}",
+            )
+
+    # Skip duplicates and empty / invalid package names
+    seen: set[str] = set()
+    for name in _names():
+        if (
+            len(name) >= 2
+            and name[0].isascii()
+            and name[0].isalnum()
+            and name not in seen
+        ):
+            seen.add(name)
+            yield name
 
 
 # ── JSON-API parsing ────────────────────────────────────────────────────
 
 
-def _parse_json_api(data: dict, keywords: List[str]) -> PackageCandidate:
-    """Parse a PyPI JSON API response into a ``PackageCandidate``."""
+def _probe_info(body: bytes) -> Optional[str]:
+    """Keep only the ``info`` fields :func:`_parse_json_api` reads.
+
+    The full JSON-API document lists every release file, so the probe
+    cache stores this trimmed copy instead.
+    """
+    info = json_loads(body).get("info") or {}
+    kept = {field: info[field] for field in _PROBE_FIELDS if field in info}
+    kept["description"] = (info.get("description") or "")[:_MAX_DESCRIPTION_CHARS]
+    return json.dumps(kept)
+
+
+def _parse_json_api(
+    data: dict,
+    keywords: List[str],
+    kw_lower: Tuple[str, ...],
+    match_keywords: Callable[[str], FrozenSet[str]],
+) -> PackageCandidate:
+    """Parse a PyPI JSON API response into a ``PackageCandidate``.
+
+    *kw_lower* is *keywords* lowercased once per search and
+    *match_keywords* the search's :func:`keyword_matcher`.
+    """
     info = data.get("info", {})
     name = info.get("name", "")
     summary = info.get("summary", "") or ""
     description = info.get("description", "") or ""
     home_page = info.get("home_page", "") or info.get("project_url", "") or ""
-    classifiers = info.get("classifiers", [])
+    classifiers = info.get("classifiers") or []
     project_urls = info.get("project_urls") or {}
 
     repo_url = (
@@ -331,14 +537,18 @@ def _parse_json_api(data: dict, keywords: List[str]) -> PackageCandidate:
         or ""
     )
 
-    # Keyword relevance scoring
-    search_text = f"{name} {summary} {description}".lower()
-    keyword_hits = sum(1 for kw in keywords if kw.lower() in search_text)
+    # Keyword relevance scoring.  The description is only searched (and
+    # only its head) for keywords the name and summary do not contain.
+    matched = match_keywords(f"{name} {summary}".lower())
+    if not matched.issuperset(kw_lower):
+        head = description[:_MAX_DESCRIPTION_CHARS]
+        matched = match_keywords(f"{name} {summary} {head}".lower())
+    keyword_hits = sum(1 for kw in kw_lower if kw in matched)
     kw_score = min(keyword_hits / max(len(keywords), 1), 1.0)
 
     # Science classifier bonus
-    classifier_set = set(classifiers)
-    sci_overlap = len(classifier_set & _SCIENCE_CLASSIFIERS)
+    # PyPI lists each classifier once, so no set is needed to dedupe
+    sci_overlap = sum(1 for c in classifiers if c in _SCIENCE_CLASSIFIERS)
     sci_score = min(sci_overlap / 3, 1.0)  # cap at 1
 
     relevance = 0.6 * kw_score + 0.4 * sci_score
@@ -351,6 +561,6 @@ def _parse_json_api(data: dict, keywords: List[str]) -> PackageCandidate:
         homepage=home_page,
         repository_url=repo_url,
         relevance_score=round(relevance, 3),
-        keywords=[kw for kw in keywords if kw.lower() in search_text],
+        keywords=[kw for kw, low in zip(keywords, kw_lower) if low in matched],
         python_package=name,
     )
@@ -22,15 +22,31 @@ _MULTI_SOURCE_BOOST = 0.12
 # Minimum relevance to keep a candidate in the final list
 _MIN_RELEVANCE = 0.05
 
+# Per-source deadline (seconds) in discover_packages; a source that
+# overruns contributes no candidates instead of stalling the others.
+# PyPI streams the whole Simple Index, so it gets the longest budget.
+_SOURCE_TIMEOUTS = {
+    "pypi": 90.0,
+    "biotools": 20.0,
+    "papers_with_code": 30.0,
+    "pubmed": 30.0,
+    "google_cse": 45.0,
+}
+_DEFAULT_SOURCE_TIMEOUT = 30.0
+
+# "_" and " " both normalise to "-" in deduplication keys
+_KEY_TABLE = str.maketrans("_ ", "--")
+
 
 def rank_and_deduplicate(
     candidates: List[PackageCandidate],
 ) -> List[PackageCandidate]:
     """Merge duplicates and sort by composite relevance score.
 
-    Deduplication key: normalised ``pip_name`` (lowercased, hyphens
-    collapsed).  When two candidates refer to the same package, their
-    metadata is merged and a multi-source bonus is applied.
+    Deduplication key: normalised ``pip_name`` (lowercased, ``_`` and
+    spaces turned into hyphens, outer hyphens stripped).  When two
+    candidates refer to the same package, their metadata is merged and
+    a multi-source bonus is applied.
 
     Args:
         candidates: Raw candidates from all discovery sources.
@@ -38,23 +54,23 @@ def rank_and_deduplicate(
     Returns:
         Sorted list (highest relevance first), deduplicated.
     """
-    buckets: dict[str, list[PackageCandidate]] = {}
+    # key -> (merged candidate so far, sources that reported it)
+    by_key: dict[str, tuple[PackageCandidate, set[DiscoverySource]]] = {}
 
     for cand in candidates:
         key = _normalise_key(cand)
-        buckets.setdefault(key, []).append(cand)
+        entry = by_key.get(key)
+        if entry is None:
+            by_key[key] = (cand, {cand.source})
+        else:
+            best, sources_seen = entry
+            sources_seen.add(cand.source)
+            by_key[key] = (best.merge(cand), sources_seen)
 
     merged: list[PackageCandidate] = []
-    for key, group in buckets.items():
-        best = group[0]
-        sources_seen: set[DiscoverySource] = {best.source}
-
-        for other in group[1:]:
-            best = best.merge(other)
-            sources_seen.add(other.source)
-
+    for best, sources_seen in by_key.values():
         # Multi-source boost
-        extra = max(0, len(sources_seen) - 1) * _MULTI_SOURCE_BOOST
+        extra = (len(sources_seen) - 1) * _MULTI_SOURCE_BOOST
         best.relevance_score = min(round(best.relevance_score + extra, 3), 1.0)
 
         if best.relevance_score >= _MIN_RELEVANCE:
@@ -66,9 +82,12 @@ def rank_and_deduplicate(
 
 
 def _normalise_key(cand: PackageCandidate) -> str:
-    """Produce a stable deduplication key from a candidate."""
+    """Produce a stable deduplication key from a candidate.
+
+    One ``translate`` pass maps ``_`` and spaces to ``-``.
+    """
     raw = cand.pip_name or cand.name
-    return raw.lower().replace("_", "-").replace(" ", "-").strip("-")
+    return raw.lower().translate(_KEY_TABLE).strip("-")
 
 
 # ── Public one-shot helper ──────────────────────────────────────────────
@@ -105,6 +124,7 @@ async def discover_packages(
     from .papers_with_code import search_papers_with_code
     from .pubmed import search_pubmed
     from .google_cse import search_google_cse
+    from ._client import shared_client
 
     source_map = {
         "pypi": search_pypi,
@@ -116,6 +136,14 @@ async def discover_packages(
 
     active = sources or list(source_map.keys())
 
+    async def _bounded(name: str, coro) -> List[PackageCandidate]:
+        timeout = _SOURCE_TIMEOUTS.get(name, _DEFAULT_SOURCE_TIMEOUT)
+        try:
+            return await asyncio.wait_for(coro, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Source %s timed out after %.0fs", name, timeout)
+            return []
+
     # Launch searches concurrently
     tasks = []
     task_names = []
@@ -126,16 +154,19 @@ async def discover_packages(
             continue
         # Google CSE benefits from targeted search phrases
         if name == "google_cse":
-            tasks.append(fn(
+            coro = fn(
                 keywords,
                 queries=search_queries,
                 max_results=max_per_source,
-            ))
+            )
         else:
-            tasks.append(fn(keywords, max_results=max_per_source))
+            coro = fn(keywords, max_results=max_per_source)
+        tasks.append(_bounded(name, coro))
         task_names.append(name)
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    # Sources that use shared_client() reuse this run's connection pool.
+    async with shared_client():
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
     all_candidates: list[PackageCandidate] = []
     for name, result in zip(task_names, results):
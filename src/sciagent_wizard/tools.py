@@ -8,13 +8,19 @@ Each function receives the wizard state and performs its action.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import concurrent.futures
 import json
 import logging
+import os
+import re
 import subprocess
 import sys
+import threading
+import time
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .models import (
     DiscoverySource,
@@ -23,6 +29,7 @@ from .models import (
     PendingQuestion,
     SUPPORTED_MODELS,
     WizardState,
+    is_supported_model,
 )
 
 logger = logging.getLogger(__name__)
@@ -31,28 +38,92 @@ logger = logging.getLogger(__name__)
 # ── Async helper ────────────────────────────────────────────────────────
 
 
+_bg_loop: Optional[asyncio.AbstractEventLoop] = None
+_bg_thread: Optional[threading.Thread] = None
+_bg_lock = threading.Lock()
+_bg_client = None  # httpx.AsyncClient used only on the background loop
+
+
 def _run_async(coro):
     """Run an async coroutine from a sync tool handler.
 
-    When called from within a running event loop (e.g. Quart web server),
-    ``loop.run_until_complete()`` raises ``RuntimeError``. This helper
-    detects that situation and runs the coroutine in a background thread
-    with its own event loop instead.
+    Coroutines run on one persistent event loop in a daemon thread, so
+    repeated tool calls reuse the same thread, loop and selector rather
+    than creating them per call.  This also works when called from
+    within a running event loop (e.g. Quart web server), where
+    ``loop.run_until_complete()`` would raise ``RuntimeError``; there
+    the wait is capped at 120 s so the caller's loop is not held
+    indefinitely.
     """
     try:
-        asyncio.get_running_loop()
+        running = asyncio.get_running_loop()
     except RuntimeError:
-        # No running loop — safe to use run_until_complete directly
-        loop = asyncio.new_event_loop()
+        running = None
+
+    loop = _background_loop()
+    if running is loop:
+        # A coroutine on the background loop waiting for the same loop
+        # would deadlock; give it a private loop instead.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
+            return pool.submit(_thread_runner, coro).result(timeout=120)
+
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout=120 if running is not None else None)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the persistent tool event loop, starting it on first use."""
+    global _bg_loop, _bg_thread
+    with _bg_lock:
+        if _bg_loop is None:
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="sciagent-wizard-tools",
+                daemon=True,
+            )
+            thread.start()
+            _bg_loop, _bg_thread = loop, thread
+            atexit.register(_stop_background_loop)
+        return _bg_loop
+
+
+def _stop_background_loop() -> None:
+    """Stop the background loop and its thread (registered with atexit)."""
+    loop, thread = _bg_loop, _bg_thread
+    if loop is None or thread is None:
+        return
+    if _bg_client is not None and thread.is_alive():
         try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+            asyncio.run_coroutine_threadsafe(
+                _bg_client.aclose(), loop,
+            ).result(timeout=5)
+        except Exception as exc:
+            logger.debug("Closing the tool HTTP client failed: %s", exc)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    if not thread.is_alive():
+        loop.close()
 
-    # Already inside a running loop — offload to a thread
-    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as pool:
-        future = pool.submit(_thread_runner, coro)
-        return future.result(timeout=120)
+
+def _background_client():
+    """Return the background loop's long-lived HTTP client.
+
+    Doc fetches on the background loop share it across tool calls, so
+    connections and TLS sessions to PyPI / GitHub are kept alive between
+    calls instead of being re-established each time.
+    """
+    global _bg_client
+    if _bg_client is None:
+        from .sources._client import new_client
+        from .sources.doc_fetcher import _TIMEOUT
+
+        _bg_client = new_client(timeout=_TIMEOUT)
+    return _bg_client
 
 
 def _thread_runner(coro):
@@ -64,6 +135,74 @@ def _thread_runner(coro):
         loop.close()
 
 
+# Candidates listed back to the LLM after a search / catalog load
+_SHOWN_CANDIDATES = 30
+
+
+# ── Short-lived result cache ────────────────────────────────────────────
+#
+# Searches, doc fetches and ingestions are often repeated within a
+# session with the same inputs (e.g. the user edits a keyword chip and
+# resubmits).  Their results are kept in memory for a short while,
+# keyed on the normalised inputs; errors are never stored.
+
+_RESULT_CACHE_TTL = 60.0  # seconds
+_RESULT_CACHE_MAX = 50
+_result_cache: Dict[tuple, tuple] = {}  # key -> (stored_at, value)
+_result_cache_lock = threading.Lock()
+
+
+def _cached_result(key: tuple) -> Any:
+    """Return the cached value for *key*, or ``None`` if absent or expired."""
+    with _result_cache_lock:
+        hit = _result_cache.get(key)
+        if hit is None:
+            return None
+        stored_at, value = hit
+        if time.monotonic() - stored_at >= _RESULT_CACHE_TTL:
+            del _result_cache[key]
+            return None
+        return value
+
+
+def _store_result(key: tuple, value: Any) -> None:
+    """Cache *value* under *key*, evicting the oldest entries past the cap."""
+    with _result_cache_lock:
+        _result_cache.pop(key, None)
+        _result_cache[key] = (time.monotonic(), value)
+        while len(_result_cache) > _RESULT_CACHE_MAX:
+            del _result_cache[next(iter(_result_cache))]
+
+
+def _sorted_lower(values: Optional[List[str]]) -> Optional[tuple]:
+    return tuple(sorted(v.lower() for v in values)) if values else None
+
+
+# ── Static tool responses (serialised once) ─────────────────────────────
+
+_ERR_NO_CANDIDATES = json.dumps({
+    "error": "No packages found yet. Run search_packages first.",
+})
+_ERR_IDENTITY_NOT_SET = json.dumps({
+    "error": "Agent identity not set. Call set_agent_identity first.",
+})
+_ERR_NOT_CONFIRMED = json.dumps({
+    "error": "No packages confirmed. Call confirm_packages first.",
+})
+_ERR_NOTHING_CONFIRMED = json.dumps({"error": "No packages confirmed yet."})
+_NOTHING_TO_INSTALL = json.dumps({"status": "nothing_to_install"})
+_ERR_NOT_GENERATED = json.dumps({
+    "error": "Agent not generated yet. Call generate_agent first.",
+})
+_ERR_DOCS_NOT_CONFIRMED = json.dumps({
+    "error": "No packages confirmed yet. Call confirm_packages first.",
+})
+_INGESTOR_MISSING = json.dumps({
+    "error": "docs_ingestor module not available. "
+             "Is sciagent[wizard] installed?",
+})
+
+
 # ── Tool implementations ───────────────────────────────────────────────
 
 
@@ -80,11 +219,13 @@ def tool_present_question(
     Returns a special JSON payload that the WebSocket handler
     intercepts and renders as a clickable question card in the UI.
     """
-    logger.info(
-        "[present_question] Called: q=%r, options=%r, "
-        "freetext=%s, state id=%s",
-        question[:80], options, allow_freetext, id(state),
-    )
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        logger.info(
+            "[present_question] Called: q=%r, options=%r, "
+            "freetext=%s, state id=%s",
+            question[:80], options, allow_freetext, id(state),
+        )
     pending = PendingQuestion(
         question=question,
         options=options,
@@ -93,11 +234,12 @@ def tool_present_question(
         allow_multiple=allow_multiple,
     )
     state.pending_question = pending
-    logger.info(
-        "[present_question] Set state.pending_question=%r "
-        "(state id=%s)",
-        pending, id(state),
-    )
+    if log_info:
+        logger.info(
+            "[present_question] Set state.pending_question=%r "
+            "(state id=%s)",
+            pending, id(state),
+        )
 
     return json.dumps({
         "__type__": "question_card",
@@ -109,6 +251,24 @@ def tool_present_question(
     })
 
 
+def _candidate_rows(candidates: List[PackageCandidate]) -> List[dict]:
+    """Format the top 30 candidates as result rows for the LLM."""
+    return [
+        {
+            "rank": rank,
+            "name": c.name,
+            "description": c.description[:200],
+            "source": c.source.value,
+            "relevance": c.relevance_score,
+            "peer_reviewed": c.peer_reviewed,
+            "citations": c.citations,
+            "install": c.install_command,
+            "homepage": c.homepage,
+        }
+        for rank, c in enumerate(candidates[:_SHOWN_CANDIDATES], 1)
+    ]
+
+
 def tool_search_packages(
     state: WizardState,
     keywords: List[str],
@@ -116,38 +276,46 @@ def tool_search_packages(
     search_queries: Optional[List[str]] = None,
 ) -> str:
     """Search for domain-specific packages."""
+    return _run_async(
+        tool_search_packages_async(state, keywords, sources, search_queries)
+    )
+
+
+async def tool_search_packages_async(
+    state: WizardState,
+    keywords: List[str],
+    sources: Optional[List[str]] = None,
+    search_queries: Optional[List[str]] = None,
+) -> str:
+    """Async :func:`tool_search_packages`, for callers already on a loop."""
     from .sources.ranker import discover_packages
 
-    candidates = _run_async(
-        discover_packages(
+    cache_key = (
+        "search",
+        _sorted_lower(keywords),
+        _sorted_lower(sources),
+        _sorted_lower(search_queries),
+    )
+    candidates = _cached_result(cache_key)
+    if candidates is None:
+        candidates = await discover_packages(
             keywords, sources=sources, search_queries=search_queries,
         )
-    )
+        _store_result(cache_key, candidates)
+    candidates = list(candidates)
 
     # Store in wizard state
     state.keywords = keywords
     state.all_candidates = candidates
 
     # Format for LLM
-    results = []
-    for i, c in enumerate(candidates[:30], 1):
-        results.append({
-            "rank": i,
-            "name": c.name,
-            "description": c.description[:200],
-            "source": c.source.value,
-            "relevance": c.relevance_score,
-            "peer_reviewed": c.peer_reviewed,
-            "citations": c.citations,
-            "install": c.install_command,
-            "homepage": c.homepage,
-        })
+    results = _candidate_rows(candidates)
 
     return json.dumps({
         "total_found": len(candidates),
         "showing": len(results),
         "results": results,
-    }, indent=2)
+    }, separators=(",", ":"))
 
 
 # ── Domain catalog tools ───────────────────────────────────────────────
@@ -161,7 +329,7 @@ def tool_list_domain_catalogs(state: WizardState) -> str:
     return json.dumps({
         "available_domains": len(catalogs),
         "catalogs": catalogs,
-    }, indent=2)
+    }, separators=(",", ":"))
 
 
 def tool_load_domain_catalog(
@@ -192,27 +360,15 @@ def tool_load_domain_catalog(
 
     state.all_candidates = merged
 
-    # Format identically to tool_search_packages for consistency
-    results = []
-    for i, c in enumerate(merged[:30], 1):
-        results.append({
-            "rank": i,
-            "name": c.name,
-            "description": c.description[:200],
-            "source": c.source.value,
-            "relevance": c.relevance_score,
-            "peer_reviewed": c.peer_reviewed,
-            "citations": c.citations,
-            "install": c.install_command,
-            "homepage": c.homepage,
-        })
+    # Same rows as tool_search_packages for consistency
+    results = _candidate_rows(merged)
 
     return json.dumps({
         "catalog_loaded": domain,
         "total_found": len(merged),
         "showing": len(results),
         "results": results,
-    }, indent=2)
+    }, separators=(",", ":"))
 
 
 def tool_analyze_data(state: WizardState, file_paths: List[str]) -> str:
@@ -235,20 +391,19 @@ def tool_analyze_data(state: WizardState, file_paths: List[str]) -> str:
         "files_analyzed": len(infos),
         "accepted_types": state.accepted_file_types,
         "domain_hints": hints,
-        "files": [],
+        # value_ranges serialise as {column: [min, max]}
+        "files": [
+            {
+                "path": fi.path,
+                "extension": fi.extension,
+                "columns": fi.columns[:30],
+                "row_count": fi.row_count,
+                "value_ranges": fi.value_ranges,
+                "hints": fi.inferred_domain_hints,
+            }
+            for fi in infos
+        ],
     }
-    for fi in infos:
-        result["files"].append({
-            "path": fi.path,
-            "extension": fi.extension,
-            "columns": fi.columns[:30],
-            "row_count": fi.row_count,
-            "value_ranges": {
-                k: {"min": v[0], "max": v[1]}
-                for k, v in fi.value_ranges.items()
-            },
-            "hints": fi.inferred_domain_hints,
-        })
 
     if state.bounds:
         result["inferred_bounds"] = {
@@ -256,25 +411,25 @@ def tool_analyze_data(state: WizardState, file_paths: List[str]) -> str:
             for k, v in state.bounds.items()
         }
 
-    return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
 
 
 def tool_show_recommendations(state: WizardState) -> str:
     """Show the current recommendation list."""
     if not state.all_candidates:
-        return json.dumps({"error": "No packages found yet. Run search_packages first."})
-
-    entries = []
-    for i, c in enumerate(state.all_candidates[:30], 1):
-        entries.append(
-            f"{i}. **{c.name}** (relevance: {c.relevance_score:.0%}, "
-            f"source: {c.source.value})\n"
-            f"   {c.description[:150]}\n"
-            f"   Install: `{c.install_command}`"
-            + (f" | Peer-reviewed ✓" if c.peer_reviewed else "")
-        )
+        return _ERR_NO_CANDIDATES
+
+    return "\n\n".join(
+        f"{i}. **{c.name}** (relevance: {c.relevance_score:.0%}, "
+        f"source: {c.source.value})\n"
+        f"   {c.description[:150]}\n"
+        f"   Install: `{c.install_command}`"
+        + (" | Peer-reviewed ✓" if c.peer_reviewed else "")
+        for i, c in enumerate(state.all_candidates[:_SHOWN_CANDIDATES], 1)
+    )
 
-    return "\n\n".join(entries)
+
+_PIP_PREFIX = "pip install "
 
 
 def tool_confirm_packages(
@@ -286,20 +441,29 @@ def tool_confirm_packages(
     confirmed: list[PackageCandidate] = []
     name_set = {n.lower() for n in selected_names}
 
-    # Match from discovered candidates
+    # Match from discovered candidates; pip names of the matches are
+    # collected as we go for the duplicate check below
+    confirmed_pips: set[str] = set()
     for cand in state.all_candidates:
-        if cand.name.lower() in name_set or cand.pip_name.lower() in name_set:
+        if not name_set:
+            break
+        name = cand.name.lower()
+        pip = cand.pip_name.lower()
+        if name in name_set or pip in name_set:
             confirmed.append(cand)
-            name_set.discard(cand.name.lower())
-            name_set.discard(cand.pip_name.lower())
+            confirmed_pips.add(pip)
+            name_set.discard(name)
+            name_set.discard(pip)
 
     # Add user-specified packages (not found by discovery)
     for extra in (additional_packages or []):
-        if extra.lower() not in {c.pip_name.lower() for c in confirmed}:
+        extra_lower = extra.lower()
+        if extra_lower not in confirmed_pips:
+            confirmed_pips.add(extra_lower)
             confirmed.append(PackageCandidate(
                 name=extra,
                 source=DiscoverySource.USER,
-                install_command=f"pip install {extra}",
+                install_command=_PIP_PREFIX + extra,
                 python_package=extra,
                 relevance_score=1.0,
             ))
@@ -309,7 +473,7 @@ def tool_confirm_packages(
         confirmed.append(PackageCandidate(
             name=leftover,
             source=DiscoverySource.USER,
-            install_command=f"pip install {leftover}",
+            install_command=_PIP_PREFIX + leftover,
             python_package=leftover,
             relevance_score=0.8,
         ))
@@ -322,7 +486,7 @@ def tool_confirm_packages(
             {"name": p.name, "source": p.source.value, "install": p.install_command}
             for p in confirmed
         ],
-    }, indent=2)
+    }, separators=(",", ":"))
 
 
 def tool_set_identity(
@@ -359,11 +523,11 @@ def tool_generate(
     suggestion_chips: Optional[List[Dict[str, str]]] = None,
 ) -> str:
     """Generate the agent project."""
-    # Validation
+    # Validate before touching state, so a rejected call leaves no chips
     if not state.agent_name:
-        return json.dumps({"error": "Agent identity not set. Call set_agent_identity first."})
+        return _ERR_IDENTITY_NOT_SET
     if not state.confirmed_packages:
-        return json.dumps({"error": "No packages confirmed. Call confirm_packages first."})
+        return _ERR_NOT_CONFIRMED
 
     # Add suggestion chips if provided
     if suggestion_chips:
@@ -379,96 +543,147 @@ def tool_generate(
 
     # Build mode-specific instructions
     mode = state.output_mode
-    if mode == OutputMode.COPILOT:
-        instructions = {
-            "install": (
-                f'Add to VS Code settings.json:\n'
-                f'  "chat.plugins.paths": {{\n'
-                f'      "{project_path.as_posix()}": true\n'
-                f'  }}'
-            ),
-            "usage": (
-                f"Restart VS Code, then invoke @{state.agent_name} in Copilot chat. "
-                f"Skills are available as slash commands."
-            ),
-            "claude_code": (
-                f"Claude Code agents are also included. "
-                f"Copy the .claude-plugin/ folder or use --plugin-dir."
-            ),
-            "docs": "Package documentation is in docs/",
-        }
-    elif mode == OutputMode.MARKDOWN:
-        instructions = {
-            "usage": (
-                "Copy the contents of system-prompt.md into your preferred "
-                "LLM's system prompt. See agent-spec.md for full details."
-            ),
-            "docs": "Package documentation is in docs/",
-        }
-    else:
-        instructions = {
-            "cli": f"python -m {state.agent_name.replace('-', '_')}",
-            "web": f"python -m {state.agent_name.replace('-', '_')} --web",
-            "install": f"pip install -r {project_path / 'requirements.txt'}",
-        }
+    build = _INSTRUCTION_BUILDERS.get(mode, _fullstack_instructions)
+    instructions = build(state, project_path)
 
     result = {
         "status": "generated",
         "output_mode": mode.value,
         "project_dir": str(project_path),
-        "files": [str(p.relative_to(project_path)) for p in project_path.rglob('*') if p.is_file()],
+        "files": _list_files(project_path),
         "instructions": instructions,
     }
     state.last_generate_result = result
 
-    return json.dumps(result, indent=2)
+    return json.dumps(result, separators=(",", ":"))
+
+
+def _copilot_instructions(state: WizardState, project_path: Path) -> Dict[str, str]:
+    return {
+        "install": (
+            f'Add to VS Code settings.json:\n'
+            f'  "chat.plugins.paths": {{\n'
+            f'      "{project_path.as_posix()}": true\n'
+            f'  }}'
+        ),
+        "usage": (
+            f"Restart VS Code, then invoke @{state.agent_name} in Copilot chat. "
+            f"Skills are available as slash commands."
+        ),
+        "claude_code": _CLAUDE_CODE_NOTE,
+        "docs": _DOCS_NOTE,
+    }
+
+
+def _markdown_instructions(state: WizardState, project_path: Path) -> Dict[str, str]:
+    return {
+        "usage": (
+            "Copy the contents of system-prompt.md into your preferred "
+            "LLM's system prompt. See agent-spec.md for full details."
+        ),
+        "docs": _DOCS_NOTE,
+    }
+
+
+def _fullstack_instructions(state: WizardState, project_path: Path) -> Dict[str, str]:
+    slug = state.agent_slug
+    return {
+        "cli": f"python -m {slug}",
+        "web": f"python -m {slug} --web",
+        "install": _PIP_PREFIX + "-r " + str(project_path / "requirements.txt"),
+    }
+
+
+_CLAUDE_CODE_NOTE = (
+    "Claude Code agents are also included. "
+    "Copy the .claude-plugin/ folder or use --plugin-dir."
+)
+_DOCS_NOTE = "Package documentation is in docs/"
+
+# Post-generation instructions per output mode (fullstack is the default)
+_INSTRUCTION_BUILDERS = {
+    OutputMode.COPILOT: _copilot_instructions,
+    OutputMode.MARKDOWN: _markdown_instructions,
+}
+
+
+def _list_files(root: Path) -> List[str]:
+    """List files under *root* as sorted relative paths.
+
+    Walks with ``os.scandir`` so file types come from the directory
+    entries rather than a ``stat`` per path.  Symlinked directories are
+    not descended into, as with ``Path.rglob``.
+    """
+    files: List[str] = []
+    stack = [("", str(root))]
+    while stack:
+        prefix, path = stack.pop()
+        with os.scandir(path) as entries:
+            for entry in entries:
+                rel = prefix + entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append((rel + os.sep, entry.path))
+                elif entry.is_file():
+                    files.append(rel)
+    return sorted(files)
 
 
 def tool_install(state: WizardState) -> str:
     """Install confirmed packages via pip."""
     if not state.confirmed_packages:
-        return json.dumps({"error": "No packages confirmed yet."})
+        return _ERR_NOTHING_CONFIRMED
 
     packages = [p.pip_name for p in state.confirmed_packages if p.pip_name]
     if not packages:
-        return json.dumps({"status": "nothing_to_install"})
-
-    results: list[dict] = []
-    for pkg in packages:
-        try:
-            proc = subprocess.run(
-                [sys.executable, "-m", "pip", "install", pkg],
-                capture_output=True,
-                text=True,
-                timeout=120,
-            )
-            results.append({
-                "package": pkg,
-                "success": proc.returncode == 0,
-                "message": proc.stdout[-300:] if proc.returncode == 0 else proc.stderr[-300:],
-            })
-        except Exception as exc:
-            results.append({
-                "package": pkg,
-                "success": False,
-                "message": str(exc),
-            })
+        return _NOTHING_TO_INSTALL
+
+    # One pip run resolves all packages as a single dependency graph.
+    # Only if it fails are they retried one by one, to tell which failed;
+    # the retries stay sequential because concurrent pip processes can
+    # clobber each other in a shared environment.
+    ok, message = _pip_install(packages, timeout=120 * len(packages))
+    if ok:
+        results = [
+            {"package": pkg, "success": True, "message": message}
+            for pkg in packages
+        ]
+    else:
+        results = []
+        for pkg in packages:
+            ok, message = _pip_install([pkg], timeout=120)
+            results.append({"package": pkg, "success": ok, "message": message})
 
     succeeded = sum(1 for r in results if r["success"])
     return json.dumps({
         "installed": succeeded,
         "failed": len(results) - succeeded,
         "details": results,
-    }, indent=2)
+    }, separators=(",", ":"))
+
+
+def _pip_install(packages: List[str], timeout: float) -> Tuple[bool, str]:
+    """Run ``pip install`` for *packages*; return ``(success, message)``."""
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "pip", "install", *packages],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except Exception as exc:
+        return False, str(exc)
+    if proc.returncode == 0:
+        return True, proc.stdout[-300:]
+    return False, proc.stderr[-300:]
 
 
 def tool_launch(state: WizardState, mode: str = "web") -> str:
     """Launch the generated agent."""
     project_dir = state.project_dir
     if not project_dir or not Path(project_dir).exists():
-        return json.dumps({"error": "Agent not generated yet. Call generate_agent first."})
+        return _ERR_NOT_GENERATED
 
-    slug = state.agent_name.replace("-", "_")
+    slug = state.agent_slug
 
     if mode == "web":
         # Launch in a subprocess so the wizard doesn't block
@@ -500,19 +715,52 @@ def tool_launch(state: WizardState, mode: str = "web") -> str:
 
 def tool_get_state(state: WizardState) -> str:
     """Return the current wizard state."""
-    return json.dumps(state.to_dict(), indent=2)
+    return json.dumps(state.to_dict(), separators=(",", ":"))
 
 
 def tool_fetch_docs(state: WizardState) -> str:
     """Fetch documentation for all confirmed packages."""
+    return _run_async(tool_fetch_docs_async(state))
+
+
+def _docs_client_scope():
+    """Bind the persistent client when running on the background loop.
+
+    Other loops (a caller's own ``asyncio.run``, the private loop used
+    when called from the background loop) get the usual per-call client
+    from ``shared_client``.
+    """
+    if asyncio.get_running_loop() is not _bg_loop:
+        return nullcontext()
+    from .sources._client import bind_client
+
+    return bind_client(_background_client())
+
+
+async def tool_fetch_docs_async(state: WizardState) -> str:
+    """Async :func:`tool_fetch_docs`, for callers already on a loop."""
     if not state.confirmed_packages:
-        return json.dumps({"error": "No packages confirmed yet. Call confirm_packages first."})
+        return _ERR_DOCS_NOT_CONFIRMED
 
     from .sources.doc_fetcher import fetch_package_docs
 
-    docs = _run_async(
-        fetch_package_docs(state.confirmed_packages)
-    )
+    # Docs depend on each package's URLs (where they are fetched from)
+    # and on the metadata _compose_doc writes into them
+    cache_key = ("docs",) + tuple(sorted(
+        (
+            p.pip_name.lower(), p.homepage, p.repository_url,
+            p.name, p.description, p.effective_install_command,
+            tuple(p.keywords),
+        )
+        for p in state.confirmed_packages
+    ))
+    docs = _cached_result(cache_key)
+    if docs is None:
+        with _docs_client_scope():
+            docs = await fetch_package_docs(state.confirmed_packages)
+        _store_result(cache_key, docs)
+    # state.package_docs gains entries later; keep the cached copy intact
+    docs = dict(docs)
 
     state.package_docs = docs
 
@@ -530,14 +778,41 @@ def tool_fetch_docs(state: WizardState) -> str:
         "status": "docs_fetched",
         "packages_documented": len(docs),
         "details": summary,
-    }, indent=2)
+    }, separators=(",", ":"))
+
+
+_LEGACY_MODE_ALIASES = {"copilot_agent": "copilot", "copilot_plugin": "copilot"}
+
+_OUTPUT_MODE_DESCRIPTIONS = {
+    OutputMode.FULLSTACK: (
+        "Full Python submodule with CLI, web UI, code execution sandbox, "
+        "and guardrails. The generated agent runs as a standalone application."
+    ),
+    OutputMode.COPILOT: (
+        "Full VS Code Copilot plugin with plugin.json manifest, compiled "
+        "agents with inlined expertise, skills as SKILL.md files, Claude Code "
+        "agents, and package documentation. Install via chat.plugins.paths."
+    ),
+    OutputMode.MARKDOWN: (
+        "Platform-agnostic Markdown files (system prompt, tools reference, "
+        "data guide, guardrails, workflow). Copy-paste into any LLM."
+    ),
+}
+
+# Model descriptions for user feedback
+_MODEL_DESCRIPTIONS = {
+    "claude-opus-4.5": "Most capable Claude model — best for complex reasoning and nuanced tasks.",
+    "claude-sonnet-4": "Balanced Claude model — fast and capable for most tasks.",
+    "claude-haiku-3.5": "Fastest Claude model — best for simple tasks and lower cost.",
+    "gpt-4o": "OpenAI's flagship model — excellent general-purpose reasoning.",
+    "gpt-4o-mini": "Smaller OpenAI model — faster and more cost-effective.",
+}
 
 
 def tool_set_output_mode(state: WizardState, mode: str, guided_mode: bool = False) -> str:
     """Set the output mode for agent generation."""
     # Normalize legacy string values to the canonical "copilot"
-    _LEGACY_ALIASES = {"copilot_agent": "copilot", "copilot_plugin": "copilot"}
-    mode = _LEGACY_ALIASES.get(mode, mode)
+    mode = _LEGACY_MODE_ALIASES.get(mode, mode)
 
     try:
         output_mode = OutputMode(mode)
@@ -557,26 +832,10 @@ def tool_set_output_mode(state: WizardState, mode: str, guided_mode: bool = Fals
 
     state.output_mode = output_mode
 
-    descriptions = {
-        OutputMode.FULLSTACK: (
-            "Full Python submodule with CLI, web UI, code execution sandbox, "
-            "and guardrails. The generated agent runs as a standalone application."
-        ),
-        OutputMode.COPILOT: (
-            "Full VS Code Copilot plugin with plugin.json manifest, compiled "
-            "agents with inlined expertise, skills as SKILL.md files, Claude Code "
-            "agents, and package documentation. Install via chat.plugins.paths."
-        ),
-        OutputMode.MARKDOWN: (
-            "Platform-agnostic Markdown files (system prompt, tools reference, "
-            "data guide, guardrails, workflow). Copy-paste into any LLM."
-        ),
-    }
-
     return json.dumps({
         "status": "output_mode_set",
         "mode": output_mode.value,
-        "description": descriptions[output_mode],
+        "description": _OUTPUT_MODE_DESCRIPTIONS[output_mode],
     })
 
 
@@ -586,26 +845,17 @@ def tool_set_model(state: WizardState, model: str) -> str:
     This controls which model handles the wizard conversation (for billing).
     Does NOT affect the generated agent's model configuration.
     """
-    if model not in SUPPORTED_MODELS:
+    if not is_supported_model(model):
         return json.dumps({
             "error": f"Invalid model '{model}'. Must be one of: {', '.join(SUPPORTED_MODELS)}"
         })
 
-    state.model = model
-
-    # Model descriptions for user feedback
-    descriptions = {
-        "claude-opus-4.5": "Most capable Claude model — best for complex reasoning and nuanced tasks.",
-        "claude-sonnet-4": "Balanced Claude model — fast and capable for most tasks.",
-        "claude-haiku-3.5": "Fastest Claude model — best for simple tasks and lower cost.",
-        "gpt-4o": "OpenAI's flagship model — excellent general-purpose reasoning.",
-        "gpt-4o-mini": "Smaller OpenAI model — faster and more cost-effective.",
-    }
+    state.model = sys.intern(model)
 
     return json.dumps({
         "status": "model_set",
         "model": model,
-        "description": descriptions.get(model, ""),
+        "description": _MODEL_DESCRIPTIONS.get(model, ""),
     })
 
 
@@ -625,31 +875,44 @@ def tool_ingest_library_api(
     try:
         from .docs_ingestor import ingest_package_docs_sync
     except ImportError:
-        return json.dumps({
-            "error": "docs_ingestor module not available. "
-                     "Is sciagent[wizard] installed?",
-        })
+        return _INGESTOR_MISSING
+
+    cache_key = ("ingest", package_name.lower(), github_url or "")
+    markdown = _cached_result(cache_key)
+    if markdown is None:
+        try:
+            markdown = ingest_package_docs_sync(package_name, github_url)
+        except Exception as exc:
+            logger.exception("Library API ingestion failed for %s", package_name)
+            return json.dumps({
+                "error": f"Ingestion failed: {exc}",
+            })
+        _store_result(cache_key, markdown)
+
+    return _ingest_result(state, package_name, markdown)
+
+
+# Section markers of an ingested API reference, found in one pass
+_API_SECTION_RE = re.compile(
+    r"## [1-4]\. (?:Core Classes|Key Functions|Common Pitfalls"
+    r"|Quick-Start Recipes)|### `"
+)
 
-    try:
-        markdown = ingest_package_docs_sync(package_name, github_url)
-    except Exception as exc:
-        logger.exception("Library API ingestion failed for %s", package_name)
-        return json.dumps({
-            "error": f"Ingestion failed: {exc}",
-        })
 
-    # Store the result
+def _ingest_result(state: WizardState, package_name: str, markdown: str) -> str:
+    """Store an ingested API reference on *state* and summarise it."""
     doc_key = f"{package_name}_api"
     state.package_docs[doc_key] = markdown
 
     word_count = len(markdown.split())
+    sections = set(_API_SECTION_RE.findall(markdown))
     return json.dumps({
         "status": "ingested",
         "package": package_name,
         "doc_key": doc_key,
         "word_count": word_count,
-        "has_classes": "## 1. Core Classes" in markdown or "### `" in markdown,
-        "has_functions": "## 2. Key Functions" in markdown,
-        "has_pitfalls": "## 3. Common Pitfalls" in markdown,
-        "has_recipes": "## 4. Quick-Start Recipes" in markdown,
-    }, indent=2)
+        "has_classes": bool({"## 1. Core Classes", "### `"} & sections),
+        "has_functions": "## 2. Key Functions" in sections,
+        "has_pitfalls": "## 3. Common Pitfalls" in sections,
+        "has_recipes": "## 4. Quick-Start Recipes" in sections,
+    }, separators=(",", ":"))
@@ -8,22 +8,47 @@ refinement.
 
 from __future__ import annotations
 
-import json
 import logging
-import uuid
-from pathlib import Path
+import os
+import secrets
 
 from quart import Blueprint, request, jsonify, send_from_directory
 
+from .sources._json import loads as json_loads
+
 logger = logging.getLogger(__name__)
 
-_PKG_DIR = Path(__file__).resolve().parent
+_MAX_DESCRIPTION_CHARS = 8_192  # longer domain descriptions are truncated
+
+# Kickoff-prompt paragraph per start-form field, in prompt order
+_PROMPT_FIELDS = (
+    ("domain_description", lambda v: (
+        "The researcher describes their domain as:\n\n"
+        f'"{str(v)[:_MAX_DESCRIPTION_CHARS]}"'
+    )),
+    ("research_goals", lambda goals: (
+        "Their research goals are:\n" + "\n".join(f"- {g}" for g in goals)
+    )),
+    ("file_types", lambda types: (
+        "They work with these file types: " + ", ".join(types)
+    )),
+    ("known_packages", lambda pkgs: (
+        "They already know about / use these packages: " + ", ".join(pkgs)
+    )),
+)
+
+_DEFAULT_KICKOFF = (
+    "Hi! I'd like to build a domain-specific agent. Please interview me about my field."
+)
+
+# A plain string path, built without resolving every component at import
+_PKG_DIR = os.path.dirname(os.path.abspath(__file__))
 
 wizard_bp = Blueprint(
     "wizard",
     __name__,
-    static_folder=str(_PKG_DIR / "static"),
-    template_folder=str(_PKG_DIR / "templates_html"),
+    static_folder=os.path.join(_PKG_DIR, "static"),
+    template_folder=os.path.join(_PKG_DIR, "templates_html"),
     url_prefix="/wizard",
 )
 
@@ -42,33 +67,16 @@ async def wizard_start():
     in this initial form step. The response includes a session ID
     that the chat WebSocket uses to carry the wizard state.
     """
-    data = await request.get_json(silent=True) or {}
+    data = _parse_json(await request.get_data())
 
-    session_id = str(uuid.uuid4())
-    domain_description = data.get("domain_description", "")
-    research_goals = data.get("research_goals", [])
-    file_types = data.get("file_types", [])
-    known_packages = data.get("known_packages", [])
+    session_id = secrets.token_urlsafe(16)
 
     # Build a kickoff prompt the wizard agent will receive
-    prompt_parts = []
-    if domain_description:
-        prompt_parts.append(
-            f"The researcher describes their domain as:\n\n"
-            f'"{domain_description}"'
-        )
-    if research_goals:
-        goals = "\n".join(f"- {g}" for g in research_goals)
-        prompt_parts.append(f"Their research goals are:\n{goals}")
-    if file_types:
-        prompt_parts.append(f"They work with these file types: {', '.join(file_types)}")
-    if known_packages:
-        prompt_parts.append(
-            f"They already know about / use these packages: {', '.join(known_packages)}"
-        )
-
-    kickoff_prompt = "\n\n".join(prompt_parts) if prompt_parts else (
-        "Hi! I'd like to build a domain-specific agent. Please interview me about my field."
+    prompt_parts = [
+        fmt(data[key]) for key, fmt in _PROMPT_FIELDS if data.get(key)
+    ]
+    kickoff_prompt = (
+        "\n\n".join(prompt_parts) if prompt_parts else _DEFAULT_KICKOFF
     )
 
     return jsonify({
@@ -77,6 +85,17 @@ async def wizard_start():
     })
 
 
+def _parse_json(raw: bytes) -> dict:
+    """Decode a JSON object body; anything else yields ``{}``."""
+    if not raw:
+        return {}
+    try:
+        data = json_loads(raw)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
 @wizard_bp.route("/static/<path:filename>")
 async def wizard_static(filename):
     """Serve wizard-specific static assets."""